@@ -0,0 +1,128 @@
+import copy
+import os
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import (
+    FileResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.routing import Route
+from app.states.blob_store import get_blob_store
+from app.states.clinic_store import get_clinic_store
+from app.states.history_archive import (
+    archive_filename,
+    archive_path,
+    remove_archive,
+)
+from app.states.history_export import (
+    content_disposition,
+    export_filename,
+    get_export_tokens,
+    iter_history_html,
+)
+
+
+async def export_history(request: Request) -> Response:
+    patient_id = get_export_tokens().redeem(
+        request.path_params["token"]
+    )
+    patient = (
+        get_clinic_store().get(patient_id)
+        if patient_id
+        else None
+    )
+    if patient is None:
+        return PlainTextResponse(
+            "Enlace de exportación inválido o expirado.",
+            status_code=404,
+        )
+    snapshot = copy.deepcopy(patient)
+    return StreamingResponse(
+        iter_history_html(snapshot),
+        media_type="text/html; charset=utf-8",
+        headers={
+            "Content-Disposition": content_disposition(
+                export_filename(snapshot)
+            )
+        },
+    )
+
+
+BLOB_HEADERS = {
+    "Cache-Control": "public, max-age=31536000, immutable",
+    "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'",
+    "X-Content-Type-Options": "nosniff",
+}
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    return any(
+        candidate.strip().removeprefix("W/") in (etag, "*")
+        for candidate in if_none_match.split(",")
+    )
+
+
+async def serve_blob(request: Request) -> Response:
+    located = get_blob_store().locate(
+        request.path_params["name"]
+    )
+    if located is None:
+        return PlainTextResponse(
+            "Archivo no encontrado.", status_code=404
+        )
+    path, digest, media_type = located
+    headers = {**BLOB_HEADERS, "ETag": f'"{digest}"'}
+    if etag_matches(
+        request.headers.get("if-none-match", ""),
+        headers["ETag"],
+    ):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path, media_type=media_type, headers=headers
+    )
+
+
+async def export_archive(request: Request) -> Response:
+    archive_id = get_export_tokens().redeem(
+        request.path_params["token"], kind="archive"
+    )
+    path = archive_path(archive_id) if archive_id else None
+    if path is None or not os.path.exists(path):
+        return PlainTextResponse(
+            "Enlace de exportación inválido o expirado.",
+            status_code=404,
+        )
+    return FileResponse(
+        path,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": content_disposition(
+                archive_filename(path)
+            )
+        },
+        background=BackgroundTask(remove_archive, path),
+    )
+
+
+api = Starlette(
+    routes=[
+        Route(
+            "/export/history/{token}",
+            export_history,
+            methods=["GET"],
+        ),
+        Route(
+            "/export/archive/{token}",
+            export_archive,
+            methods=["GET"],
+        ),
+        Route(
+            "/blobs/{name}",
+            serve_blob,
+            methods=["GET", "HEAD"],
+        ),
+    ]
+)
\ No newline at end of file
@@ -1,9 +1,21 @@
 import reflex as rx
+from app.api_routes import api
 from app.pages.sign_in import sign_in
 from app.pages.sign_up import sign_up
 from app.pages.dashboard import dashboard
 from app.pages.clinical_history import clinical_history
+from app.pages.analytics import analytics
+from app.states.analytics_state import AnalyticsState
 from app.states.auth_state import AuthState
+from app.states.clinic_state import (
+    HISTORY_ROUTE,
+    ClinicState,
+)
+from app.states.odontogram_state import OdontogramState
+from app.delta_trace import (
+    TRACE_DELTAS,
+    DeltaTraceMiddleware,
+)
 
 
 def index() -> rx.Component:
@@ -29,8 +41,11 @@ app = rx.App(
             href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap",
             rel="stylesheet",
         ),
+        rx.script(src="/history_patch.js"),
+        rx.script(src="/signature_pad.js"),
     ],
     stylesheets=["/pdf_styles.css"],
+    api_transformer=api,
 )
 app.add_page(
     index, route="/", on_load=AuthState.check_session
@@ -52,6 +67,20 @@ app.add_page(
 )
 app.add_page(
     clinical_history,
-    route="/history/[patient_id]",
-    on_load=AuthState.check_session,
-)
\ No newline at end of file
+    route=HISTORY_ROUTE,
+    on_load=[
+        AuthState.check_session,
+        ClinicState.sync_store,
+        OdontogramState.load_odontogram,
+    ],
+)
+app.add_page(
+    analytics,
+    route="/analytics",
+    on_load=[
+        AuthState.check_session,
+        AnalyticsState.load_analytics,
+    ],
+)
+if TRACE_DELTAS:
+    app.add_middleware(DeltaTraceMiddleware())
\ No newline at end of file
@@ -1,7 +1,13 @@
 import reflex as rx
-from app.states.clinic_state import (
-    ClinicState,
+from app.states.clinic_state import ClinicState
+from app.states.history_editor_state import (
+    HistoryEditorState,
+)
+from app.states.models import (
     NotaEvolucion,
+    OPCIONES_ESCOLARIDAD,
+    OPCIONES_ESTADO_CIVIL,
+    OPCIONES_SEXO,
 )
 from app.states.auth_state import AuthState
 from app.components.odontogram import interactive_odontogram
@@ -11,6 +17,10 @@ from app.components.form_helpers import (
     _editable_textarea,
     _editable_select_bool,
     _editable_select_str,
+    SIGNATURE_PAD_ID,
+    history_patch_flusher,
+    save_signature,
+    signature_pad_call,
 )
 
 
@@ -26,7 +36,7 @@ def evolucion_note_item(
             ),
             rx.el.button(
                 rx.icon("trash-2", class_name="h-4 w-4"),
-                on_click=lambda: ClinicState.delete_evolucion_note(
+                on_click=lambda: HistoryEditorState.delete_evolucion_note(
                     index
                 ),
                 class_name="text-red-500 hover:text-red-700",
@@ -55,7 +65,7 @@ def evolucion_note_item(
 
 def hoja_evolucion_section() -> rx.Component:
     return _form_section(
-        "8. Hoja de Nota de Evolución",
+        "10. Hoja de Nota de Evolución",
         rx.el.div(
             rx.foreach(
                 ClinicState.safe_seguimiento,
@@ -72,23 +82,24 @@ def hoja_evolucion_section() -> rx.Component:
                 "Procedimiento y Signos Vitales",
                 ["nueva_nota_evolucion"],
                 is_local=True,
-                local_value=ClinicState.nueva_nota_evolucion,
-                on_change_local=ClinicState.set_nueva_nota_evolucion,
+                local_value=HistoryEditorState.nueva_nota_evolucion,
+                on_change_local=HistoryEditorState.set_nueva_nota_evolucion,
             ),
             _editable_textarea(
                 "Observaciones Adicionales",
                 ["nueva_nota_observaciones"],
                 is_local=True,
-                local_value=ClinicState.nueva_nota_observaciones,
-                on_change_local=ClinicState.set_nueva_nota_observaciones,
+                local_value=HistoryEditorState.nueva_nota_observaciones,
+                on_change_local=HistoryEditorState.set_nueva_nota_observaciones,
             ),
             rx.el.button(
                 "Añadir Nota",
-                on_click=ClinicState.add_evolucion_note,
+                on_click=HistoryEditorState.add_evolucion_note,
                 class_name="mt-2 bg-blue-500 text-white px-4 py-2 rounded-md hover:bg-blue-600 text-sm font-medium",
             ),
             class_name="col-span-full mt-6 border-t pt-6",
         ),
+        section="seguimiento",
     )
 
 
@@ -130,6 +141,7 @@ def ruta_clinica_section() -> rx.Component:
             ["ruta_clinica", "observaciones"],
             rows=4,
         ),
+        section="ruta_clinica",
     )
 
 
@@ -154,12 +166,12 @@ def consent_section() -> rx.Component:
         rx.el.div(
             rx.el.input(
                 type="checkbox",
-                on_change=lambda value: ClinicState.update_history_field_bool(
+                on_change=lambda value: HistoryEditorState.update_history_field_bool(
                     ["firma_consentimiento", "aceptado"],
                     value,
                 ),
                 checked=ClinicState.get_history_value(
-                    ClinicState.selected_patient.historia_clinica,
+                    ClinicState.patient_history,
                     ["firma_consentimiento", "aceptado"],
                     False,
                 ),
@@ -171,11 +183,54 @@ def consent_section() -> rx.Component:
             ),
             class_name="col-span-full flex items-center mt-4",
         ),
+        rx.el.div(
+            rx.el.label(
+                "Firma del paciente",
+                class_name="block text-sm font-medium text-gray-700 mb-1",
+            ),
+            rx.el.canvas(
+                id=SIGNATURE_PAD_ID,
+                width="400",
+                height="150",
+                on_mount=signature_pad_call(
+                    "mount",
+                    ClinicState.get_history_value(
+                        ClinicState.patient_history,
+                        [
+                            "firma_consentimiento",
+                            "firma_trazos",
+                        ],
+                    ),
+                ),
+                class_name="w-full max-w-md bg-white border border-gray-300 rounded-md touch-none cursor-crosshair",
+            ),
+            rx.el.div(
+                rx.el.button(
+                    "Limpiar",
+                    type="button",
+                    on_click=[
+                        signature_pad_call("clear"),
+                        HistoryEditorState.clear_signature,
+                    ],
+                    class_name="px-3 py-1 border border-gray-300 rounded-md text-sm text-gray-700 hover:bg-gray-50",
+                ),
+                rx.el.button(
+                    "Guardar firma",
+                    type="button",
+                    on_click=save_signature(),
+                    class_name="px-3 py-1 bg-blue-600 text-white rounded-md text-sm hover:bg-blue-700",
+                ),
+                class_name="flex gap-2 mt-2",
+            ),
+            class_name="col-span-full mt-4",
+        ),
+        section="firma_consentimiento",
     )
 
 
 def clinical_history_form() -> rx.Component:
     return rx.el.div(
+        history_patch_flusher(),
         _form_section(
             "1. Datos Generales",
             _editable_input(
@@ -192,7 +247,7 @@ def clinical_history_form() -> rx.Component:
             _editable_select_str(
                 "Sexo",
                 ["datos_generales", "sexo"],
-                ClinicState.opciones_sexo,
+                OPCIONES_SEXO,
             ),
             _editable_input(
                 "Fecha de Nacimiento",
@@ -202,12 +257,12 @@ def clinical_history_form() -> rx.Component:
             _editable_select_str(
                 "Estado Civil",
                 ["datos_generales", "estado_civil"],
-                ClinicState.opciones_estado_civil,
+                OPCIONES_ESTADO_CIVIL,
             ),
             _editable_select_str(
                 "Escolaridad",
                 ["datos_generales", "escolaridad"],
-                ClinicState.opciones_escolaridad,
+                OPCIONES_ESCOLARIDAD,
             ),
             _editable_input(
                 "Ocupación",
@@ -231,9 +286,93 @@ def clinical_history_form() -> rx.Component:
                 "Responsable del Paciente",
                 ["datos_generales", "responsable_paciente"],
             ),
+            section="datos_generales",
+        ),
+        _form_section(
+            "2. Padecimiento Actual",
+            _editable_textarea(
+                "Motivo de Consulta",
+                ["padecimiento_actual", "motivo_consulta"],
+                required=True,
+            ),
+            _editable_textarea(
+                "Descripción del Problema",
+                [
+                    "padecimiento_actual",
+                    "descripcion_problema",
+                ],
+            ),
+            _editable_textarea(
+                "Evolución",
+                ["padecimiento_actual", "evolucion"],
+            ),
+            _editable_textarea(
+                "Factores Asociados",
+                [
+                    "padecimiento_actual",
+                    "factores_asociados",
+                ],
+            ),
+            section="padecimiento_actual",
+        ),
+        _form_section(
+            "3. Exploración Clínica General",
+            _editable_input(
+                "Frecuencia Cardiaca (lpm)",
+                [
+                    "exploracion_clinica_general",
+                    "frecuencia_cardiaca",
+                ],
+                placeholder="72",
+                type="number",
+            ),
+            _editable_input(
+                "Presión Arterial (mmHg)",
+                [
+                    "exploracion_clinica_general",
+                    "presion_arterial",
+                ],
+                placeholder="120/80",
+            ),
+            _editable_input(
+                "Temperatura (°C)",
+                [
+                    "exploracion_clinica_general",
+                    "temperatura",
+                ],
+                placeholder="36.5",
+            ),
+            _editable_input(
+                "Saturación de Oxígeno (%)",
+                [
+                    "exploracion_clinica_general",
+                    "saturacion",
+                ],
+                placeholder="98",
+                type="number",
+            ),
+            _editable_input(
+                "Peso (kg)",
+                ["exploracion_clinica_general", "peso"],
+                placeholder="70",
+            ),
+            _editable_input(
+                "Talla (cm)",
+                ["exploracion_clinica_general", "talla"],
+                placeholder="165",
+                type="number",
+            ),
+            _editable_textarea(
+                "Estado General",
+                [
+                    "exploracion_clinica_general",
+                    "estado_general",
+                ],
+            ),
+            section="exploracion_clinica_general",
         ),
         _form_section(
-            "2. Antecedentes Dentales",
+            "4. Antecedentes Dentales",
             _editable_textarea(
                 "¿Es la primera vez que acude a consulta dental?",
                 [
@@ -287,15 +426,17 @@ def clinical_history_form() -> rx.Component:
                 "Tipo de prótesis",
                 ["antecedentes_dentales", "tipo_protesis"],
             ),
+            section="antecedentes_dentales",
         ),
         _form_section(
-            "3. Resumen de la Historia Médica y/o Factores de Riesgo",
+            "5. Resumen de la Historia Médica y/o Factores de Riesgo",
             _editable_textarea(
                 "Resumen", ["resumen_historia_medica"]
             ),
+            section="resumen_historia_medica",
         ),
         _form_section(
-            "4. Exploración Física Extraoral",
+            "6. Exploración Física Extraoral",
             _editable_textarea(
                 "Cabeza",
                 ["exploracion_fisica_extraoral", "cabeza"],
@@ -311,9 +452,10 @@ def clinical_history_form() -> rx.Component:
                     "ganglios_linfaticos",
                 ],
             ),
+            section="exploracion_fisica_extraoral",
         ),
         _form_section(
-            "5. Articulación Temporomandibular (A.T.M.)",
+            "7. Articulación Temporomandibular (A.T.M.)",
             _editable_select_bool(
                 "¿Ha tenido dolor?",
                 ["articulacion_temporomandibular", "dolor"],
@@ -343,9 +485,10 @@ def clinical_history_form() -> rx.Component:
                     "limitacion_apertura",
                 ],
             ),
+            section="articulacion_temporomandibular",
         ),
         _form_section(
-            "6. Exploración de Tejidos Blandos de la Cavidad Oral",
+            "8. Exploración de Tejidos Blandos de la Cavidad Oral",
             _editable_textarea(
                 "Labios",
                 ["exploracion_tejidos_blandos", "labios"],
@@ -418,10 +561,12 @@ def clinical_history_form() -> rx.Component:
                     "resumen_diagnostico_presuncion_bucal",
                 ],
             ),
+            section="exploracion_tejidos_blandos",
         ),
         _form_section(
-            "7. Odontograma Interactivo",
+            "9. Odontograma Interactivo",
             interactive_odontogram(),
+            section="odontograma",
         ),
         ruta_clinica_section(),
         hoja_evolucion_section(),
@@ -1,19 +1,111 @@
 import reflex as rx
+from reflex.vars.function import (
+    ArgsFunctionOperation,
+    FunctionStringVar,
+)
 from app.states.clinic_state import ClinicState
-from typing import Callable
+from app.states.history_editor_state import (
+    HistoryEditorState,
+)
+from app.states.history_validation import SECTION_BITS
+from app.states.review_state import ReviewState
 
+HISTORY_PATCH_FLUSH_ID = "history-patch-flush"
+SIGNATURE_PAD_ID = "consent-signature-pad"
 
-def _form_section(title: str, *children) -> rx.Component:
+
+def _buffer_history_edit(
+    field_path: list[str], value: rx.Var
+) -> rx.event.EventSpec:
+    return rx.call_function(
+        ArgsFunctionOperation.create(
+            (),
+            FunctionStringVar.create(
+                "odontotessHistoryPatch.set"
+            ).call(
+                ClinicState.current_patient_id,
+                field_path,
+                value,
+            ),
+        )
+    )
+
+
+def signature_pad_call(
+    method: str, *args
+) -> rx.event.EventSpec:
+    return rx.call_function(
+        ArgsFunctionOperation.create(
+            (),
+            FunctionStringVar.create(
+                f"odontotessSignaturePad.{method}"
+            ).call(SIGNATURE_PAD_ID, *args),
+        )
+    )
+
+
+def save_signature() -> rx.event.EventSpec:
+    return rx.call_script(
+        f"odontotessSignaturePad.encode('{SIGNATURE_PAD_ID}')",
+        callback=HistoryEditorState.save_signature,
+    )
+
+
+def flush_history_patch(
+    callback: rx.event.EventHandler = HistoryEditorState.apply_history_patch,
+) -> rx.event.EventSpec:
+    return rx.call_function(
+        ArgsFunctionOperation.create(
+            (),
+            FunctionStringVar.create(
+                "odontotessHistoryPatch.drain"
+            ).call(ClinicState.current_patient_id),
+        ),
+        callback=callback,
+    )
+
+
+def history_patch_flusher() -> rx.Component:
+    return rx.el.button(
+        id=HISTORY_PATCH_FLUSH_ID,
+        type="button",
+        on_click=flush_history_patch(),
+        class_name="hidden",
+    )
+
+
+def _form_section(
+    title: str, *children, section: str | None = None
+) -> rx.Component:
+    is_invalid = (
+        ReviewState.invalid_section_bits
+        // SECTION_BITS[section]
+        % 2
+        == 1
+        if section
+        else False
+    )
     return rx.el.div(
         rx.el.h3(
             title,
             class_name="text-xl font-semibold text-gray-800 mb-4 border-b pb-2",
         ),
+        rx.cond(
+            is_invalid,
+            rx.el.p(
+                "Esta sección tiene campos requeridos vacíos o con formato inválido.",
+                class_name="text-sm text-red-600 mb-4",
+            ),
+        ),
         rx.el.div(
             *children,
             class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-x-8 gap-y-6",
         ),
-        class_name="bg-white p-4 md:p-6 rounded-lg shadow-sm border border-gray-200 mb-8",
+        class_name=rx.cond(
+            is_invalid,
+            "bg-white p-4 md:p-6 rounded-lg shadow-sm border-2 border-red-400 mb-8",
+            "bg-white p-4 md:p-6 rounded-lg shadow-sm border border-gray-200 mb-8",
+        ),
     )
 
 
@@ -31,12 +123,13 @@ def _editable_input(
         ),
         rx.el.input(
             default_value=ClinicState.get_history_value(
-                ClinicState.selected_patient.historia_clinica,
+                ClinicState.patient_history,
                 field_path,
             ),
-            on_change=lambda value: ClinicState.update_history_field_str(
+            on_change=lambda value: _buffer_history_edit(
                 field_path, value
             ),
+            on_blur=flush_history_patch(),
             placeholder=placeholder,
             type=type,
             required=required,
@@ -56,22 +149,20 @@ def _editable_textarea(
     local_value: rx.Var[str] | None = None,
     on_change_local: rx.event.EventHandler | None = None,
 ) -> rx.Component:
-    on_change_handler = rx.cond(
-        is_local & (on_change_local != None),
-        on_change_local,
-        rx.call_script(
-            f"new Event('{ClinicState.update_history_field_str.__name__}', {{ detail: {{ field_path: {field_path}, value: arguments[0] }} }})",
-            _is_prop=True,
-        ),
-    )
-    value_var = rx.cond(
-        is_local,
-        local_value,
-        ClinicState.get_history_value(
-            ClinicState.selected_patient.historia_clinica,
+    if is_local:
+        value_var = local_value
+        change_handlers = dict(on_change=on_change_local)
+    else:
+        value_var = ClinicState.get_history_value(
+            ClinicState.patient_history,
             field_path,
-        ),
-    )
+        )
+        change_handlers = dict(
+            on_change=lambda value: _buffer_history_edit(
+                field_path, value
+            ),
+            on_blur=flush_history_patch(),
+        )
     return rx.el.div(
         rx.el.label(
             label,
@@ -79,7 +170,7 @@ def _editable_textarea(
         ),
         rx.el.textarea(
             default_value=value_var,
-            on_change=on_change_handler,
+            **change_handlers,
             placeholder=placeholder,
             required=required,
             class_name="mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500",
@@ -101,11 +192,11 @@ def _editable_select_bool(
             rx.el.option("No", value="false"),
             rx.el.option("Sí", value="true"),
             value=ClinicState.get_history_value(
-                ClinicState.selected_patient.historia_clinica,
+                ClinicState.patient_history,
                 field_path,
                 False,
             ).to_string(),
-            on_change=lambda value: ClinicState.update_history_field_bool(
+            on_change=lambda value: HistoryEditorState.update_history_field_bool(
                 field_path, value
             ),
             class_name="mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500 bg-white",
@@ -117,7 +208,7 @@ def _editable_select_bool(
 def _editable_select_str(
     label: str,
     field_path: list[str],
-    options: rx.Var[list[str]],
+    options: rx.Var[list[str]] | list[str],
 ) -> rx.Component:
     return rx.el.div(
         rx.el.label(
@@ -132,10 +223,10 @@ def _editable_select_str(
                 ),
             ),
             value=ClinicState.get_history_value(
-                ClinicState.selected_patient.historia_clinica,
+                ClinicState.patient_history,
                 field_path,
             ),
-            on_change=lambda value: ClinicState.update_history_field_str(
+            on_change=lambda value: HistoryEditorState.update_history_field_str(
                 field_path, value
             ),
             class_name="mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500 bg-white",
@@ -1,130 +1,322 @@
 import reflex as rx
-from app.states.clinic_state import ClinicState
+from app.states.odontogram_state import OdontogramState
+from app.states.models import ODONTOGRAM_DIAGNOSTICS
+from app.states.odontogram_codec import (
+    SELECTION_PRESETS,
+    SURFACE_COUNT,
+    SURFACES,
+    TEETH,
+)
 from app.components.form_helpers import _editable_textarea
 
+UPPER_ARCH = [str(i) for i in range(18, 10, -1)] + [
+    str(i) for i in range(21, 29)
+]
+LOWER_ARCH = [str(i) for i in range(48, 40, -1)] + [
+    str(i) for i in range(31, 39)
+]
+TOOTH_SIZE = 40
+TOOTH_INSET = 12
+TOOTH_GAP = 8
+MIDLINE_GAP = 16
+ROW_HEIGHT = 88
+CHART_WIDTH = (
+    TOOTH_GAP
+    + len(UPPER_ARCH) * (TOOTH_SIZE + TOOTH_GAP)
+    + MIDLINE_GAP
+)
+CHART_HEIGHT = 2 * ROW_HEIGHT
+SURFACE_POLYGONS = {
+    "vestibular": ((0, 0), (1, 0), (2, 1), (1, 1)),
+    "lingual": ((0, 3), (1, 3), (2, 2), (1, 2)),
+    "mesial": ((0, 0), (1, 1), (1, 2), (0, 3)),
+    "distal": ((3, 0), (2, 1), (2, 2), (3, 3)),
+    "oclusal": ((1, 1), (2, 1), (2, 2), (1, 2)),
+}
+FINDING_COLORS = {
+    "0": "#f3f4f6",
+    "1": "#ef4444",
+    "2": "#3b82f6",
+    "3": "#facc15",
+}
+MISSING_COLOR = "#9ca3af"
 
-def _surface_button(
-    tooth_number: str, surface: str, size_class: str
-) -> rx.Component:
-    is_missing = ClinicState.is_tooth_missing(
-        ClinicState.selected_patient.historia_clinica,
-        tooth_number,
+
+def _tooth_origin(
+    row: int, position: int
+) -> tuple[int, int]:
+    return (
+        TOOTH_GAP
+        + position * (TOOTH_SIZE + TOOTH_GAP)
+        + (MIDLINE_GAP if position >= 8 else 0),
+        row * ROW_HEIGHT + 18,
+    )
+
+
+def _polygon_points(
+    origin: tuple[int, int], corners: tuple
+) -> str:
+    offsets = (
+        0,
+        TOOTH_INSET,
+        TOOTH_SIZE - TOOTH_INSET,
+        TOOTH_SIZE,
     )
-    finding = ClinicState.get_tooth_surface_finding(
-        ClinicState.selected_patient.historia_clinica,
-        tooth_number,
-        surface,
+    return " ".join(
+        f"{origin[0] + offsets[x]},{origin[1] + offsets[y]}"
+        for x, y in corners
     )
-    return rx.el.button(
-        on_click=lambda: ClinicState.update_tooth_surface(
-            tooth_number, surface
+
+
+TOOTH_CELLS = [
+    {
+        "tooth": tooth,
+        "missing_index": SURFACE_COUNT + TEETH.index(tooth),
+        "x": _tooth_origin(row, position)[0],
+        "y": _tooth_origin(row, position)[1],
+    }
+    for row, arch in enumerate((UPPER_ARCH, LOWER_ARCH))
+    for position, tooth in enumerate(arch)
+]
+SURFACE_CELLS = [
+    {
+        "tooth": cell["tooth"],
+        "surface": surface,
+        "label": f"{cell['tooth']} {surface}",
+        "index": TEETH.index(cell["tooth"]) * len(SURFACES)
+        + surface_index,
+        "missing_index": cell["missing_index"],
+        "points": _polygon_points(
+            (cell["x"], cell["y"]),
+            SURFACE_POLYGONS[surface],
         ),
+    }
+    for cell in TOOTH_CELLS
+    for surface_index, surface in enumerate(SURFACES)
+]
+
+
+def _is_missing(cell: rx.Var) -> rx.Var[bool]:
+    return (
+        OdontogramState.odontogram_digits[
+            cell["missing_index"].to(int)
+        ]
+        == "1"
+    )
+
+
+def _chart_surface(cell: rx.Var) -> rx.Component:
+    is_missing = _is_missing(cell)
+    return rx.el.polygon(
+        rx.el.title(cell["label"].to(str)),
+        points=cell["points"].to(str),
+        on_click=OdontogramState.update_tooth_surface(
+            cell["tooth"].to(str), cell["surface"].to(str)
+        ),
+        style={
+            "fill": rx.cond(
+                is_missing,
+                MISSING_COLOR,
+                rx.Var.create(FINDING_COLORS)[
+                    OdontogramState.odontogram_digits[
+                        cell["index"].to(int)
+                    ]
+                ],
+            )
+        },
         class_name=rx.cond(
             is_missing,
-            f"bg-gray-400 {size_class} border-gray-500 border transition-colors cursor-not-allowed",
+            "cursor-not-allowed",
             rx.cond(
-                finding != "",
-                rx.cond(
-                    finding == "Caries",
-                    f"bg-red-500 {size_class} border-gray-600 border",
-                    rx.cond(
-                        finding == "Sellante",
-                        f"bg-blue-500 {size_class} border-gray-600 border",
-                        f"bg-yellow-400 {size_class} border-gray-600 border",
-                    ),
-                ),
-                f"bg-gray-100 hover:bg-gray-300 {size_class} border-gray-400 border transition-colors",
+                OdontogramState.odontogram_selection[
+                    cell["index"].to(int)
+                ]
+                == "1",
+                "cursor-pointer stroke-blue-700 stroke-[3]",
+                "cursor-pointer hover:opacity-75",
             ),
         ),
-        disabled=is_missing,
     )
 
 
-def tooth_component(tooth_number: str) -> rx.Component:
-    is_missing = ClinicState.is_tooth_missing(
-        ClinicState.selected_patient.historia_clinica,
-        tooth_number,
-    )
-    return rx.el.div(
-        rx.el.p(
-            tooth_number,
-            class_name="text-center text-xs font-semibold text-gray-700",
-        ),
-        rx.el.div(
-            rx.el.div(),
-            _surface_button(
-                tooth_number,
-                "vestibular",
-                "h-4 w-4 md:h-5 md:w-5",
+def _chart_tooth(cell: rx.Var) -> rx.Component:
+    is_missing = _is_missing(cell)
+    x = cell["x"].to(int)
+    y = cell["y"].to(int)
+    return rx.el.g(
+        rx.el.text(
+            cell["tooth"].to(str),
+            x=x + TOOTH_SIZE // 2,
+            y=y - 6,
+            style={"text_anchor": "middle"},
+            on_click=OdontogramState.toggle_tooth_selection(
+                cell["tooth"].to(str)
             ),
-            rx.el.div(),
-            _surface_button(
-                tooth_number,
-                "mesial",
-                "h-4 w-4 md:h-5 md:w-5",
+            class_name=rx.cond(
+                OdontogramState.odontogram_selecting,
+                "text-[11px] font-semibold fill-blue-700 cursor-pointer",
+                "text-[11px] font-semibold fill-gray-700",
             ),
-            _surface_button(
-                tooth_number,
-                "oclusal",
-                "h-5 w-5 md:h-6 md:w-6",
+        ),
+        rx.el.g(
+            rx.el.line(
+                x1=x,
+                y1=y,
+                x2=x + TOOTH_SIZE,
+                y2=y + TOOTH_SIZE,
             ),
-            _surface_button(
-                tooth_number,
-                "distal",
-                "h-4 w-4 md:h-5 md:w-5",
+            rx.el.line(
+                x1=x + TOOTH_SIZE,
+                y1=y,
+                x2=x,
+                y2=y + TOOTH_SIZE,
             ),
-            rx.el.div(),
-            _surface_button(
-                tooth_number,
-                "lingual",
-                "h-4 w-4 md:h-5 md:w-5",
+            stroke="#374151",
+            stroke_width="2",
+            class_name=rx.cond(
+                is_missing,
+                "pointer-events-none",
+                "hidden",
             ),
-            rx.el.div(),
-            class_name="grid grid-cols-3 items-center justify-items-center gap-px w-16 h-16 md:w-20 md:h-20",
         ),
-        rx.el.div(
-            rx.el.input(
-                type="checkbox",
-                checked=is_missing,
-                on_change=lambda _: ClinicState.toggle_tooth_missing(
-                    tooth_number
-                ),
-                class_name="mr-1 h-3 w-3",
+        rx.el.rect(
+            rx.el.title("Ausente"),
+            x=x + TOOTH_SIZE // 2 - 6,
+            y=y + TOOTH_SIZE + 8,
+            width=12,
+            height=12,
+            rx=2,
+            on_click=OdontogramState.toggle_tooth_missing(
+                cell["tooth"].to(str)
             ),
-            rx.el.label("Ausente", class_name="text-xs"),
-            class_name="flex items-center justify-center mt-1",
-        ),
-        class_name=rx.cond(
-            is_missing,
-            "opacity-50 p-2 border rounded-lg bg-white shadow-sm transition-opacity",
-            "p-2 border rounded-lg bg-white shadow-sm transition-opacity",
+            style={
+                "fill": rx.cond(
+                    is_missing, "#4b5563", "#ffffff"
+                )
+            },
+            class_name="cursor-pointer",
         ),
     )
 
 
-def odontogram_arch(
-    title: str, teeth: list[str]
-) -> rx.Component:
+def odontogram_chart() -> rx.Component:
     return rx.el.div(
-        rx.el.h4(
-            title,
-            class_name="font-semibold text-center text-gray-800 mb-3",
+        rx.el.svg(
+            rx.el.g(
+                rx.foreach(SURFACE_CELLS, _chart_surface),
+                stroke="#6b7280",
+                stroke_width="1",
+            ),
+            rx.el.g(
+                rx.foreach(TOOTH_CELLS, _chart_tooth),
+                stroke="#6b7280",
+                stroke_width="1",
+            ),
+            rx.el.line(
+                x1=CHART_WIDTH // 2,
+                y1=0,
+                x2=CHART_WIDTH // 2,
+                y2=CHART_HEIGHT,
+                stroke="#d1d5db",
+                stroke_dasharray="4 4",
+            ),
+            view_box=f"0 0 {CHART_WIDTH} {CHART_HEIGHT}",
+            class_name="w-full min-w-[640px] select-none",
         ),
         rx.el.div(
-            rx.foreach(teeth, tooth_component),
-            class_name="flex flex-row flex-wrap justify-center gap-1 md:gap-2",
+            *[
+                rx.el.div(
+                    rx.el.span(
+                        style={"background_color": color},
+                        class_name="inline-block h-3 w-3 border border-gray-500 mr-1",
+                    ),
+                    label,
+                    class_name="flex items-center",
+                )
+                for label, color in (
+                    *zip(
+                        ODONTOGRAM_DIAGNOSTICS[1:],
+                        list(FINDING_COLORS.values())[1:],
+                    ),
+                    ("Ausente", MISSING_COLOR),
+                )
+            ],
+            class_name="flex flex-wrap justify-center gap-4 mt-2 text-xs text-gray-600",
         ),
-        class_name="bg-gray-50 p-2 md:p-4 rounded-lg border",
+        class_name="bg-gray-50 p-2 md:p-4 rounded-lg border overflow-x-auto",
+    )
+
+
+def odontogram_bulk_toolbar() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            rx.cond(
+                OdontogramState.odontogram_selecting,
+                "Terminar selección",
+                "Selección múltiple",
+            ),
+            on_click=OdontogramState.toggle_odontogram_selecting,
+            class_name=rx.cond(
+                OdontogramState.odontogram_selecting,
+                "px-3 py-1 text-sm rounded-md bg-blue-600 text-white",
+                "px-3 py-1 text-sm rounded-md bg-white border border-gray-300",
+            ),
+        ),
+        rx.el.button(
+            "Deshacer",
+            on_click=OdontogramState.undo_odontogram,
+            disabled=~OdontogramState.can_undo_odontogram,
+            class_name="px-3 py-1 text-sm rounded-md bg-white border border-gray-300 disabled:opacity-50",
+        ),
+        rx.cond(
+            OdontogramState.odontogram_selecting,
+            rx.el.div(
+                *[
+                    rx.el.button(
+                        preset,
+                        on_click=OdontogramState.select_odontogram_preset(
+                            preset
+                        ),
+                        class_name="px-2 py-1 text-xs rounded-md bg-white border border-blue-300 hover:bg-blue-100",
+                    )
+                    for preset in SELECTION_PRESETS
+                ],
+                rx.el.span(
+                    OdontogramState.odontogram_selection_count,
+                    " superficies",
+                    class_name="text-sm text-gray-600",
+                ),
+                rx.el.button(
+                    "Aplicar herramienta",
+                    on_click=OdontogramState.apply_odontogram_selection(
+                        False
+                    ),
+                    disabled=OdontogramState.odontogram_selection_count
+                    == 0,
+                    class_name="px-3 py-1 text-sm rounded-md bg-blue-600 text-white disabled:opacity-50",
+                ),
+                rx.el.button(
+                    "Borrar hallazgos",
+                    on_click=OdontogramState.apply_odontogram_selection(
+                        True
+                    ),
+                    disabled=OdontogramState.odontogram_selection_count
+                    == 0,
+                    class_name="px-3 py-1 text-sm rounded-md bg-white border border-red-300 text-red-700 disabled:opacity-50",
+                ),
+                rx.el.button(
+                    "Quitar selección",
+                    on_click=OdontogramState.clear_odontogram_selection,
+                    class_name="px-3 py-1 text-sm rounded-md bg-white border border-gray-300",
+                ),
+                class_name="flex flex-wrap items-center gap-2",
+            ),
+        ),
+        class_name="flex flex-wrap items-center gap-2 mt-4",
     )
 
 
 def interactive_odontogram() -> rx.Component:
-    upper_arch = [str(i) for i in range(18, 10, -1)] + [
-        str(i) for i in range(21, 29)
-    ]
-    lower_arch = [str(i) for i in range(48, 40, -1)] + [
-        str(i) for i in range(31, 39)
-    ]
     return rx.el.div(
         rx.el.div(
             rx.el.div(
@@ -134,29 +326,26 @@ def interactive_odontogram() -> rx.Component:
                 ),
                 rx.el.select(
                     rx.foreach(
-                        ClinicState.odontogram_diagnostics,
+                        ODONTOGRAM_DIAGNOSTICS,
                         lambda tool: rx.el.option(
                             tool, value=tool
                         ),
                     ),
-                    on_change=ClinicState.set_odontogram_tool,
-                    value=ClinicState.odontogram_tool,
+                    on_change=OdontogramState.set_odontogram_tool,
+                    value=OdontogramState.odontogram_tool,
                     class_name="px-3 py-2 border border-gray-300 rounded-md shadow-sm bg-white",
                 ),
                 class_name="flex items-center flex-wrap",
             ),
             rx.el.p(
                 "Herramienta seleccionada: ",
-                ClinicState.odontogram_tool,
+                OdontogramState.odontogram_tool,
                 class_name="text-sm text-gray-600 mt-2",
             ),
+            odontogram_bulk_toolbar(),
             class_name="mb-6 p-4 bg-blue-50 border border-blue-200 rounded-lg",
         ),
-        rx.el.div(
-            odontogram_arch("Arcada Superior", upper_arch),
-            odontogram_arch("Arcada Inferior", lower_arch),
-            class_name="space-y-6",
-        ),
+        odontogram_chart(),
         _editable_textarea(
             "Notas Generales del Odontograma",
             ["odontograma", "general_notes"],
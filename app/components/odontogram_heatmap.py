@@ -0,0 +1,143 @@
+import reflex as rx
+from app.states.analytics_state import AnalyticsState
+from app.states.dashboard_state import DashboardState
+from app.states.models import ODONTOGRAM_DIAGNOSTICS
+from app.components.odontogram import (
+    CHART_HEIGHT,
+    CHART_WIDTH,
+    SURFACE_CELLS,
+    TOOTH_CELLS,
+    TOOTH_SIZE,
+)
+
+
+def _heat_surface(cell: rx.Var) -> rx.Component:
+    tooth_heat = AnalyticsState.heatmap[
+        cell["tooth"].to(str)
+    ]
+    surface = cell["surface"].to(str)
+    return rx.el.polygon(
+        rx.el.title(tooth_heat[surface + "_label"]),
+        points=cell["points"].to(str),
+        style={"fill": tooth_heat[surface]},
+    )
+
+
+def _heat_tooth(cell: rx.Var) -> rx.Component:
+    x = cell["x"].to(int) + TOOTH_SIZE // 2
+    y = cell["y"].to(int)
+    return rx.el.g(
+        rx.el.text(
+            cell["tooth"].to(str),
+            x=x,
+            y=y - 6,
+            style={"text_anchor": "middle"},
+            class_name="text-[11px] font-semibold fill-gray-700",
+        ),
+        rx.el.text(
+            rx.el.title("Ausente"),
+            AnalyticsState.heatmap[cell["tooth"].to(str)][
+                "missing"
+            ],
+            x=x,
+            y=y + TOOTH_SIZE + 16,
+            style={"text_anchor": "middle"},
+            class_name="text-[10px] fill-gray-600",
+        ),
+    )
+
+
+def heatmap_chart() -> rx.Component:
+    return rx.el.div(
+        rx.el.svg(
+            rx.el.g(
+                rx.foreach(SURFACE_CELLS, _heat_surface),
+                stroke="#9ca3af",
+                stroke_width="1",
+            ),
+            rx.foreach(TOOTH_CELLS, _heat_tooth),
+            rx.el.line(
+                x1=CHART_WIDTH // 2,
+                y1=0,
+                x2=CHART_WIDTH // 2,
+                y2=CHART_HEIGHT,
+                stroke="#d1d5db",
+                stroke_dasharray="4 4",
+            ),
+            view_box=f"0 0 {CHART_WIDTH} {CHART_HEIGHT}",
+            class_name="w-full min-w-[640px] select-none",
+        ),
+        rx.el.p(
+            "Debajo de cada diente: porcentaje de pacientes en que está ausente.",
+            class_name="text-center text-xs text-gray-600 mt-2",
+        ),
+        class_name="bg-gray-50 p-2 md:p-4 rounded-lg border overflow-x-auto",
+    )
+
+
+def heatmap_filters() -> rx.Component:
+    return rx.el.div(
+        rx.el.select(
+            rx.foreach(
+                ODONTOGRAM_DIAGNOSTICS[1:],
+                lambda finding: rx.el.option(
+                    finding, value=finding
+                ),
+            ),
+            value=AnalyticsState.finding,
+            on_change=AnalyticsState.set_finding,
+            class_name="px-3 py-2 border border-gray-300 rounded-md shadow-sm bg-white",
+        ),
+        rx.el.select(
+            rx.el.option("Todos los estudiantes", value=""),
+            rx.foreach(
+                DashboardState.unique_student_emails,
+                lambda email: rx.el.option(
+                    email, value=email
+                ),
+            ),
+            value=AnalyticsState.filter_student,
+            on_change=AnalyticsState.set_filter_student,
+            class_name="px-3 py-2 border border-gray-300 rounded-md shadow-sm bg-white",
+        ),
+        rx.el.select(
+            rx.el.option("Todos los estados", value=""),
+            rx.el.option("Borrador", value="Borrador"),
+            rx.el.option("Pendiente", value="Pendiente"),
+            rx.el.option("Aprobado", value="Aprobado"),
+            rx.el.option("Rechazado", value="Rechazado"),
+            value=AnalyticsState.filter_status,
+            on_change=AnalyticsState.set_filter_status,
+            class_name="px-3 py-2 border border-gray-300 rounded-md shadow-sm bg-white",
+        ),
+        rx.el.input(
+            type="date",
+            value=AnalyticsState.date_from,
+            on_change=AnalyticsState.set_date_from,
+            class_name="px-3 py-2 border border-gray-300 rounded-md shadow-sm bg-white",
+        ),
+        rx.el.input(
+            type="date",
+            value=AnalyticsState.date_to,
+            on_change=AnalyticsState.set_date_to,
+            class_name="px-3 py-2 border border-gray-300 rounded-md shadow-sm bg-white",
+        ),
+        class_name="flex flex-col md:flex-row flex-wrap gap-4 mb-4",
+    )
+
+
+def odontogram_heatmap() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2(
+            "Analítica del Odontograma",
+            class_name="text-2xl font-bold text-gray-800 mb-4",
+        ),
+        rx.el.p(
+            "Prevalencia por diente y superficie en ",
+            AnalyticsState.patient_count,
+            " pacientes.",
+            class_name="text-gray-600 mb-6",
+        ),
+        heatmap_filters(),
+        heatmap_chart(),
+    )
\ No newline at end of file
@@ -1,14 +1,22 @@
 import reflex as rx
-from app.states.clinic_state import (
-    ClinicState,
-    Patient,
-    Status,
+from app.states.dashboard_state import DashboardState
+from app.states.models import (
+    PatientSummary,
+    StudentStatusCounts,
 )
 from .student_dashboard import status_badge
 
+SORT_OPTIONS = [
+    ("fecha_registro", "Fecha de Registro"),
+    ("status", "Estado"),
+    ("nombre", "Paciente"),
+    ("estudiante", "Estudiante"),
+]
+PAGE_SIZE_OPTIONS = ["10", "20", "50", "100"]
+
 
 def professor_patient_list_item(
-    patient: Patient,
+    patient: PatientSummary,
 ) -> rx.Component:
     return rx.el.tr(
         rx.el.td(
@@ -34,6 +42,10 @@ def professor_patient_list_item(
             status_badge(patient["status"]),
             class_name="px-4 py-3",
         ),
+        rx.el.td(
+            patient["cpod"],
+            class_name="px-4 py-3 text-sm text-gray-600",
+        ),
         rx.el.td(
             rx.el.div(
                 rx.el.a(
@@ -49,30 +61,297 @@ def professor_patient_list_item(
     )
 
 
+def status_count_badges(
+    counts: StudentStatusCounts,
+) -> rx.Component:
+    return rx.el.div(
+        rx.el.span(
+            "Pendientes: ",
+            counts["pendiente"],
+            class_name="bg-yellow-100 text-yellow-800 text-xs font-medium px-2.5 py-0.5 rounded-full",
+        ),
+        rx.el.span(
+            "Aprobadas: ",
+            counts["aprobado"],
+            class_name="bg-green-100 text-green-800 text-xs font-medium px-2.5 py-0.5 rounded-full",
+        ),
+        rx.el.span(
+            "Rechazadas: ",
+            counts["rechazado"],
+            class_name="bg-red-100 text-red-800 text-xs font-medium px-2.5 py-0.5 rounded-full",
+        ),
+        rx.el.span(
+            "CPO-D promedio: ",
+            counts["cpod_promedio"],
+            class_name="bg-blue-100 text-blue-800 text-xs font-medium px-2.5 py-0.5 rounded-full",
+        ),
+        class_name="flex flex-wrap gap-2",
+    )
+
+
+def student_status_row(
+    counts: StudentStatusCounts,
+) -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            counts["estudiante_email"],
+            on_click=DashboardState.set_filter_student(
+                counts["estudiante_email"]
+            ),
+            class_name="text-sm text-blue-600 hover:underline text-left",
+        ),
+        status_count_badges(counts),
+        class_name="flex flex-col md:flex-row md:items-center justify-between gap-2 py-2 border-b border-gray-100",
+    )
+
+
+def professor_status_summary() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(
+                "Resumen general",
+                class_name="font-semibold text-gray-700",
+            ),
+            status_count_badges(
+                DashboardState.professor_status_counts
+            ),
+            class_name="flex flex-col md:flex-row md:items-center justify-between gap-2",
+        ),
+        rx.el.details(
+            rx.el.summary(
+                "Resumen por estudiante",
+                class_name="cursor-pointer text-sm font-medium text-gray-600 mt-3",
+            ),
+            rx.foreach(
+                DashboardState.student_status_counts,
+                student_status_row,
+            ),
+        ),
+        class_name="bg-white rounded-lg shadow-md border border-gray-100 p-4 mb-6",
+    )
+
+
+def archive_export_controls() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            rx.icon("archive", class_name="h-4 w-4 mr-2"),
+            rx.cond(
+                DashboardState.archive_running,
+                "Generando ZIP...",
+                "Exportar ZIP",
+            ),
+            on_click=DashboardState.start_archive_export,
+            disabled=DashboardState.archive_running,
+            class_name="flex items-center bg-gray-700 text-white px-4 py-2 rounded-md hover:bg-gray-800 text-sm font-medium disabled:opacity-50",
+        ),
+        rx.cond(
+            DashboardState.archive_running,
+            rx.el.div(
+                rx.el.div(
+                    rx.el.div(
+                        class_name="h-2 bg-blue-600 rounded-full transition-all",
+                        style={
+                            "width": f"{DashboardState.archive_progress}%"
+                        },
+                    ),
+                    class_name="w-40 h-2 bg-gray-200 rounded-full overflow-hidden",
+                ),
+                rx.el.span(
+                    DashboardState.archive_done,
+                    " / ",
+                    DashboardState.archive_total,
+                    class_name="text-sm text-gray-600",
+                ),
+                class_name="flex items-center gap-2",
+            ),
+            rx.fragment(),
+        ),
+        rx.cond(
+            DashboardState.archive_id != "",
+            rx.el.button(
+                rx.icon(
+                    "download", class_name="h-4 w-4 mr-2"
+                ),
+                "Descargar ZIP",
+                on_click=DashboardState.download_archive,
+                class_name="flex items-center bg-green-600 text-white px-4 py-2 rounded-md hover:bg-green-700 text-sm font-medium",
+            ),
+            rx.fragment(),
+        ),
+        class_name="flex flex-wrap items-center gap-4 mb-4",
+    )
+
+
+def history_search_result(
+    patient: PatientSummary,
+) -> rx.Component:
+    return rx.el.li(
+        rx.el.div(
+            rx.el.p(
+                patient["nombre"],
+                class_name="font-semibold text-gray-800",
+            ),
+            rx.el.p(
+                patient["estudiante_email"],
+                class_name="text-sm text-gray-500",
+            ),
+            class_name="flex flex-col",
+        ),
+        rx.el.div(
+            status_badge(patient["status"]),
+            rx.el.a(
+                "Revisar",
+                href=f"/history/{patient['id']}",
+                class_name="text-blue-600 hover:underline font-medium",
+            ),
+            class_name="flex items-center gap-2",
+        ),
+        class_name="flex justify-between items-center py-2 border-b border-gray-100",
+    )
+
+
+def history_search() -> rx.Component:
+    return rx.el.div(
+        rx.debounce_input(
+            rx.el.input(
+                placeholder="Buscar en historias clínicas (p. ej. bruxismo, penicilina)",
+                value=DashboardState.history_search_query,
+                on_change=DashboardState.set_history_search_query,
+                class_name="w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500 bg-white",
+            ),
+            debounce_timeout=300,
+        ),
+        rx.cond(
+            DashboardState.history_search_query != "",
+            rx.el.div(
+                rx.el.ul(
+                    rx.foreach(
+                        DashboardState.history_search_results,
+                        history_search_result,
+                    )
+                ),
+                rx.el.div(
+                    rx.el.p(
+                        DashboardState.history_search_total,
+                        " resultados · Página ",
+                        DashboardState.history_search_page
+                        + 1,
+                        class_name="text-sm text-gray-600",
+                    ),
+                    rx.el.div(
+                        rx.el.button(
+                            "Anterior",
+                            on_click=DashboardState.previous_history_search_page,
+                            disabled=DashboardState.history_search_page
+                            == 0,
+                            class_name="bg-gray-200 text-gray-700 px-4 py-2 rounded-md hover:bg-gray-300 text-sm font-medium disabled:opacity-50 disabled:cursor-not-allowed",
+                        ),
+                        rx.el.button(
+                            "Siguiente",
+                            on_click=DashboardState.next_history_search_page,
+                            disabled=(
+                                DashboardState.history_search_page
+                                + 1
+                            )
+                            * DashboardState.history_search_page_size
+                            >= DashboardState.history_search_total,
+                            class_name="bg-gray-200 text-gray-700 px-4 py-2 rounded-md hover:bg-gray-300 text-sm font-medium disabled:opacity-50 disabled:cursor-not-allowed",
+                        ),
+                        class_name="flex items-center gap-2",
+                    ),
+                    class_name="flex justify-between items-center mt-3",
+                ),
+                class_name="mt-3",
+            ),
+            rx.fragment(),
+        ),
+        class_name="bg-white rounded-lg shadow-md border border-gray-100 p-4 mb-6",
+    )
+
+
+def professor_pagination() -> rx.Component:
+    return rx.el.div(
+        rx.el.p(
+            "Página ",
+            DashboardState.professor_page_number,
+            " · ",
+            DashboardState.professor_total,
+            " historias",
+            class_name="text-sm text-gray-600",
+        ),
+        rx.el.div(
+            rx.el.select(
+                rx.foreach(
+                    PAGE_SIZE_OPTIONS,
+                    lambda size: rx.el.option(
+                        size, " por página", value=size
+                    ),
+                ),
+                value=DashboardState.professor_page_size.to_string(),
+                on_change=DashboardState.set_professor_page_size,
+                class_name="px-3 py-2 border border-gray-300 rounded-md shadow-sm bg-white text-sm",
+            ),
+            rx.el.button(
+                "Anterior",
+                on_click=DashboardState.previous_professor_page,
+                disabled=DashboardState.professor_cursor_history.length()
+                == 0,
+                class_name="bg-gray-200 text-gray-700 px-4 py-2 rounded-md hover:bg-gray-300 text-sm font-medium disabled:opacity-50 disabled:cursor-not-allowed",
+            ),
+            rx.el.button(
+                "Siguiente",
+                on_click=DashboardState.next_professor_page,
+                disabled=DashboardState.professor_next_cursor
+                == "",
+                class_name="bg-gray-200 text-gray-700 px-4 py-2 rounded-md hover:bg-gray-300 text-sm font-medium disabled:opacity-50 disabled:cursor-not-allowed",
+            ),
+            class_name="flex items-center gap-2",
+        ),
+        class_name="flex flex-col md:flex-row justify-between items-center gap-4 mt-4",
+    )
+
+
 def professor_dashboard() -> rx.Component:
     return rx.el.div(
         rx.el.h2(
             "Panel de Profesor",
             class_name="text-2xl font-bold text-gray-800 mb-4",
         ),
-        rx.el.p(
-            "Revisa y valida las historias clínicas de los estudiantes.",
-            class_name="text-gray-600 mb-6",
+        rx.el.div(
+            rx.el.p(
+                "Revisa y valida las historias clínicas de los estudiantes.",
+                class_name="text-gray-600",
+            ),
+            rx.el.a(
+                rx.icon("flame", class_name="h-4 w-4 mr-2"),
+                "Analítica del Odontograma",
+                href="/analytics",
+                class_name="flex items-center bg-blue-600 text-white px-4 py-2 rounded-md hover:bg-blue-700 text-sm font-medium",
+            ),
+            class_name="flex flex-col md:flex-row justify-between items-start md:items-center gap-4 mb-6",
         ),
+        professor_status_summary(),
+        history_search(),
         rx.el.div(
             rx.el.div(
-                rx.el.select(
-                    rx.el.option(
-                        "Filtrar por Estudiante", value=""
+                rx.debounce_input(
+                    rx.el.input(
+                        placeholder="Filtrar por Estudiante (correo o nombre)",
+                        list="student-filter-options",
+                        value=DashboardState.filter_student,
+                        on_change=DashboardState.set_filter_student,
+                        class_name="w-full md:w-72 px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500 bg-white",
                     ),
+                    debounce_timeout=300,
+                ),
+                rx.el.datalist(
                     rx.foreach(
-                        ClinicState.unique_student_emails,
+                        DashboardState.unique_student_emails,
                         lambda email: rx.el.option(
-                            email, value=email
+                            value=email
                         ),
                     ),
-                    on_change=ClinicState.set_filter_student,
-                    class_name="w-full md:w-auto px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500 bg-white",
+                    id="student-filter-options",
                 ),
                 rx.el.select(
                     rx.el.option(
@@ -87,11 +366,39 @@ def professor_dashboard() -> rx.Component:
                     rx.el.option(
                         "Rechazado", value="Rechazado"
                     ),
-                    on_change=ClinicState.set_filter_status,
+                    on_change=DashboardState.set_filter_status,
                     class_name="w-full md:w-auto px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500 bg-white",
                 ),
+                rx.el.div(
+                    rx.el.select(
+                        *[
+                            rx.el.option(label, value=value)
+                            for value, label in SORT_OPTIONS
+                        ],
+                        value=DashboardState.professor_sort_by,
+                        on_change=DashboardState.set_professor_sort_by,
+                        class_name="px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500 bg-white",
+                    ),
+                    rx.el.button(
+                        rx.cond(
+                            DashboardState.professor_sort_desc,
+                            rx.icon(
+                                "arrow-down-wide-narrow",
+                                class_name="h-4 w-4",
+                            ),
+                            rx.icon(
+                                "arrow-up-narrow-wide",
+                                class_name="h-4 w-4",
+                            ),
+                        ),
+                        on_click=DashboardState.toggle_professor_sort_direction,
+                        class_name="px-3 py-2 border border-gray-300 rounded-md shadow-sm bg-white hover:bg-gray-50",
+                    ),
+                    class_name="flex gap-2 md:ml-auto",
+                ),
                 class_name="flex flex-col md:flex-row gap-4 mb-4",
             ),
+            archive_export_controls(),
             rx.el.div(
                 rx.el.table(
                     rx.el.thead(
@@ -108,6 +415,10 @@ def professor_dashboard() -> rx.Component:
                                 "Estado",
                                 class_name="px-4 py-2 text-left text-sm font-semibold text-gray-600",
                             ),
+                            rx.el.th(
+                                "CPO-D",
+                                class_name="px-4 py-2 text-left text-sm font-semibold text-gray-600",
+                            ),
                             rx.el.th(
                                 "", class_name="px-4 py-2"
                             ),
@@ -115,14 +426,14 @@ def professor_dashboard() -> rx.Component:
                     ),
                     rx.el.tbody(
                         rx.foreach(
-                            ClinicState.professor_patients,
+                            DashboardState.professor_patients,
                             professor_patient_list_item,
                         )
                     ),
                     class_name="w-full text-sm text-left text-gray-500",
                 ),
                 rx.cond(
-                    ClinicState.professor_patients.length()
+                    DashboardState.professor_patients.length()
                     == 0,
                     rx.el.div(
                         rx.el.p(
@@ -135,6 +446,7 @@ def professor_dashboard() -> rx.Component:
                 ),
                 class_name="bg-white rounded-lg shadow-md border border-gray-100 overflow-x-auto",
             ),
+            professor_pagination(),
             class_name="w-full",
         ),
     )
\ No newline at end of file
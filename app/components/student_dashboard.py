@@ -1,5 +1,6 @@
 import reflex as rx
-from app.states.clinic_state import ClinicState, Patient
+from app.states.dashboard_state import DashboardState
+from app.states.models import PatientSummary
 from app.states.auth_state import AuthState
 
 
@@ -29,7 +30,9 @@ def status_badge(status: rx.Var[str]) -> rx.Component:
     )
 
 
-def patient_list_item(patient: Patient) -> rx.Component:
+def patient_list_item(
+    patient: PatientSummary,
+) -> rx.Component:
     return rx.el.tr(
         rx.el.td(
             rx.el.div(
@@ -54,6 +57,10 @@ def patient_list_item(patient: Patient) -> rx.Component:
             status_badge(patient["status"]),
             class_name="px-4 py-3",
         ),
+        rx.el.td(
+            patient["cpod"],
+            class_name="px-4 py-3 text-sm text-gray-600",
+        ),
         rx.el.td(
             rx.el.div(
                 rx.el.a(
@@ -74,7 +81,7 @@ def add_patient_modal() -> rx.Component:
         rx.el.button(
             rx.icon("plus", class_name="mr-2 h-4 w-4"),
             "Agregar Nuevo Paciente",
-            on_click=ClinicState.toggle_add_patient_modal,
+            on_click=DashboardState.toggle_add_patient_modal,
             class_name="inline-flex items-center justify-center whitespace-nowrap rounded-md text-sm font-medium transition-colors text-white shadow bg-blue-600 hover:bg-blue-700 h-9 px-4 py-2",
         ),
         rx.el.dialog(
@@ -94,7 +101,7 @@ def add_patient_modal() -> rx.Component:
                     ),
                     rx.el.input(
                         placeholder="Ej. Juan Pérez",
-                        on_change=ClinicState.set_new_patient_name,
+                        on_change=DashboardState.set_new_patient_name,
                         class_name="w-full px-3 py-2 mt-1 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500",
                     ),
                     class_name="mb-4",
@@ -107,7 +114,7 @@ def add_patient_modal() -> rx.Component:
                     rx.el.input(
                         placeholder="Ej. 35",
                         type="number",
-                        on_change=ClinicState.set_new_patient_age,
+                        on_change=DashboardState.set_new_patient_age,
                         class_name="w-full px-3 py-2 mt-1 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500",
                     ),
                     class_name="mb-6",
@@ -115,12 +122,12 @@ def add_patient_modal() -> rx.Component:
                 rx.el.div(
                     rx.el.button(
                         "Cancelar",
-                        on_click=ClinicState.toggle_add_patient_modal,
+                        on_click=DashboardState.toggle_add_patient_modal,
                         class_name="cursor-pointer bg-gray-200 text-gray-700 px-4 py-2 rounded-md hover:bg-gray-300 text-sm font-medium transition-colors",
                     ),
                     rx.el.button(
                         "Guardar Paciente",
-                        on_click=ClinicState.add_patient,
+                        on_click=DashboardState.add_patient,
                         class_name="bg-blue-600 text-white px-4 py-2 rounded-md hover:bg-blue-700 text-sm font-medium transition-colors",
                     ),
                     class_name="flex justify-end gap-2 mt-4",
@@ -128,7 +135,7 @@ def add_patient_modal() -> rx.Component:
                 class_name="bg-white p-6 rounded-lg shadow-xl w-full max-w-md",
             ),
             class_name="fixed inset-0 bg-black/50 w-screen h-screen backdrop-blur-sm open:flex items-center justify-center z-50",
-            open=ClinicState.show_add_patient_modal,
+            open=DashboardState.show_add_patient_modal,
         ),
     )
 
@@ -136,9 +143,16 @@ def add_patient_modal() -> rx.Component:
 def student_dashboard() -> rx.Component:
     return rx.el.div(
         rx.el.div(
-            rx.el.h2(
-                "Mis Pacientes",
-                class_name="text-2xl font-bold text-gray-800",
+            rx.el.div(
+                rx.el.h2(
+                    "Mis Pacientes",
+                    class_name="text-2xl font-bold text-gray-800",
+                ),
+                rx.el.p(
+                    "CPO-D promedio: ",
+                    DashboardState.student_cpod_average,
+                    class_name="text-sm text-gray-600",
+                ),
             ),
             add_patient_modal(),
             class_name="flex justify-between items-center mb-6",
@@ -159,6 +173,10 @@ def student_dashboard() -> rx.Component:
                             "Estado",
                             class_name="px-4 py-2 text-left text-sm font-semibold text-gray-600",
                         ),
+                        rx.el.th(
+                            "CPO-D",
+                            class_name="px-4 py-2 text-left text-sm font-semibold text-gray-600",
+                        ),
                         rx.el.th(
                             "", class_name="px-4 py-2"
                         ),
@@ -166,14 +184,15 @@ def student_dashboard() -> rx.Component:
                 ),
                 rx.el.tbody(
                     rx.foreach(
-                        ClinicState.student_patients,
+                        DashboardState.student_patients,
                         patient_list_item,
                     )
                 ),
                 class_name="w-full text-sm text-left rtl:text-right text-gray-500",
             ),
             rx.cond(
-                ClinicState.student_patients.length() == 0,
+                DashboardState.student_patients.length()
+                == 0,
                 rx.el.div(
                     rx.el.p(
                         "No tienes pacientes registrados. Haz clic en 'Agregar Nuevo Paciente' para comenzar.",
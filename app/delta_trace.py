@@ -0,0 +1,53 @@
+import json
+import logging
+import os
+from reflex.event import Event
+from reflex.middleware import Middleware
+from reflex.state import BaseState, StateUpdate
+
+TRACE_DELTAS = os.environ.get(
+    "ODONTOTESS_TRACE_DELTAS", ""
+) not in ("", "0")
+STATE_VAR_SUFFIX = "_rx_state_"
+
+logger = logging.getLogger("odontotess.deltas")
+
+
+def delta_vars(delta: dict) -> dict[str, list[str]]:
+    return {
+        state_name.rsplit(".", 1)[-1].rsplit("____", 1)[
+            -1
+        ]: sorted(
+            var_name.removesuffix(STATE_VAR_SUFFIX)
+            for var_name in values
+        )
+        for state_name, values in delta.items()
+    }
+
+
+class DeltaTraceMiddleware(Middleware):
+    def __init__(self):
+        if not logger.handlers:
+            logger.addHandler(logging.StreamHandler())
+        logger.setLevel(logging.INFO)
+
+    async def preprocess(
+        self, app, state: BaseState, event: Event
+    ) -> StateUpdate | None:
+        return None
+
+    async def postprocess(
+        self,
+        app,
+        state: BaseState,
+        event: Event,
+        update: StateUpdate,
+    ) -> StateUpdate:
+        if update.delta:
+            logger.info(
+                "%s: %d B %s",
+                event.name.rsplit(".", 1)[-1],
+                len(json.dumps(update.delta, default=str)),
+                json.dumps(delta_vars(update.delta)),
+            )
+        return update
\ No newline at end of file
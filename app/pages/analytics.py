@@ -0,0 +1,26 @@
+import reflex as rx
+from app.states.auth_state import AuthState
+from app.components.odontogram_heatmap import (
+    odontogram_heatmap,
+)
+from app.pages.dashboard import dashboard_header
+
+
+def analytics() -> rx.Component:
+    return rx.el.div(
+        dashboard_header(),
+        rx.el.main(
+            rx.cond(
+                AuthState.is_professor,
+                odontogram_heatmap(),
+                rx.el.div(
+                    rx.spinner(
+                        class_name="text-blue-600 h-8 w-8"
+                    ),
+                    class_name="flex flex-col items-center justify-center h-full pt-16",
+                ),
+            ),
+            class_name="container mx-auto p-4 sm:p-6 lg:p-8",
+        ),
+        class_name="font-['Inter'] bg-gray-50 min-h-screen",
+    )
\ No newline at end of file
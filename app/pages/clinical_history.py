@@ -1,11 +1,16 @@
 import reflex as rx
 from app.states.auth_state import AuthState
 from app.states.clinic_state import ClinicState
+from app.states.history_editor_state import (
+    HistoryEditorState,
+)
+from app.states.review_state import ReviewState
 from app.components.clinical_history_form import (
     clinical_history_form,
 )
 from app.pages.dashboard import dashboard_header
 from app.components.student_dashboard import status_badge
+from app.components.form_helpers import flush_history_patch
 
 
 def reject_modal() -> rx.Component:
@@ -21,29 +26,91 @@ def reject_modal() -> rx.Component:
             ),
             rx.el.textarea(
                 placeholder="Ej. Faltan antecedentes personales...",
-                on_change=ClinicState.set_reject_observation,
+                on_change=ReviewState.set_reject_observation,
                 class_name="w-full px-3 py-2 mt-4 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500",
             ),
             rx.el.div(
                 rx.el.button(
                     "Cancelar",
-                    on_click=ClinicState.toggle_reject_dialog,
+                    on_click=ReviewState.toggle_reject_dialog,
                     class_name="cursor-pointer bg-gray-200 text-gray-700 px-4 py-2 rounded-md hover:bg-gray-300 text-sm font-medium",
                 ),
                 rx.el.button(
                     "Confirmar Rechazo",
-                    on_click=ClinicState.reject_history,
+                    on_click=ReviewState.reject_history,
                     class_name="bg-red-600 text-white px-4 py-2 rounded-md hover:bg-red-700 text-sm font-medium",
                 ),
                 class_name="flex justify-end gap-2 mt-4",
             ),
             class_name="bg-white p-6 rounded-lg shadow-xl w-full max-w-md",
         ),
-        open=ClinicState.show_reject_dialog,
+        open=ReviewState.show_reject_dialog,
         class_name="fixed inset-0 bg-black/50 w-screen h-screen backdrop-blur-sm open:flex items-center justify-center z-50",
     )
 
 
+def review_change_row(change: rx.Var) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(
+            change["campo"],
+            class_name="px-3 py-2 font-medium text-gray-700 align-top",
+        ),
+        rx.el.td(
+            change["anterior"],
+            class_name="px-3 py-2 bg-red-50 text-red-800 line-through decoration-red-300 align-top whitespace-pre-wrap",
+        ),
+        rx.el.td(
+            change["actual"],
+            class_name="px-3 py-2 bg-green-50 text-green-800 align-top whitespace-pre-wrap",
+        ),
+        class_name="border-b border-gray-100",
+    )
+
+
+def review_changes_panel() -> rx.Component:
+    return rx.cond(
+        AuthState.is_professor
+        & (ReviewState.review_changes.length() > 0),
+        rx.el.div(
+            rx.el.h3(
+                "Cambios desde la última revisión",
+                class_name="text-lg font-semibold text-gray-800 mb-3",
+            ),
+            rx.el.div(
+                rx.el.table(
+                    rx.el.thead(
+                        rx.el.tr(
+                            rx.el.th(
+                                "Campo",
+                                class_name="px-3 py-2 text-left",
+                            ),
+                            rx.el.th(
+                                "Antes",
+                                class_name="px-3 py-2 text-left",
+                            ),
+                            rx.el.th(
+                                "Ahora",
+                                class_name="px-3 py-2 text-left",
+                            ),
+                            class_name="bg-gray-50 text-xs uppercase text-gray-500",
+                        )
+                    ),
+                    rx.el.tbody(
+                        rx.foreach(
+                            ReviewState.review_changes,
+                            review_change_row,
+                        )
+                    ),
+                    class_name="w-full table-fixed text-sm",
+                ),
+                class_name="max-h-96 overflow-y-auto border border-gray-200 rounded-md",
+            ),
+            class_name="bg-white p-4 rounded-lg shadow-sm border border-yellow-200 mb-6",
+        ),
+        rx.fragment(),
+    )
+
+
 def action_buttons() -> rx.Component:
     is_student_editable = AuthState.is_student & (
         (ClinicState.safe_status == "Borrador")
@@ -55,15 +122,18 @@ def action_buttons() -> rx.Component:
     return rx.el.div(
         rx.el.button(
             "Guardar Avances",
-            on_click=rx.toast.success("Avances guardados."),
+            on_click=[
+                flush_history_patch(),
+                rx.toast.success("Avances guardados."),
+            ],
             class_name="bg-blue-600 text-white px-4 py-2 rounded-md hover:bg-blue-700 text-sm font-medium transition-colors",
         ),
         rx.cond(
             is_student_editable,
             rx.el.button(
                 "Enviar a Revisión",
-                on_click=ClinicState.submit_for_review,
-                disabled=ClinicState.is_history_form_invalid,
+                on_click=ReviewState.submit_for_review,
+                disabled=ReviewState.is_history_form_invalid,
                 class_name="bg-yellow-500 text-white px-4 py-2 rounded-md hover:bg-yellow-600 text-sm font-medium transition-colors disabled:opacity-50 disabled:cursor-not-allowed",
             ),
             rx.fragment(),
@@ -73,12 +143,12 @@ def action_buttons() -> rx.Component:
             rx.el.div(
                 rx.el.button(
                     "Rechazar",
-                    on_click=ClinicState.toggle_reject_dialog,
+                    on_click=ReviewState.toggle_reject_dialog,
                     class_name="bg-red-500 text-white px-4 py-2 rounded-md hover:bg-red-600 text-sm font-medium transition-colors",
                 ),
                 rx.el.button(
                     "Aprobar y Firmar",
-                    on_click=ClinicState.approve_history,
+                    on_click=ReviewState.approve_history,
                     class_name="bg-green-500 text-white px-4 py-2 rounded-md hover:bg-green-600 text-sm font-medium transition-colors",
                 ),
                 class_name="flex gap-2 md:gap-4",
@@ -87,13 +157,25 @@ def action_buttons() -> rx.Component:
         ),
         rx.cond(
             ClinicState.safe_status == "Aprobado",
-            rx.el.button(
-                rx.icon(
-                    "download", class_name="mr-2 h-4 w-4"
+            rx.fragment(
+                rx.el.button(
+                    rx.icon(
+                        "download",
+                        class_name="mr-2 h-4 w-4",
+                    ),
+                    "Descargar PDF",
+                    on_click=HistoryEditorState.generate_pdf,
+                    class_name="bg-green-700 text-white px-4 py-2 rounded-md hover:bg-green-800 text-sm font-medium transition-colors inline-flex items-center",
+                ),
+                rx.el.button(
+                    rx.icon(
+                        "file-code",
+                        class_name="mr-2 h-4 w-4",
+                    ),
+                    "Exportar HTML",
+                    on_click=HistoryEditorState.export_history,
+                    class_name="bg-white text-green-800 border border-green-700 px-4 py-2 rounded-md hover:bg-green-50 text-sm font-medium transition-colors inline-flex items-center",
                 ),
-                "Descargar PDF",
-                on_click=ClinicState.generate_pdf,
-                class_name="bg-green-700 text-white px-4 py-2 rounded-md hover:bg-green-800 text-sm font-medium transition-colors inline-flex items-center",
             ),
             rx.fragment(),
         ),
@@ -101,6 +183,26 @@ def action_buttons() -> rx.Component:
     )
 
 
+def professor_signature() -> rx.Component:
+    return rx.cond(
+        (ClinicState.safe_status == "Aprobado")
+        & (ClinicState.professor_signature_src != ""),
+        rx.el.div(
+            rx.el.p(
+                "Firma del profesor",
+                class_name="font-semibold text-green-800 mb-2",
+            ),
+            rx.el.img(
+                src=ClinicState.professor_signature_src,
+                alt="Firma del profesor",
+                class_name="h-24 w-auto",
+            ),
+            class_name="bg-green-50 border border-green-200 p-3 rounded-md mb-6 w-fit",
+        ),
+        rx.fragment(),
+    )
+
+
 def history_header() -> rx.Component:
     return rx.el.div(
         rx.el.div(
@@ -118,10 +220,14 @@ def history_header() -> rx.Component:
 
 def clinical_history() -> rx.Component:
     return rx.el.div(
-        dashboard_header(),
+        dashboard_header(
+            flush_history_patch(
+                HistoryEditorState.apply_history_patch_and_sign_out
+            )
+        ),
         rx.el.main(
             rx.cond(
-                ClinicState.selected_patient,
+                ClinicState.has_patient,
                 rx.el.div(
                     history_header(),
                     reject_modal(),
@@ -141,6 +247,8 @@ def clinical_history() -> rx.Component:
                         ),
                         rx.fragment(),
                     ),
+                    professor_signature(),
+                    review_changes_panel(),
                     clinical_history_form(),
                 ),
                 rx.el.div(
@@ -1,6 +1,6 @@
 import reflex as rx
 from app.states.auth_state import AuthState
-from app.states.clinic_state import ClinicState
+from app.states.dashboard_state import DashboardState
 from app.components.student_dashboard import (
     student_dashboard,
 )
@@ -9,7 +9,9 @@ from app.components.professor_dashboard import (
 )
 
 
-def dashboard_header() -> rx.Component:
+def dashboard_header(
+    on_sign_out: rx.event.EventType = AuthState.sign_out,
+) -> rx.Component:
     return rx.el.header(
         rx.el.div(
             rx.el.div(
@@ -38,7 +40,7 @@ def dashboard_header() -> rx.Component:
                         "Cerrar Sesión",
                         class_name="hidden md:block",
                     ),
-                    on_click=AuthState.sign_out,
+                    on_click=on_sign_out,
                     class_name="flex items-center bg-red-500 text-white px-3 py-2 rounded-md hover:bg-red-600 text-sm font-medium transition-colors",
                 ),
                 class_name="flex items-center gap-4",
@@ -74,5 +76,8 @@ def dashboard() -> rx.Component:
             class_name="container mx-auto p-4 sm:p-6 lg:p-8",
         ),
         class_name="font-['Inter'] bg-gray-50 min-h-screen",
-        on_mount=ClinicState.load_student_patients,
+        on_mount=[
+            DashboardState.load_student_patients,
+            DashboardState.load_professor_patients,
+        ],
     )
\ No newline at end of file
@@ -0,0 +1,96 @@
+import reflex as rx
+from app.states.auth_state import AuthState
+from app.states.clinic_store import get_clinic_store
+from app.states.odontogram_analytics import (
+    finding_rates,
+    missing_rates,
+    unpack_codes,
+)
+from app.states.odontogram_codec import (
+    FINDINGS,
+    SURFACES,
+    TEETH,
+)
+
+
+def _heat_color(rate: float, scale: float) -> str:
+    alpha = rate / scale if scale else 0.0
+    return f"rgba(220, 38, 38, {0.08 + 0.92 * alpha:.2f})"
+
+
+class AnalyticsState(rx.State):
+    filter_student: str = ""
+    filter_status: str = ""
+    date_from: str = ""
+    date_to: str = ""
+    finding: str = "Caries"
+    patient_count: int = 0
+    heatmap: dict[str, dict[str, str]] = {}
+
+    def _load_heatmap(self):
+        codes = get_clinic_store().odontogram_codes(
+            estudiante_email=self.filter_student or None,
+            status=self.filter_status or None,
+            date_from=self.date_from or None,
+            date_to=self.date_to or None,
+        )
+        findings, missing = unpack_codes(codes)
+        rates = finding_rates(findings)[
+            FINDINGS.index(self.finding)
+        ]
+        tooth_missing = missing_rates(missing)
+        scale = float(rates.max())
+        self.patient_count = len(codes)
+        self.heatmap = {
+            tooth: {
+                "missing": f"{tooth_missing[tooth_index]:.0%}",
+                **{
+                    surface: _heat_color(
+                        rates[tooth_index, surface_index],
+                        scale,
+                    )
+                    for surface_index, surface in enumerate(
+                        SURFACES
+                    )
+                },
+                **{
+                    f"{surface}_label": f"{surface.capitalize()}: {rates[tooth_index, surface_index]:.1%}"
+                    for surface_index, surface in enumerate(
+                        SURFACES
+                    )
+                },
+            }
+            for tooth_index, tooth in enumerate(TEETH)
+        }
+
+    @rx.event
+    async def load_analytics(self):
+        auth_state = await self.get_state(AuthState)
+        if auth_state.is_professor:
+            self._load_heatmap()
+
+    @rx.event
+    def set_filter_student(self, value: str):
+        self.filter_student = value
+        self._load_heatmap()
+
+    @rx.event
+    def set_filter_status(self, value: str):
+        self.filter_status = value
+        self._load_heatmap()
+
+    @rx.event
+    def set_date_from(self, value: str):
+        self.date_from = value
+        self._load_heatmap()
+
+    @rx.event
+    def set_date_to(self, value: str):
+        self.date_to = value
+        self._load_heatmap()
+
+    @rx.event
+    def set_finding(self, value: str):
+        if value in FINDINGS[1:]:
+            self.finding = value
+            self._load_heatmap()
\ No newline at end of file
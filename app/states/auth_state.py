@@ -104,7 +104,7 @@ class AuthState(rx.State):
 
     @rx.event
     def check_session(self):
-        current_page = self.router.page.path
+        current_page = self.router.route_id
         if self.in_session:
             if current_page in [
                 "/sign-in",
@@ -0,0 +1,165 @@
+import base64
+import functools
+import hashlib
+import os
+import re
+import tempfile
+from typing import Any, Optional
+from urllib.parse import unquote_to_bytes
+from app.states.patient_repository import BLOB_PATH
+
+BLOB_PREFIX = "/blobs/"
+BLOB_MEDIA_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "webp": "image/webp",
+    "svg": "image/svg+xml",
+}
+BLOB_EXTENSIONS = {
+    media_type: extension
+    for extension, media_type in BLOB_MEDIA_TYPES.items()
+}
+BLOB_NAME = re.compile(
+    r"^([0-9a-f]{64})\.("
+    + "|".join(BLOB_MEDIA_TYPES)
+    + r")$"
+)
+SIGNATURE_COLUMNS = (
+    "firma_paciente_url",
+    "firma_profesor_url",
+)
+SIGNATURE_FIELD_PATHS = (
+    ["firma_consentimiento", "firma_data_url"],
+)
+DATA_URL = re.compile(
+    r"^data:([\w.+-]+/[\w.+-]+)((?:;[\w=.+-]+)*),",
+    re.ASCII,
+)
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(
+        BLOB_PREFIX
+    )
+
+
+def decode_data_url(url: str) -> tuple[str, bytes]:
+    match = DATA_URL.match(url)
+    if match is None:
+        raise ValueError("URL de datos inválida")
+    payload = url[match.end() :]
+    data = (
+        base64.b64decode(payload, validate=True)
+        if ";base64" in match.group(2)
+        else unquote_to_bytes(payload)
+    )
+    return match.group(1).lower(), data
+
+
+class BlobStore:
+    def __init__(self, root: str):
+        self._root = root
+
+    def _path(self, digest: str, extension: str) -> str:
+        return os.path.join(
+            self._root, digest[:2], f"{digest}.{extension}"
+        )
+
+    def put(self, data: bytes, media_type: str) -> str:
+        extension = BLOB_EXTENSIONS.get(media_type)
+        if extension is None:
+            raise ValueError(
+                f"Tipo de archivo no admitido: {media_type}"
+            )
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest, extension)
+        if not os.path.exists(path):
+            os.makedirs(
+                os.path.dirname(path), exist_ok=True
+            )
+            descriptor, temporary = tempfile.mkstemp(
+                dir=os.path.dirname(path)
+            )
+            try:
+                with os.fdopen(descriptor, "wb") as blob:
+                    blob.write(data)
+                    blob.flush()
+                    os.fsync(blob.fileno())
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        return f"{BLOB_PREFIX}{digest}.{extension}"
+
+    def put_data_url(self, url: str) -> str:
+        media_type, data = decode_data_url(url)
+        return self.put(data, media_type)
+
+    def externalize(self, value: Any) -> Any:
+        if isinstance(value, str) and value.startswith(
+            "data:"
+        ):
+            return self.put_data_url(value)
+        return value
+
+    def externalize_columns(
+        self, values: dict[str, Any]
+    ) -> dict[str, Any]:
+        return {
+            column: (
+                self.externalize(value)
+                if column in SIGNATURE_COLUMNS
+                else value
+            )
+            for column, value in values.items()
+        }
+
+    def externalize_patches(
+        self, patches: list[tuple[list[str], Any]]
+    ) -> list[tuple[list[str], Any]]:
+        return [
+            (
+                field_path,
+                (
+                    self.externalize(value)
+                    if list(field_path)
+                    in SIGNATURE_FIELD_PATHS
+                    else value
+                ),
+            )
+            for field_path, value in patches
+        ]
+
+    def locate(
+        self, name: str
+    ) -> Optional[tuple[str, str, str]]:
+        match = BLOB_NAME.match(name)
+        if match is None:
+            return None
+        digest, extension = match.groups()
+        path = self._path(digest, extension)
+        if not os.path.exists(path):
+            return None
+        return path, digest, BLOB_MEDIA_TYPES[extension]
+
+    def read(self, ref: str) -> Optional[tuple[str, bytes]]:
+        if not is_blob_ref(ref):
+            return None
+        located = self.locate(ref[len(BLOB_PREFIX) :])
+        if located is None:
+            return None
+        path, _, media_type = located
+        with open(path, "rb") as blob:
+            return media_type, blob.read()
+
+    def data_url(self, ref: str) -> Optional[str]:
+        blob = self.read(ref)
+        if blob is None:
+            return None
+        media_type, data = blob
+        return f"data:{media_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+@functools.cache
+def get_blob_store() -> BlobStore:
+    return BlobStore(BLOB_PATH)
\ No newline at end of file
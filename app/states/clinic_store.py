@@ -0,0 +1,1014 @@
+import copy
+import datetime
+import functools
+import logging
+import numpy as np
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+from app.states.models import (
+    DMFT,
+    FieldValue,
+    HistoryChange,
+    Patient,
+    PatientSummary,
+    ReviewChange,
+    StudentStatusCounts,
+    create_initial_patients,
+)
+from app.states.blob_store import (
+    BlobStore,
+    get_blob_store,
+)
+from app.states.history_changelog import (
+    CHECKPOINT_INTERVAL,
+    replay,
+    review_changes,
+)
+from app.states.history_search_index import (
+    HistorySearchIndex,
+)
+from app.states.history_validation import (
+    HistoryValidationIndex,
+)
+from app.states.mutation_journal import (
+    JOURNAL_SNAPSHOT_ENTRIES,
+    MutationJournal,
+)
+from app.states.odontogram_analytics import (
+    OdontogramCohort,
+)
+from app.states.odontogram_codec import EMPTY_CODE
+from app.states.patient_filter_index import (
+    PatientFilterIndex,
+)
+from app.states.patient_repository import (
+    DATABASE_PATH,
+    JOURNAL_PATH,
+    PatientRepository,
+)
+
+CACHE_CAPACITY = int(
+    os.environ.get("ODONTOTESS_PATIENT_CACHE", "4096")
+)
+T = TypeVar("T")
+MISSING: Any = object()
+PATIENT_PARTS = ("header", "history", "odontogram")
+ODONTOGRAM_CODE_PATH = ["odontograma", "codigo"]
+STUDENT_NAME_PATH = (
+    "datos_administrativos",
+    "nombre_estudiante",
+)
+
+logger = logging.getLogger("odontotess.store")
+
+
+def patch_parts(field_path: list[str]) -> tuple[str, ...]:
+    if field_path == ODONTOGRAM_CODE_PATH:
+        return ("odontogram",)
+    if (
+        ODONTOGRAM_CODE_PATH[: len(field_path)]
+        == field_path
+    ):
+        return ("history", "odontogram")
+    return ("history",)
+
+
+class ClinicStore:
+    def __init__(
+        self,
+        repository: PatientRepository,
+        capacity: int = CACHE_CAPACITY,
+        journal: Optional[MutationJournal] = None,
+        blobs: Optional[BlobStore] = None,
+    ):
+        self._repository = repository
+        self._journal = journal
+        self._blobs = blobs
+        self._replaying_seq: Optional[int] = None
+        self._journaled_entries = 0
+        self._capacity = capacity
+        self._lock = threading.RLock()
+        self._patients: OrderedDict[str, Patient] = (
+            OrderedDict()
+        )
+        self._version = 0
+        self._list_version = 0
+        self._patient_versions: dict[str, int] = {}
+        self._part_versions: dict[tuple[str, str], int] = {}
+        self._change_heads: dict[str, int] = {}
+        self._derived: OrderedDict[
+            tuple[str, Callable], tuple[int, Any]
+        ] = OrderedDict()
+        self._search_index: Optional[HistorySearchIndex] = (
+            None
+        )
+        self._cohort: Optional[OdontogramCohort] = None
+        self._validation = HistoryValidationIndex()
+        self._filter_index = PatientFilterIndex()
+        for (
+            patient_id,
+            estudiante_email,
+            status,
+            nombre_estudiante,
+        ) in repository.patient_index():
+            self._filter_index.add(
+                patient_id,
+                estudiante_email,
+                status,
+                nombre_estudiante,
+            )
+        if journal is not None:
+            self._recover(journal)
+
+    def _recover(self, journal: MutationJournal):
+        applied_seq = self._repository.journal_seq()
+        journal.advance(applied_seq)
+        operations: dict[str, Callable] = {
+            "add": self.add,
+            "update_columns": self.update_columns,
+            "apply_history_patch": self.apply_history_patch,
+            "append_history_item": self.append_history_item,
+            "remove_history_item": self.remove_history_item,
+            "delete": self.delete,
+        }
+        replayed = 0
+        for (
+            seq,
+            operation,
+            arguments,
+        ) in journal.entries(applied_seq):
+            self._replaying_seq = seq
+            try:
+                operations[operation](*arguments)
+            except Exception:
+                logger.exception(
+                    "Mutación %d de la bitácora descartada",
+                    seq,
+                )
+                self._patients.clear()
+                self._change_heads.clear()
+                self._repository.set_journal_seq(seq)
+                continue
+            finally:
+                self._replaying_seq = None
+            replayed += 1
+        if replayed:
+            logger.info(
+                "%d mutaciones recuperadas de la bitácora",
+                replayed,
+            )
+        self.snapshot()
+
+    @contextmanager
+    def _journaled(
+        self,
+        operation: str,
+        *arguments: Any,
+        durable: bool = False,
+    ) -> Iterator[None]:
+        seq = self._replaying_seq
+        with self._repository.transaction():
+            yield
+            if seq is None and self._journal is not None:
+                seq = self._journal.append(
+                    operation, list(arguments)
+                )
+            if seq is not None:
+                self._repository.set_journal_seq(seq)
+        if (
+            self._journal is not None
+            and self._replaying_seq is None
+        ):
+            if durable:
+                self._journal.commit()
+            self._journaled_entries += 1
+            if (
+                self._journaled_entries
+                >= JOURNAL_SNAPSHOT_ENTRIES
+            ):
+                self.snapshot()
+
+    def snapshot(self):
+        with self._lock:
+            if self._journal is None:
+                return
+            self._journal.commit()
+            if self._repository.checkpoint():
+                self._journal.truncate()
+                self._journaled_entries = 0
+
+    def flush(self):
+        if self._journal is not None:
+            self._journal.commit()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def list_version(self) -> int:
+        return self._list_version
+
+    def patient_version(self, patient_id: str) -> int:
+        return self._patient_versions.get(patient_id, 0)
+
+    def part_version(
+        self, patient_id: str, part: str
+    ) -> int:
+        return self._part_versions.get(
+            (patient_id, part), 0
+        )
+
+    def _bump(
+        self,
+        patient_id: str,
+        parts: tuple[str, ...] = PATIENT_PARTS,
+    ):
+        self._version += 1
+        self._patient_versions[patient_id] = self._version
+        for part in parts:
+            self._part_versions[(patient_id, part)] = (
+                self._version
+            )
+
+    def derive(
+        self,
+        patient_id: str,
+        compute: Callable[[Patient], T],
+    ) -> Optional[T]:
+        with self._lock:
+            key = (patient_id, compute)
+            version = self.patient_version(patient_id)
+            cached = self._derived.get(key)
+            if cached is not None and cached[0] == version:
+                self._derived.move_to_end(key)
+                return cached[1]
+            patient = self.get(patient_id)
+            if patient is None:
+                return None
+            value = compute(patient)
+            self._derived[key] = (version, value)
+            self._derived.move_to_end(key)
+            while len(self._derived) > self._capacity:
+                self._derived.popitem(last=False)
+            return value
+
+    def _change_head(self, patient_id: str) -> int:
+        head = self._change_heads.get(patient_id)
+        if head is None:
+            head = self._repository.change_head(patient_id)
+            self._change_heads[patient_id] = head
+        return head
+
+    def _change_baseline(self, patient: Patient) -> Any:
+        return (
+            copy.deepcopy(patient["historia_clinica"])
+            if self._change_head(patient["id"]) == 0
+            else None
+        )
+
+    def _record_changes(
+        self,
+        patient: Patient,
+        changes: list[tuple[str, list[str], Any, Any]],
+        baseline: Any,
+    ):
+        if not changes:
+            return
+        patient_id = patient["id"]
+        head = self._change_head(patient_id)
+        if baseline is not None:
+            self._repository.add_checkpoint(
+                patient_id, 0, baseline
+            )
+        changed_at = datetime.datetime.now().strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        self._repository.append_changes(
+            patient_id,
+            [
+                {
+                    "seq": head + offset,
+                    "operation": operation,
+                    "field_path": field_path,
+                    "old_value": old_value,
+                    "new_value": new_value,
+                    "changed_at": changed_at,
+                }
+                for offset, (
+                    operation,
+                    field_path,
+                    old_value,
+                    new_value,
+                ) in enumerate(changes, 1)
+            ],
+        )
+        next_head = head + len(changes)
+        if (
+            next_head // CHECKPOINT_INTERVAL
+            > head // CHECKPOINT_INTERVAL
+        ):
+            self._repository.add_checkpoint(
+                patient_id,
+                next_head,
+                patient["historia_clinica"],
+            )
+        self._change_heads[patient_id] = next_head
+
+    def history_version(self, patient_id: str) -> int:
+        with self._lock:
+            return self._change_head(patient_id)
+
+    def history_at(
+        self, patient_id: str, seq: int
+    ) -> Optional[Any]:
+        with self._lock:
+            patient = self.get(patient_id)
+            if patient is None:
+                return None
+            head = self._change_head(patient_id)
+            if seq >= head:
+                return copy.deepcopy(
+                    patient["historia_clinica"]
+                )
+            checkpoint = self._repository.checkpoint_at(
+                patient_id, seq
+            )
+            if checkpoint is None:
+                return None
+            checkpoint_seq, history = checkpoint
+            return replay(
+                history,
+                self._repository.changes_between(
+                    patient_id, checkpoint_seq, seq
+                ),
+            )
+
+    def changes_since_review(
+        self, patient_id: str
+    ) -> list[HistoryChange]:
+        with self._lock:
+            return self._repository.changes_since_review(
+                patient_id
+            )
+
+    def review_changes(
+        self, patient_id: str
+    ) -> list[ReviewChange]:
+        return review_changes(
+            self.changes_since_review(patient_id)
+        )
+
+    def _remember(self, patient: Patient) -> Patient:
+        self._patients[patient["id"]] = patient
+        self._patients.move_to_end(patient["id"])
+        while len(self._patients) > self._capacity:
+            self._patients.popitem(last=False)
+        return patient
+
+    def get(self, patient_id: str) -> Optional[Patient]:
+        with self._lock:
+            if patient_id not in self._filter_index:
+                return None
+            patient = self._patients.get(patient_id)
+            if patient is not None:
+                self._patients.move_to_end(patient_id)
+                return patient
+            patient = self._repository.get(patient_id)
+            return (
+                self._remember(patient)
+                if patient is not None
+                else None
+            )
+
+    def get_many(
+        self, patient_ids: list[str]
+    ) -> list[Patient]:
+        with self._lock:
+            found = {
+                patient_id: self._patients[patient_id]
+                for patient_id in patient_ids
+                if patient_id in self._patients
+            }
+            for patient in self._repository.get_many(
+                [
+                    patient_id
+                    for patient_id in patient_ids
+                    if patient_id not in found
+                ]
+            ):
+                found[patient["id"]] = self._remember(
+                    patient
+                )
+            return [
+                found[patient_id]
+                for patient_id in patient_ids
+                if patient_id in found
+            ]
+
+    def _with_cpod(
+        self, summaries: list[PatientSummary]
+    ) -> list[PatientSummary]:
+        with self._lock:
+            counts = self._odontogram_cohort().dmft(
+                [summary["id"] for summary in summaries]
+            )
+        for summary, patient_counts in zip(
+            summaries, counts
+        ):
+            summary["cpod"] = int(patient_counts.sum())
+        return summaries
+
+    def dmft(self, patient_id: str) -> DMFT:
+        with self._lock:
+            if patient_id not in self._filter_index:
+                decayed = missing = filled = 0
+            else:
+                decayed, missing, filled = (
+                    int(count)
+                    for count in self._odontogram_cohort().dmft(
+                        [patient_id]
+                    )[
+                        0
+                    ]
+                )
+        return {
+            "cariados": decayed,
+            "perdidos": missing,
+            "obturados": filled,
+            "cpod": decayed + missing + filled,
+        }
+
+    def student_summaries(
+        self, estudiante_email: str
+    ) -> list[PatientSummary]:
+        return self._with_cpod(
+            self._repository.get_summaries(
+                self._filter_index.student_patient_ids(
+                    estudiante_email
+                )
+            )
+        )
+
+    def count_summaries(
+        self,
+        student_contains: str | None = None,
+        status: str | None = None,
+    ) -> int:
+        with self._lock:
+            if student_contains:
+                return len(
+                    self._filter_index.query(
+                        student_contains, status
+                    )
+                )
+            if status:
+                return self._filter_index.status_count(
+                    status
+                )
+            return len(self._filter_index)
+
+    def matching_patient_ids(
+        self,
+        student_contains: str | None = None,
+        status: str | None = None,
+    ) -> list[str]:
+        with self._lock:
+            return self._filter_index.patient_ids(
+                student_contains, status
+            )
+
+    def page_summaries(
+        self,
+        student_contains: str | None = None,
+        status: str | None = None,
+        sort_by: str = "fecha_registro",
+        descending: bool = False,
+        cursor: str = "",
+        limit: int = 20,
+    ) -> tuple[list[PatientSummary], str]:
+        with self._lock:
+            patient_ids = (
+                list(
+                    self._filter_index.query(
+                        student_contains, status
+                    )
+                )
+                if student_contains
+                else None
+            )
+        summaries, next_cursor = (
+            self._repository.page_summaries(
+                patient_ids=patient_ids,
+                status=(
+                    None
+                    if patient_ids is not None
+                    else status
+                ),
+                sort_by=sort_by,
+                descending=descending,
+                cursor=cursor,
+                limit=limit,
+            )
+        )
+        return self._with_cpod(summaries), next_cursor
+
+    def _history_search_index(self) -> HistorySearchIndex:
+        if self._search_index is None:
+            search_index = HistorySearchIndex()
+            for (
+                patient_id,
+                history,
+            ) in self._repository.iter_histories():
+                search_index.add(patient_id, history)
+            self._search_index = search_index
+        return self._search_index
+
+    def _reindex_history(
+        self,
+        patient: Patient,
+        field_path: list[str],
+        value: Any,
+    ):
+        patient_id = patient["id"]
+        if self._search_index is not None:
+            self._search_index.update(
+                patient_id, field_path, value
+            )
+        if (
+            tuple(field_path[: len(STUDENT_NAME_PATH)])
+            == STUDENT_NAME_PATH[: len(field_path)]
+        ):
+            name = (
+                patient["historia_clinica"]
+                .get("datos_administrativos", {})
+                .get("nombre_estudiante")
+            )
+            self._filter_index.set_student_name(
+                patient_id,
+                name if isinstance(name, str) else "",
+            )
+        self._validation.update(
+            patient_id,
+            field_path,
+            value,
+            patient["historia_clinica"],
+        )
+
+    def validation_bitmap(self, patient_id: str) -> int:
+        with self._lock:
+            if patient_id not in self._validation:
+                patient = self.get(patient_id)
+                if patient is None:
+                    return 0
+                self._validation.add(
+                    patient_id, patient["historia_clinica"]
+                )
+            return self._validation.bitmap(patient_id)
+
+    def search_histories(
+        self, query: str, offset: int = 0, limit: int = 10
+    ) -> tuple[list[PatientSummary], int]:
+        with self._lock:
+            (
+                patient_ids,
+                total,
+            ) = self._history_search_index().search(
+                query, offset, limit
+            )
+        return (
+            self._with_cpod(
+                self._repository.get_summaries(patient_ids)
+            ),
+            total,
+        )
+
+    def _odontogram_cohort(self) -> OdontogramCohort:
+        if self._cohort is None:
+            cohort = OdontogramCohort()
+            for (
+                patient_id,
+                estudiante_email,
+                status,
+                fecha_registro,
+                code,
+            ) in self._repository.odontogram_rows():
+                cohort.add(
+                    patient_id,
+                    code or EMPTY_CODE,
+                    estudiante_email,
+                    status,
+                    fecha_registro,
+                )
+            self._cohort = cohort
+        return self._cohort
+
+    def odontogram_codes(
+        self,
+        estudiante_email: str | None = None,
+        status: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+    ) -> np.ndarray:
+        with self._lock:
+            return self._odontogram_cohort().select(
+                estudiante_email=estudiante_email,
+                status=status,
+                date_from=date_from,
+                date_to=date_to,
+            )
+
+    def student_emails(self) -> list[str]:
+        with self._lock:
+            return list(self._filter_index.students)
+
+    def _status_counts(
+        self, estudiante_email: str, cpod_promedio: float
+    ) -> StudentStatusCounts:
+        if estudiante_email:
+            count = functools.partial(
+                self._filter_index.student_status_count,
+                estudiante_email,
+            )
+        else:
+            count = self._filter_index.status_count
+        return {
+            "estudiante_email": estudiante_email,
+            "pendiente": count("Pendiente"),
+            "aprobado": count("Aprobado"),
+            "rechazado": count("Rechazado"),
+            "cpod_promedio": round(cpod_promedio, 2),
+        }
+
+    def status_counts(self) -> StudentStatusCounts:
+        with self._lock:
+            return self._status_counts(
+                "", self._odontogram_cohort().dmft_average()
+            )
+
+    def student_status_counts(
+        self,
+    ) -> list[StudentStatusCounts]:
+        with self._lock:
+            averages = (
+                self._odontogram_cohort().student_dmft_averages()
+            )
+            return [
+                self._status_counts(
+                    estudiante_email,
+                    averages.get(estudiante_email, 0.0),
+                )
+                for estudiante_email in self._filter_index.students
+            ]
+
+    def next_patient_id(self) -> str:
+        return self._repository.next_patient_id()
+
+    def add(self, patient: Patient):
+        with self._lock:
+            with self._journaled("add", patient):
+                self._repository.add(patient)
+            self._filter_index.add(
+                patient["id"],
+                patient["estudiante_email"],
+                patient["status"],
+                patient["historia_clinica"]
+                .get("datos_administrativos", {})
+                .get("nombre_estudiante", ""),
+            )
+            if self._search_index is not None:
+                self._search_index.add(
+                    patient["id"],
+                    patient["historia_clinica"],
+                )
+            if self._cohort is not None:
+                self._cohort.add(
+                    patient["id"],
+                    patient["historia_clinica"]
+                    .get("odontograma", {})
+                    .get("codigo", EMPTY_CODE),
+                    patient["estudiante_email"],
+                    patient["status"],
+                    patient["fecha_registro"],
+                )
+            self._remember(patient)
+            self._bump(patient["id"])
+            self._list_version += 1
+
+    def update_columns(
+        self, patient_id: str, values: dict[str, Any]
+    ) -> Optional[Patient]:
+        if self._blobs is not None:
+            values = self._blobs.externalize_columns(values)
+        with self._lock:
+            patient = self.get(patient_id)
+            if patient is None:
+                return None
+            changes = (
+                [
+                    (
+                        "status",
+                        ["status"],
+                        patient["status"],
+                        values["status"],
+                    )
+                ]
+                if "status" in values
+                and values["status"] != patient["status"]
+                else []
+            )
+            baseline = (
+                self._change_baseline(patient)
+                if changes
+                else None
+            )
+            previous = {
+                column: patient.get(column)
+                for column in values
+            }
+            try:
+                with self._journaled(
+                    "update_columns",
+                    patient_id,
+                    values,
+                    durable=bool(changes),
+                ):
+                    self._repository.update_columns(
+                        patient_id, values
+                    )
+                    patient.update(values)  # type: ignore[typeddict-item]
+                    self._record_changes(
+                        patient, changes, baseline
+                    )
+            except BaseException:
+                patient.update(previous)  # type: ignore[typeddict-item]
+                self._change_heads.pop(patient_id, None)
+                raise
+            if "status" in values:
+                self._filter_index.set_status(
+                    patient_id, values["status"]
+                )
+                if self._cohort is not None:
+                    self._cohort.set_status(
+                        patient_id, values["status"]
+                    )
+            self._bump(patient_id, ("header",))
+            self._list_version += 1
+            return patient
+
+    def apply_history_patch(
+        self,
+        patient_id: str,
+        patches: list[tuple[list[str], FieldValue]],
+    ) -> Optional[Patient]:
+        if self._blobs is not None:
+            patches = self._blobs.externalize_patches(
+                patches
+            )
+        with self._lock:
+            patient = self.get(patient_id)
+            if patient is None or not patches:
+                return patient
+            baseline = self._change_baseline(patient)
+            changes = []
+            undo: list[tuple[dict, str, Any]] = []
+            try:
+                with self._journaled(
+                    "apply_history_patch",
+                    patient_id,
+                    patches,
+                ):
+                    self._repository.apply_history_patch(
+                        patient_id, patches
+                    )
+                    for field_path, value in patches:
+                        current_level: dict = patient[
+                            "historia_clinica"
+                        ]
+                        for key in field_path[:-1]:
+                            if key not in current_level:
+                                undo.append(
+                                    (
+                                        current_level,
+                                        key,
+                                        MISSING,
+                                    )
+                                )
+                            current_level = (
+                                current_level.setdefault(
+                                    key, {}
+                                )
+                            )
+                        old_value = current_level.get(
+                            field_path[-1], MISSING
+                        )
+                        undo.append(
+                            (
+                                current_level,
+                                field_path[-1],
+                                old_value,
+                            )
+                        )
+                        current_level[field_path[-1]] = (
+                            value
+                        )
+                        if old_value is MISSING:
+                            old_value = None
+                        if old_value != value:
+                            changes.append(
+                                (
+                                    "set",
+                                    list(field_path),
+                                    old_value,
+                                    value,
+                                )
+                            )
+                    self._record_changes(
+                        patient, changes, baseline
+                    )
+            except BaseException:
+                for container, key, value in reversed(undo):
+                    if value is MISSING:
+                        container.pop(key, None)
+                    else:
+                        container[key] = value
+                self._change_heads.pop(patient_id, None)
+                raise
+            for field_path, value in patches:
+                self._reindex_history(
+                    patient, field_path, value
+                )
+            parts = {
+                part
+                for field_path, _ in patches
+                for part in patch_parts(field_path)
+            }
+            if self._cohort is not None and (
+                "odontogram" in parts
+            ):
+                self._cohort.set_code(
+                    patient_id,
+                    patient["historia_clinica"]
+                    .get("odontograma", {})
+                    .get("codigo", EMPTY_CODE),
+                )
+            self._bump(patient_id, tuple(sorted(parts)))
+            return patient
+
+    def update_odontogram(
+        self,
+        patient_id: str,
+        update: Callable[[str], str],
+    ) -> Optional[Patient]:
+        with self._lock:
+            patient = self.get(patient_id)
+            if patient is None:
+                return None
+            current = (
+                patient["historia_clinica"]
+                .get("odontograma", {})
+                .get("codigo", EMPTY_CODE)
+            )
+            code = update(current)
+            if code == current:
+                return patient
+            return self.apply_history_patch(
+                patient_id,
+                [(ODONTOGRAM_CODE_PATH, code)],
+            )
+
+    def append_history_item(
+        self,
+        patient_id: str,
+        field_path: list[str],
+        item: dict,
+    ) -> Optional[Patient]:
+        with self._lock:
+            patient = self.get(patient_id)
+            if patient is None:
+                return None
+            baseline = self._change_baseline(patient)
+            current_level: Any = patient["historia_clinica"]
+            for key in field_path:
+                current_level = current_level[key]
+            appended = False
+            try:
+                with self._journaled(
+                    "append_history_item",
+                    patient_id,
+                    field_path,
+                    item,
+                ):
+                    self._repository.append_history_item(
+                        patient_id, field_path, item
+                    )
+                    current_level.append(item)
+                    appended = True
+                    self._record_changes(
+                        patient,
+                        [
+                            (
+                                "append",
+                                list(field_path),
+                                None,
+                                item,
+                            )
+                        ],
+                        baseline,
+                    )
+            except BaseException:
+                if appended:
+                    current_level.pop()
+                self._change_heads.pop(patient_id, None)
+                raise
+            self._reindex_history(
+                patient,
+                [*field_path, str(len(current_level) - 1)],
+                item,
+            )
+            self._bump(patient_id, ("history",))
+            return patient
+
+    def remove_history_item(
+        self,
+        patient_id: str,
+        field_path: list[str],
+        index: int,
+    ) -> Optional[Patient]:
+        with self._lock:
+            patient = self.get(patient_id)
+            if patient is None:
+                return None
+            baseline = self._change_baseline(patient)
+            current_level: Any = patient["historia_clinica"]
+            for key in field_path:
+                current_level = current_level[key]
+            removed = MISSING
+            try:
+                with self._journaled(
+                    "remove_history_item",
+                    patient_id,
+                    field_path,
+                    index,
+                ):
+                    self._repository.remove_history_item(
+                        patient_id, field_path, index
+                    )
+                    removed = current_level.pop(index)
+                    self._record_changes(
+                        patient,
+                        [
+                            (
+                                "remove",
+                                [*field_path, str(index)],
+                                removed,
+                                None,
+                            )
+                        ],
+                        baseline,
+                    )
+            except BaseException:
+                if removed is not MISSING:
+                    current_level.insert(index, removed)
+                self._change_heads.pop(patient_id, None)
+                raise
+            self._reindex_history(
+                patient, field_path, current_level
+            )
+            self._bump(patient_id, ("history",))
+            return patient
+
+    def delete(self, patient_id: str):
+        with self._lock:
+            with self._journaled("delete", patient_id):
+                self._repository.delete(patient_id)
+            self._filter_index.remove(patient_id)
+            if self._search_index is not None:
+                self._search_index.remove(patient_id)
+            if self._cohort is not None:
+                self._cohort.remove(patient_id)
+            self._validation.remove(patient_id)
+            self._change_heads.pop(patient_id, None)
+            self._patients.pop(patient_id, None)
+            self._bump(patient_id)
+            self._list_version += 1
+
+
+@functools.cache
+def get_clinic_store() -> ClinicStore:
+    repository = PatientRepository(DATABASE_PATH)
+    repository.seed(create_initial_patients())
+    return ClinicStore(
+        repository,
+        journal=MutationJournal(JOURNAL_PATH),
+        blobs=get_blob_store(),
+    )
\ No newline at end of file
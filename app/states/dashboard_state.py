@@ -0,0 +1,367 @@
+import reflex as rx
+import datetime
+import logging
+import time
+from reflex.config import get_config
+from app.states.auth_state import AuthState
+from app.states.clinic_state import ClinicState
+from app.states.clinic_store import get_clinic_store
+from app.states.history_archive import (
+    ARCHIVE_PROGRESS_INTERVAL,
+    HistoryArchive,
+    prune_archives,
+)
+from app.states.history_export import get_export_tokens
+from app.states.history_pdf import get_pdf_renderer
+from app.states.models import (
+    Patient,
+    PatientSummary,
+    StudentStatusCounts,
+    create_empty_history,
+)
+
+logger = logging.getLogger("odontotess.archive")
+
+
+class DashboardState(ClinicState):
+    student_patients: list[PatientSummary] = []
+    filter_student: str = ""
+    filter_status: str = ""
+    professor_patients: list[PatientSummary] = []
+    professor_total: int = 0
+    professor_sort_by: str = "fecha_registro"
+    professor_sort_desc: bool = True
+    professor_page_size: int = 20
+    professor_cursor: str = ""
+    professor_cursor_history: list[str] = []
+    professor_next_cursor: str = ""
+    professor_status_counts: StudentStatusCounts = {
+        "estudiante_email": "",
+        "pendiente": 0,
+        "aprobado": 0,
+        "rechazado": 0,
+        "cpod_promedio": 0.0,
+    }
+    student_status_counts: list[StudentStatusCounts] = []
+    history_search_query: str = ""
+    history_search_results: list[PatientSummary] = []
+    history_search_total: int = 0
+    history_search_page: int = 0
+    history_search_page_size: int = 10
+    new_patient_name: str = ""
+    new_patient_age: int = 0
+    show_add_patient_modal: bool = False
+    archive_running: bool = False
+    archive_done: int = 0
+    archive_total: int = 0
+    archive_id: str = ""
+
+    @rx.var
+    def professor_page_number(self) -> int:
+        return len(self.professor_cursor_history) + 1
+
+    @rx.var
+    def archive_progress(self) -> int:
+        if not self.archive_total:
+            return 0
+        return round(
+            100 * self.archive_done / self.archive_total
+        )
+
+    @rx.var(deps=["store_list_version"])
+    def unique_student_emails(self) -> list[str]:
+        return get_clinic_store().student_emails()
+
+    @rx.var
+    def student_cpod_average(self) -> float:
+        if not self.student_patients:
+            return 0.0
+        return round(
+            sum(
+                patient["cpod"]
+                for patient in self.student_patients
+            )
+            / len(self.student_patients),
+            2,
+        )
+
+    @rx.event
+    async def load_student_patients(self):
+        auth_state = await self.get_state(AuthState)
+        self._sync_store_version()
+        if auth_state.current_user_email:
+            self.student_patients = (
+                get_clinic_store().student_summaries(
+                    auth_state.current_user_email
+                )
+            )
+
+    def _load_professor_page(self):
+        store = get_clinic_store()
+        filters = {
+            "student_contains": self.filter_student or None,
+            "status": self.filter_status or None,
+        }
+        (
+            self.professor_patients,
+            self.professor_next_cursor,
+        ) = store.page_summaries(
+            **filters,
+            sort_by=self.professor_sort_by,
+            descending=self.professor_sort_desc,
+            cursor=self.professor_cursor,
+            limit=self.professor_page_size,
+        )
+        self.professor_total = store.count_summaries(
+            **filters
+        )
+
+    def _reset_professor_page(self):
+        self.professor_cursor = ""
+        self.professor_cursor_history = []
+        self._load_professor_page()
+
+    @rx.event
+    async def load_professor_patients(self):
+        auth_state = await self.get_state(AuthState)
+        self._sync_store_version()
+        if auth_state.is_professor:
+            store = get_clinic_store()
+            self.professor_status_counts = (
+                store.status_counts()
+            )
+            self.student_status_counts = (
+                store.student_status_counts()
+            )
+            self._reset_professor_page()
+            if self.history_search_query:
+                self._load_history_search()
+
+    @rx.event
+    def set_filter_student(self, value: str):
+        self.filter_student = value
+        self._reset_professor_page()
+
+    @rx.event
+    def set_filter_status(self, value: str):
+        self.filter_status = value
+        self._reset_professor_page()
+
+    @rx.event
+    def set_professor_sort_by(self, value: str):
+        self.professor_sort_by = value
+        self._reset_professor_page()
+
+    @rx.event
+    def toggle_professor_sort_direction(self):
+        self.professor_sort_desc = (
+            not self.professor_sort_desc
+        )
+        self._reset_professor_page()
+
+    @rx.event
+    def set_professor_page_size(self, value: str):
+        try:
+            self.professor_page_size = max(1, int(value))
+        except (ValueError, TypeError):
+            self.professor_page_size = 20
+        self._reset_professor_page()
+
+    @rx.event
+    def next_professor_page(self):
+        if self.professor_next_cursor:
+            self.professor_cursor_history.append(
+                self.professor_cursor
+            )
+            self.professor_cursor = (
+                self.professor_next_cursor
+            )
+            self._load_professor_page()
+
+    @rx.event
+    def previous_professor_page(self):
+        if self.professor_cursor_history:
+            self.professor_cursor = (
+                self.professor_cursor_history.pop()
+            )
+            self._load_professor_page()
+
+    @rx.event(background=True)
+    async def start_archive_export(self):
+        async with self:
+            auth_state = await self.get_state(AuthState)
+            patient_ids = (
+                get_clinic_store().matching_patient_ids(
+                    self.filter_student or None,
+                    self.filter_status or None,
+                )
+                if auth_state.is_professor
+                and not self.archive_running
+                else []
+            )
+            if patient_ids:
+                self.archive_running = True
+                self.archive_done = 0
+                self.archive_total = len(patient_ids)
+                self.archive_id = ""
+        if not patient_ids:
+            yield rx.toast.warning(
+                "No hay historias clínicas que exportar con los filtros actuales."
+            )
+            return
+        prune_archives()
+        archive = HistoryArchive(patient_ids)
+        reported = time.monotonic()
+        done = 0
+        try:
+            async for done in archive.write(
+                get_clinic_store(), get_pdf_renderer()
+            ):
+                if (
+                    time.monotonic() - reported
+                    >= ARCHIVE_PROGRESS_INTERVAL
+                ):
+                    reported = time.monotonic()
+                    async with self:
+                        self.archive_done = done
+        except Exception:
+            logger.exception(
+                "No se pudo generar el archivo ZIP"
+            )
+            async with self:
+                self.archive_running = False
+            yield rx.toast.error(
+                "No se pudo generar el archivo ZIP."
+            )
+            return
+        async with self:
+            self.archive_running = False
+            self.archive_done = self.archive_total
+            self.archive_id = archive.archive_id
+        yield rx.toast.success(
+            f"ZIP listo con {done} historias clínicas."
+        )
+
+    @rx.event
+    def download_archive(self):
+        if not self.archive_id:
+            return rx.toast.error(
+                "No hay un archivo ZIP disponible."
+            )
+        token = get_export_tokens().issue(
+            self.archive_id, kind="archive"
+        )
+        self.archive_id = ""
+        self.archive_total = 0
+        return rx.redirect(
+            f"{get_config().api_url}/export/archive/{token}",
+            is_external=True,
+        )
+
+    def _load_history_search(self):
+        (
+            self.history_search_results,
+            self.history_search_total,
+        ) = get_clinic_store().search_histories(
+            self.history_search_query,
+            offset=self.history_search_page
+            * self.history_search_page_size,
+            limit=self.history_search_page_size,
+        )
+
+    @rx.event
+    def set_history_search_query(self, value: str):
+        self.history_search_query = value
+        self.history_search_page = 0
+        self._load_history_search()
+
+    @rx.event
+    def next_history_search_page(self):
+        if (
+            self.history_search_page + 1
+        ) * self.history_search_page_size < (
+            self.history_search_total
+        ):
+            self.history_search_page += 1
+            self._load_history_search()
+
+    @rx.event
+    def previous_history_search_page(self):
+        if self.history_search_page > 0:
+            self.history_search_page -= 1
+            self._load_history_search()
+
+    @rx.event
+    def toggle_add_patient_modal(self):
+        self.show_add_patient_modal = (
+            not self.show_add_patient_modal
+        )
+
+    @rx.event
+    def set_new_patient_name(self, name: str):
+        self.new_patient_name = name
+
+    @rx.event
+    def set_new_patient_age(self, age: str):
+        try:
+            self.new_patient_age = int(age)
+        except (ValueError, TypeError):
+            self.new_patient_age = 0
+
+    @rx.event
+    async def add_patient(self):
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.current_user_email:
+            yield rx.toast.error(
+                "No se pudo identificar al estudiante."
+            )
+            return
+        if (
+            not self.new_patient_name
+            or self.new_patient_age <= 0
+        ):
+            yield rx.toast.error(
+                "Nombre y edad del paciente son requeridos."
+            )
+            return
+        store = get_clinic_store()
+        new_id = store.next_patient_id()
+        today = datetime.date.today().isoformat()
+        empty_history = create_empty_history()
+        empty_history["datos_generales"][
+            "nombre_completo"
+        ] = self.new_patient_name
+        empty_history["datos_generales"]["edad"] = str(
+            self.new_patient_age
+        )
+        empty_history["datos_generales"][
+            "fecha_ingreso"
+        ] = today
+        empty_history["datos_administrativos"][
+            "nombre_estudiante"
+        ] = auth_state.current_user_name
+        empty_history["datos_administrativos"][
+            "matricula_estudiante"
+        ] = auth_state.current_user_email
+        new_patient: Patient = {
+            "id": new_id,
+            "nombre": self.new_patient_name,
+            "edad": self.new_patient_age,
+            "fecha_registro": today,
+            "status": "Borrador",
+            "estudiante_email": auth_state.current_user_email,
+            "historia_clinica": empty_history,
+            "firma_paciente_url": None,
+            "firma_profesor_url": None,
+            "fecha_firma_profesor": None,
+            "observaciones_rechazo": None,
+        }
+        store.add(new_patient)
+        self._sync_store_version()
+        self.new_patient_name = ""
+        self.new_patient_age = 0
+        self.show_add_patient_modal = False
+        yield DashboardState.load_student_patients
+        yield rx.toast.success(
+            f"Paciente '{new_patient['nombre']}' agregado."
+        )
\ No newline at end of file
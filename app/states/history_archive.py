@@ -0,0 +1,132 @@
+import asyncio
+import os
+import re
+import secrets
+import tempfile
+import time
+import zipfile
+from collections import deque
+from typing import AsyncIterator, Optional
+from app.states.clinic_store import ClinicStore
+from app.states.history_pdf import (
+    PDF_WORKERS,
+    HistoryPdfRenderer,
+)
+from app.states.models import Patient
+
+ARCHIVE_DIR = os.environ.get(
+    "ODONTOTESS_ARCHIVE_DIR",
+    os.path.join(
+        tempfile.gettempdir(), "odontotess-archives"
+    ),
+)
+ARCHIVE_TTL = float(
+    os.environ.get("ODONTOTESS_ARCHIVE_TTL", "3600")
+)
+ARCHIVE_WINDOW = max(2, PDF_WORKERS * 2)
+ARCHIVE_PROGRESS_INTERVAL = 0.25
+ARCHIVE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+UNSAFE_NAME = re.compile(r"[^\w.@-]+")
+
+
+def archive_member(patient: Patient) -> str:
+    estudiante = UNSAFE_NAME.sub(
+        "_", patient["estudiante_email"]
+    ).strip("_")
+    nombre = UNSAFE_NAME.sub("_", patient["nombre"]).strip(
+        "_"
+    )
+    return f"{estudiante or 'sin_estudiante'}/{nombre or 'paciente'}_{patient['id']}.pdf"
+
+
+def archive_path(archive_id: str) -> Optional[str]:
+    if not ARCHIVE_ID.match(archive_id):
+        return None
+    return os.path.join(ARCHIVE_DIR, f"{archive_id}.zip")
+
+
+def archive_filename(path: str) -> str:
+    return time.strftime(
+        "historias_clinicas_%Y-%m-%d.zip",
+        time.localtime(os.path.getmtime(path)),
+    )
+
+
+def prune_archives(max_age: float = ARCHIVE_TTL):
+    if not os.path.isdir(ARCHIVE_DIR):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(ARCHIVE_DIR):
+        if (
+            entry.name.endswith(".zip")
+            and entry.stat().st_mtime < cutoff
+        ):
+            remove_archive(entry.path)
+
+
+def remove_archive(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class HistoryArchive:
+    def __init__(self, patient_ids: list[str]):
+        self.archive_id = secrets.token_urlsafe(16)
+        self.path = os.path.join(
+            ARCHIVE_DIR, f"{self.archive_id}.zip"
+        )
+        self._patient_ids = patient_ids
+
+    async def write(
+        self,
+        store: ClinicStore,
+        renderer: HistoryPdfRenderer,
+        window: int = ARCHIVE_WINDOW,
+    ) -> AsyncIterator[int]:
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        pending: deque[tuple[str, asyncio.Future]] = deque()
+        written = 0
+        try:
+            with zipfile.ZipFile(
+                self.path, "w", zipfile.ZIP_STORED
+            ) as archive:
+                for start in range(
+                    0, len(self._patient_ids), window
+                ):
+                    for patient in store.get_many(
+                        self._patient_ids[
+                            start : start + window
+                        ]
+                    ):
+                        pending.append(
+                            (
+                                archive_member(patient),
+                                asyncio.wrap_future(
+                                    renderer.submit(
+                                        patient,
+                                        store.patient_version(
+                                            patient["id"]
+                                        ),
+                                    )
+                                ),
+                            )
+                        )
+                    while len(pending) > (
+                        window
+                        if start + window
+                        < len(self._patient_ids)
+                        else 0
+                    ):
+                        name, render = pending.popleft()
+                        await asyncio.to_thread(
+                            archive.writestr,
+                            name,
+                            await render,
+                        )
+                        written += 1
+                        yield written
+        except BaseException:
+            remove_archive(self.path)
+            raise
\ No newline at end of file
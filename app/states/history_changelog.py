@@ -0,0 +1,192 @@
+import copy
+from typing import Any
+from app.states.models import HistoryChange, ReviewChange
+from app.states.odontogram_codec import (
+    FINDINGS,
+    SURFACE_COUNT,
+    SURFACES,
+    TEETH,
+    finding_digits,
+)
+
+CHECKPOINT_INTERVAL = 64
+ODONTOGRAM_CODE_PATH = ("odontograma", "codigo")
+SIGNATURE_STROKES_PATH = (
+    "firma_consentimiento",
+    "firma_trazos",
+)
+EMPTY_VALUE = "—"
+
+
+def replay(
+    history: Any, changes: list[HistoryChange]
+) -> Any:
+    history = copy.deepcopy(history)
+    for change in changes:
+        field_path = change["field_path"]
+        if change["operation"] == "set":
+            current_level = history
+            for key in field_path[:-1]:
+                current_level = current_level.setdefault(
+                    key, {}
+                )
+            current_level[field_path[-1]] = copy.deepcopy(
+                change["new_value"]
+            )
+        elif change["operation"] in ("append", "remove"):
+            current_level = history
+            for key in field_path[:-1]:
+                current_level = current_level[key]
+            if change["operation"] == "append":
+                current_level[field_path[-1]].append(
+                    copy.deepcopy(change["new_value"])
+                )
+            else:
+                del current_level[int(field_path[-1])]
+    return history
+
+
+def field_label(field_path: list[str]) -> str:
+    return " › ".join(
+        key.replace("_", " ").capitalize()
+        for key in field_path
+    )
+
+
+def format_value(value: Any) -> str:
+    if value is None or value == "":
+        return EMPTY_VALUE
+    if isinstance(value, bool):
+        return "Sí" if value else "No"
+    if isinstance(value, dict):
+        return (
+            " · ".join(
+                format_value(item)
+                for item in value.values()
+                if item not in (None, "")
+            )
+            or EMPTY_VALUE
+        )
+    if isinstance(value, list):
+        return f"{len(value)} elementos"
+    return str(value)
+
+
+def odontogram_changes(
+    old_code: str, new_code: str
+) -> list[ReviewChange]:
+    old_digits = finding_digits(old_code or "")
+    new_digits = finding_digits(new_code or "")
+    changes: list[ReviewChange] = []
+    for index, (old, new) in enumerate(
+        zip(old_digits, new_digits)
+    ):
+        if old == new:
+            continue
+        if index < SURFACE_COUNT:
+            tooth, surface = divmod(index, len(SURFACES))
+            changes.append(
+                {
+                    "campo": f"Odontograma › {TEETH[tooth]} {SURFACES[surface]}",
+                    "anterior": FINDINGS[int(old)]
+                    or "Sano",
+                    "actual": FINDINGS[int(new)] or "Sano",
+                }
+            )
+        else:
+            changes.append(
+                {
+                    "campo": f"Odontograma › {TEETH[index - SURFACE_COUNT]}",
+                    "anterior": (
+                        "Ausente"
+                        if old == "1"
+                        else "Presente"
+                    ),
+                    "actual": (
+                        "Ausente"
+                        if new == "1"
+                        else "Presente"
+                    ),
+                }
+            )
+    return changes
+
+
+def review_changes(
+    changes: list[HistoryChange],
+) -> list[ReviewChange]:
+    coalesced: dict[tuple, list] = {}
+    for change in changes:
+        field_path = change["field_path"]
+        if change["operation"] == "set":
+            key: tuple = tuple(field_path)
+            if key in coalesced:
+                coalesced[key][2] = change["new_value"]
+            else:
+                coalesced[key] = [
+                    field_path,
+                    change["old_value"],
+                    change["new_value"],
+                ]
+        elif change["operation"] == "append":
+            coalesced[("append", change["seq"])] = [
+                field_path,
+                None,
+                change["new_value"],
+            ]
+        elif change["operation"] == "remove":
+            appended = next(
+                (
+                    key
+                    for key, (
+                        path,
+                        old,
+                        new,
+                    ) in coalesced.items()
+                    if key[0] == "append"
+                    and path == field_path[:-1]
+                    and new == change["old_value"]
+                ),
+                None,
+            )
+            if appended is not None:
+                del coalesced[appended]
+            else:
+                coalesced[("remove", change["seq"])] = [
+                    field_path[:-1],
+                    change["old_value"],
+                    None,
+                ]
+    rows: list[ReviewChange] = []
+    for field_path, old, new in coalesced.values():
+        if old == new:
+            continue
+        if tuple(field_path) == ODONTOGRAM_CODE_PATH:
+            rows.extend(odontogram_changes(old, new))
+        elif tuple(field_path) == SIGNATURE_STROKES_PATH:
+            rows.append(
+                {
+                    "campo": "Firma del paciente",
+                    "anterior": (
+                        "Capturada" if old else EMPTY_VALUE
+                    ),
+                    "actual": (
+                        (
+                            "Recapturada"
+                            if old
+                            else "Capturada"
+                        )
+                        if new
+                        else EMPTY_VALUE
+                    ),
+                }
+            )
+        else:
+            rows.append(
+                {
+                    "campo": field_label(field_path),
+                    "anterior": format_value(old),
+                    "actual": format_value(new),
+                }
+            )
+    return rows
\ No newline at end of file
@@ -0,0 +1,247 @@
+import reflex as rx
+import datetime
+from typing import get_type_hints, is_typeddict
+from reflex.config import get_config
+from reflex.vars.function import FunctionStringVar
+from app.states.auth_state import AuthState
+from app.states.clinic_state import ClinicState
+from app.states.clinic_store import get_clinic_store
+from app.states.history_export import get_export_tokens
+from app.states.history_pdf import get_pdf_renderer
+from app.states.models import ClinicalHistory, FieldValue
+from app.states.signature_strokes import decode_strokes
+
+SIGNATURE_STROKES_FIELD = [
+    "firma_consentimiento",
+    "firma_trazos",
+]
+PROTECTED_FIELD_PATHS = (
+    ["odontograma", "codigo"],
+    ["odontograma", "teeth"],
+    SIGNATURE_STROKES_FIELD,
+)
+
+
+def _leaf_types(
+    typed_dict: type, prefix: tuple[str, ...] = ()
+) -> dict[tuple[str, ...], type]:
+    leaves: dict[tuple[str, ...], type] = {}
+    for key, hint in get_type_hints(typed_dict).items():
+        if is_typeddict(hint):
+            leaves.update(_leaf_types(hint, (*prefix, key)))
+        elif hint in (str, bool):
+            leaves[(*prefix, key)] = hint
+    return leaves
+
+
+HISTORY_LEAF_TYPES = _leaf_types(ClinicalHistory)
+
+
+def is_editable_path(field_path: list) -> bool:
+    return (
+        isinstance(field_path, list)
+        and all(isinstance(key, str) for key in field_path)
+        and tuple(field_path) in HISTORY_LEAF_TYPES
+        and not any(
+            field_path[: len(protected)] == protected
+            or protected[: len(field_path)] == field_path
+            for protected in PROTECTED_FIELD_PATHS
+        )
+    )
+
+
+def is_editable_patch(patch: object) -> bool:
+    return (
+        isinstance(patch, list)
+        and len(patch) == 2
+        and is_editable_path(patch[0])
+        and isinstance(
+            patch[1], HISTORY_LEAF_TYPES[tuple(patch[0])]
+        )
+    )
+
+
+class HistoryEditorState(ClinicState):
+    nueva_nota_evolucion: str = ""
+    nueva_nota_observaciones: str = ""
+
+    @rx.event
+    def set_nueva_nota_evolucion(self, value: str):
+        self.nueva_nota_evolucion = value
+
+    @rx.event
+    def set_nueva_nota_observaciones(self, value: str):
+        self.nueva_nota_observaciones = value
+
+    def _apply_history_patches(
+        self, patches: list[tuple[list[str], FieldValue]]
+    ):
+        patient_id = self._route_patient_id()
+        if not patient_id or not patches:
+            return
+        try:
+            get_clinic_store().apply_history_patch(
+                patient_id, patches
+            )
+        except ValueError as error:
+            return rx.toast.error(
+                f"No se pudo guardar el cambio: {error}"
+            )
+        self._sync_store_version()
+
+    def _update_history_field(
+        self, field_path: list[str], value: FieldValue
+    ):
+        if is_editable_patch([field_path, value]):
+            return self._apply_history_patches(
+                [(field_path, value)]
+            )
+
+    def _apply_history_batch(self, batch: dict | None):
+        if not isinstance(batch, dict):
+            return
+        patches = batch.get("patches")
+        if not isinstance(patches, list) or not patches:
+            return
+        patches = [
+            patch
+            for patch in patches
+            if is_editable_patch(patch)
+        ]
+        if (
+            batch.get("patient_id")
+            != self._route_patient_id()
+        ):
+            return [
+                rx.call_function(
+                    FunctionStringVar.create(
+                        "odontotessHistoryPatch.restore"
+                    ).call(batch.get("patient_id"), patches)
+                ),
+                rx.toast.error(
+                    "Los cambios pendientes pertenecen a otro paciente y no se guardaron aquí."
+                ),
+            ]
+        return self._apply_history_patches(
+            [(patch[0], patch[1]) for patch in patches]
+        )
+
+    @rx.event
+    def apply_history_patch(self, batch: dict | None):
+        return self._apply_history_batch(batch)
+
+    @rx.event
+    def apply_history_patch_and_sign_out(
+        self, batch: dict | None
+    ):
+        result = self._apply_history_batch(batch)
+        return (
+            [result, AuthState.sign_out]
+            if result is not None
+            else AuthState.sign_out
+        )
+
+    @rx.event
+    def update_history_field_str(
+        self, field_path: list[str], value: str
+    ):
+        return self._update_history_field(field_path, value)
+
+    @rx.event
+    def update_history_field_bool(
+        self, field_path: list[str], value: str
+    ):
+        return self._update_history_field(
+            field_path, value == "true"
+        )
+
+    @rx.event
+    def save_signature(self, code: str | None):
+        if not code:
+            return rx.toast.error(
+                "Dibuje la firma antes de guardarla."
+            )
+        try:
+            decode_strokes(code)
+        except ValueError:
+            return rx.toast.error("La firma no es válida.")
+        return self._apply_history_patches(
+            [(SIGNATURE_STROKES_FIELD, code)]
+        ) or rx.toast.success("Firma guardada.")
+
+    @rx.event
+    def clear_signature(self):
+        return self._apply_history_patches(
+            [(SIGNATURE_STROKES_FIELD, "")]
+        )
+
+    @rx.event
+    def add_evolucion_note(self):
+        patient_id = self._route_patient_id()
+        patient = self._get_patient(patient_id)
+        if patient is not None:
+            if not self.nueva_nota_evolucion and (
+                not self.nueva_nota_observaciones
+            ):
+                return rx.toast.error(
+                    "Debe completar al menos un campo de la nota."
+                )
+            new_note = {
+                "fecha_hora": datetime.datetime.now().strftime(
+                    "%Y-%m-%d %H:%M"
+                ),
+                "procedimiento_signos_vitales": self.nueva_nota_evolucion,
+                "observaciones": self.nueva_nota_observaciones,
+            }
+            get_clinic_store().append_history_item(
+                patient["id"], ["seguimiento"], new_note
+            )
+            self._sync_store_version()
+            self.nueva_nota_evolucion = ""
+            self.nueva_nota_observaciones = ""
+
+    @rx.event
+    def delete_evolucion_note(self, index: int):
+        patient_id = self._route_patient_id()
+        if patient_id:
+            get_clinic_store().remove_history_item(
+                patient_id, ["seguimiento"], index
+            )
+            self._sync_store_version()
+
+    @rx.event
+    async def generate_pdf(self):
+        patient = self._get_patient(
+            self._route_patient_id()
+        )
+        if not patient:
+            return rx.toast.error(
+                "No hay un paciente seleccionado."
+            )
+        pdf = await get_pdf_renderer().render(
+            patient,
+            get_clinic_store().patient_version(
+                patient["id"]
+            ),
+        )
+        filename = f"historia_clinica_{patient['nombre'].replace(' ', '_')}.pdf"
+        return rx.download(
+            data=pdf,
+            filename=filename,
+            mime_type="application/pdf",
+        )
+
+    @rx.event
+    def export_history(self):
+        patient = self._get_patient(
+            self._route_patient_id()
+        )
+        if not patient:
+            return rx.toast.error(
+                "No hay un paciente seleccionado."
+            )
+        token = get_export_tokens().issue(patient["id"])
+        return rx.redirect(
+            f"{get_config().api_url}/export/history/{token}",
+            is_external=True,
+        )
\ No newline at end of file
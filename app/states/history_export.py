@@ -0,0 +1,325 @@
+import base64
+import functools
+import html
+import re
+import secrets
+import string
+import threading
+import time
+import typing
+from typing import Any, Iterator, Mapping, Optional
+from urllib.parse import quote
+from app.states.blob_store import (
+    get_blob_store,
+    is_blob_ref,
+)
+from app.states.history_changelog import (
+    field_label,
+    format_value,
+)
+from app.states.history_pdf import LOGO_PATH
+from app.states.history_validation import SECTION_TITLES
+from app.states.models import ClinicalHistory, Patient
+from app.states.odontogram_codec import decode_teeth
+from app.states.signature_strokes import (
+    is_stroke_code,
+    signature_data_url,
+)
+
+EXPORT_CHUNK_SIZE = 16 * 1024
+EXPORT_TOKEN_TTL = 60.0
+NEEDS_ESCAPE = re.compile(r"[&<>\"']")
+SPECIAL_SECTIONS = (
+    "odontograma",
+    "seguimiento",
+    "firma_consentimiento",
+)
+EXPORT_STYLES = """
+body { font-family: Arial, sans-serif; color: #333; margin: 24px; }
+header { display: flex; align-items: center; gap: 16px; border-bottom: 2px solid #000; padding-bottom: 10px; margin-bottom: 20px; }
+header img { height: 60px; }
+header h1 { font-size: 24px; margin: 0; }
+section { margin-bottom: 20px; border: 1px solid #ccc; border-radius: 6px; padding: 12px 16px; page-break-inside: avoid; }
+h2 { font-size: 16px; margin: 0 0 10px; }
+.grid { display: grid; grid-template-columns: 1fr 1fr; gap: 8px 16px; }
+.label { display: block; font-size: 11px; font-weight: bold; color: #666; }
+.value { white-space: pre-wrap; }
+table { width: 100%; border-collapse: collapse; }
+td, th { border: 1px solid #ccc; padding: 4px 8px; text-align: left; }
+article { border-bottom: 1px solid #eee; padding: 6px 0; }
+h3 { font-size: 13px; margin: 0 0 4px; }
+.signature { max-height: 120px; border: 1px solid #ccc; }
+"""
+
+
+def escape(value: Any) -> str:
+    text = format_value(value)
+    if NEEDS_ESCAPE.search(text) is None:
+        return text
+    return html.escape(text)
+
+
+class ExportTemplate:
+    def __init__(self, source: str):
+        self._parts = tuple(
+            (literal, field)
+            for literal, field, _, _ in string.Formatter().parse(
+                source
+            )
+        )
+
+    def render(
+        self, values: Mapping[str, Any]
+    ) -> Iterator[str]:
+        for literal, field in self._parts:
+            if literal:
+                yield literal
+            if field is not None:
+                yield escape(values.get(field))
+
+
+def section_title(section: str) -> str:
+    return SECTION_TITLES.get(
+        section, field_label([section])
+    )
+
+
+def _field_template(section: str, fields: list[str]) -> str:
+    return (
+        f'<section><h2>{html.escape(section_title(section))}</h2><div class="grid">'
+        + "".join(
+            f'<div><span class="label">{html.escape(field_label([field]))}</span>'
+            f'<span class="value">{{{field}}}</span></div>'
+            for field in fields
+        )
+        + "</div></section>"
+    )
+
+
+def _compile_sections() -> (
+    tuple[tuple[str, ExportTemplate], ...]
+):
+    sections = []
+    for section, annotation in typing.get_type_hints(
+        ClinicalHistory
+    ).items():
+        if section in SPECIAL_SECTIONS:
+            continue
+        if typing.is_typeddict(annotation):
+            source = _field_template(
+                section, list(annotation.__annotations__)
+            )
+        else:
+            source = (
+                f"<section><h2>{html.escape(section_title(section))}</h2>"
+                f'<p class="value">{{{section}}}</p></section>'
+            )
+        sections.append((section, ExportTemplate(source)))
+    return tuple(sections)
+
+
+SECTION_TEMPLATES = _compile_sections()
+ODONTOGRAM_OPEN = (
+    f"<section><h2>{html.escape(section_title('odontograma'))}</h2>"
+    "<table><tr><th>Diente</th><th>Estado</th></tr>"
+)
+TOOTH_TEMPLATE = ExportTemplate(
+    "<tr><td>{diente}</td><td>{estado}</td></tr>"
+)
+ODONTOGRAM_CLOSE = ExportTemplate(
+    '</table><p class="value">{general_notes}</p></section>'
+)
+NOTES_OPEN = f"<section><h2>{html.escape(section_title('seguimiento'))}</h2>"
+NOTE_TEMPLATE = ExportTemplate(
+    "<article><h3>{fecha_hora}</h3>"
+    "<p><b>Procedimiento:</b> {procedimiento_signos_vitales}</p>"
+    "<p><b>Observaciones:</b> {observaciones}</p></article>"
+)
+NO_NOTES = "<p>Sin notas de evolución.</p>"
+SIGNATURES_TEMPLATE = ExportTemplate(
+    '</section><section><h2>Firmas y Consentimiento</h2><div class="grid">'
+    '<div><span class="label">Consentimiento Paciente</span><span class="value">{consentimiento}</span></div>'
+    '<div><span class="label">Firma Profesor</span><span class="value">{firma_profesor}</span></div>'
+    "</div>"
+)
+SIGNATURE_IMAGE_TEMPLATE = ExportTemplate(
+    '<img class="signature" src="{src}" alt="{alt}">'
+)
+DOCUMENT_CLOSE = "</section></body></html>"
+
+
+@functools.cache
+def header_template() -> ExportTemplate:
+    with open(LOGO_PATH, "rb") as logo:
+        logo_url = (
+            "data:image/png;base64,"
+            + base64.b64encode(logo.read()).decode("ascii")
+        )
+    styles = EXPORT_STYLES.replace("{", "{{").replace(
+        "}", "}}"
+    )
+    return ExportTemplate(
+        '<!DOCTYPE html><html lang="es"><head><meta charset="utf-8">'
+        f"<title>Historia Clínica · {{nombre}}</title><style>{styles}</style></head><body>"
+        f'<header><img src="{logo_url}" alt="Logo UPEM"><div>'
+        "<h1>Historia Clínica Odontológica</h1>"
+        "<p>{nombre} · {status} · Registro {fecha_registro}</p>"
+        "</div></header>"
+    )
+
+
+def signature_src(ref: Any) -> Optional[str]:
+    if is_stroke_code(ref):
+        try:
+            return signature_data_url(ref)
+        except ValueError:
+            return None
+    if is_blob_ref(ref):
+        return get_blob_store().data_url(ref)
+    if str(ref or "").startswith("data:image/"):
+        return ref
+    return None
+
+
+def _history_parts(patient: Patient) -> Iterator[str]:
+    history: Any = patient["historia_clinica"]
+    yield from header_template().render(patient)
+    for section, template in SECTION_TEMPLATES:
+        values = history.get(section)
+        yield from template.render(
+            values
+            if isinstance(values, dict)
+            else {section: values}
+        )
+    odontograma = history.get("odontograma", {})
+    yield ODONTOGRAM_OPEN
+    for tooth, tooth_state in sorted(
+        decode_teeth(odontograma.get("codigo", "")).items()
+    ):
+        findings = (
+            ["Ausente"]
+            if tooth_state.get("missing")
+            else []
+        )
+        findings.extend(
+            f"{surface.capitalize()}: {finding}"
+            for surface, finding in tooth_state.get(
+                "surfaces", {}
+            ).items()
+        )
+        yield from TOOTH_TEMPLATE.render(
+            {"diente": tooth, "estado": ", ".join(findings)}
+        )
+    yield from ODONTOGRAM_CLOSE.render(odontograma)
+    yield NOTES_OPEN
+    notes = history.get("seguimiento", [])
+    for note in notes:
+        yield from NOTE_TEMPLATE.render(note)
+    if not notes:
+        yield NO_NOTES
+    consent = history.get("firma_consentimiento", {})
+    yield from SIGNATURES_TEMPLATE.render(
+        {
+            "consentimiento": (
+                "Aceptado"
+                if consent.get("aceptado")
+                else "No Aceptado"
+            ),
+            "firma_profesor": (
+                f"Firmado el {patient.get('fecha_firma_profesor')}"
+                if patient.get("firma_profesor_url")
+                else "Sin firma"
+            ),
+        }
+    )
+    for alt, ref in (
+        (
+            "Firma del paciente",
+            consent.get("firma_trazos")
+            or consent.get("firma_data_url"),
+        ),
+        (
+            "Firma del profesor",
+            patient.get("firma_profesor_url"),
+        ),
+    ):
+        src = signature_src(ref)
+        if src:
+            yield from SIGNATURE_IMAGE_TEMPLATE.render(
+                {"src": src, "alt": alt}
+            )
+    yield DOCUMENT_CLOSE
+
+
+def iter_history_html(
+    patient: Patient, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[str]:
+    buffer: list[str] = []
+    length = 0
+    for part in _history_parts(patient):
+        buffer.append(part)
+        length += len(part)
+        if length >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            length = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def export_filename(patient: Patient) -> str:
+    return f"historia_clinica_{patient['nombre'].replace(' ', '_')}.html"
+
+
+def content_disposition(filename: str) -> str:
+    return f"attachment; filename*=UTF-8''{quote(filename)}"
+
+
+class ExportTokens:
+    def __init__(self, ttl: float = EXPORT_TOKEN_TTL):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._tokens: dict[str, tuple[str, str, float]] = {}
+
+    def issue(
+        self, target: str, kind: str = "history"
+    ) -> str:
+        token = secrets.token_urlsafe(24)
+        now = time.monotonic()
+        with self._lock:
+            for expired in [
+                key
+                for key, (
+                    _,
+                    _,
+                    expires,
+                ) in self._tokens.items()
+                if expires < now
+            ]:
+                del self._tokens[expired]
+            self._tokens[token] = (
+                kind,
+                target,
+                now + self._ttl,
+            )
+        return token
+
+    def redeem(
+        self, token: str, kind: str = "history"
+    ) -> Optional[str]:
+        with self._lock:
+            token_kind, target, expires = self._tokens.pop(
+                token, ("", "", 0.0)
+            )
+        return (
+            target
+            if token_kind == kind
+            and target
+            and expires >= time.monotonic()
+            else None
+        )
+
+
+@functools.cache
+def get_export_tokens() -> ExportTokens:
+    return ExportTokens()
\ No newline at end of file
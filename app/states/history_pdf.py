@@ -0,0 +1,787 @@
+import asyncio
+import copy
+import functools
+import multiprocessing
+import os
+import struct
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Optional
+from app.states.history_changelog import (
+    field_label,
+    format_value,
+)
+from app.states.history_validation import SECTION_TITLES
+from app.states.models import Patient
+from app.states.odontogram_codec import decode_teeth
+from app.states.signature_strokes import (
+    Point,
+    is_stroke_code,
+    simplified_strokes,
+)
+
+ASSETS_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))
+        )
+    ),
+    "assets",
+)
+LOGO_PATH = os.path.join(ASSETS_PATH, "logo_pdf.png")
+PDF_WORKERS = int(
+    os.environ.get(
+        "ODONTOTESS_PDF_WORKERS",
+        str(min(2, os.cpu_count() or 1)),
+    )
+)
+PDF_CACHE_SIZE = int(
+    os.environ.get("ODONTOTESS_PDF_CACHE", "64")
+)
+
+PAGE_WIDTH = 595.0
+PAGE_HEIGHT = 842.0
+MARGIN = 40.0
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+COLUMN_GAP = 16.0
+SIGNATURE_BOX_WIDTH = 200.0
+FONTS = {"F1": "Helvetica", "F2": "Helvetica-Bold"}
+HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333,
+    389, 584, 278, 333, 278, 278, 556, 556, 556, 556,
+    556, 556, 556, 556, 556, 556, 278, 278, 584, 584,
+    584, 556, 1015, 667, 667, 722, 722, 667, 611, 778,
+    722, 278, 500, 667, 556, 833, 722, 778, 667, 778,
+    722, 667, 611, 722, 667, 944, 667, 667, 611, 278,
+    278, 278, 469, 556, 333, 556, 556, 500, 556, 556,
+    278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500,
+    500, 334, 260, 334, 584,
+)  # fmt: skip
+HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333,
+    389, 584, 278, 333, 278, 278, 556, 556, 556, 556,
+    556, 556, 556, 556, 556, 556, 333, 333, 584, 584,
+    584, 611, 975, 722, 722, 722, 722, 667, 611, 778,
+    722, 278, 556, 722, 611, 833, 722, 778, 667, 778,
+    722, 667, 611, 722, 667, 944, 667, 667, 611, 333,
+    278, 333, 584, 556, 333, 556, 611, 556, 611, 556,
+    333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556,
+    500, 389, 280, 389, 584,
+)  # fmt: skip
+FONT_WIDTHS = {
+    "F1": HELVETICA_WIDTHS,
+    "F2": HELVETICA_BOLD_WIDTHS,
+}
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_COLORS = {0: 1, 2: 3}
+DATOS_GENERALES_FIELDS = (
+    ("Nombre Completo", "nombre_completo"),
+    ("Edad", "edad"),
+    ("Sexo", "sexo"),
+    ("Fecha de Nacimiento", "fecha_nacimiento"),
+    ("Estado Civil", "estado_civil"),
+    ("Ocupación", "ocupacion"),
+    ("Dirección", "direccion"),
+    ("Teléfono", "telefono"),
+)
+FIELD_SECTIONS = (
+    "padecimiento_actual",
+    "exploracion_clinica_general",
+)
+
+
+def text_width(text: str, font: str, size: float) -> float:
+    widths = FONT_WIDTHS[font]
+    total = 0
+    for char in text:
+        code = ord(unicodedata.normalize("NFD", char)[0])
+        total += (
+            widths[code - 32] if 32 <= code < 127 else 556
+        )
+    return total * size / 1000
+
+
+def wrap_text(
+    text: str, font: str, size: float, width: float
+) -> list[str]:
+    lines: list[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if text_width(candidate, font, size) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            while text_width(word, font, size) > width:
+                cut = len(word) - 1
+                while cut > 1 and (
+                    text_width(word[:cut], font, size)
+                    > width
+                ):
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+def _pdf_string(text: str) -> bytes:
+    return (
+        b"("
+        + text.encode("cp1252", "replace")
+        .replace(b"\\", b"\\\\")
+        .replace(b"(", b"\\(")
+        .replace(b")", b"\\)")
+        + b")"
+    )
+
+
+@functools.cache
+def read_png(path: str) -> tuple[int, int, int, bytes]:
+    with open(path, "rb") as png:
+        data = png.read()
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError(f"PNG no válido: {path}")
+    position = len(PNG_SIGNATURE)
+    header = b""
+    chunks = []
+    while position < len(data):
+        (length,) = struct.unpack(
+            ">I", data[position : position + 4]
+        )
+        kind = data[position + 4 : position + 8]
+        body = data[position + 8 : position + 8 + length]
+        if kind == b"IHDR":
+            header = body
+        elif kind == b"IDAT":
+            chunks.append(body)
+        position += 12 + length
+    (
+        width,
+        height,
+        bit_depth,
+        color_type,
+        _,
+        _,
+        interlace,
+    ) = struct.unpack(">IIBBBBB", header)
+    if (
+        bit_depth != 8
+        or interlace
+        or color_type not in PNG_COLORS
+    ):
+        raise ValueError(f"PNG no soportado: {path}")
+    return (
+        width,
+        height,
+        PNG_COLORS[color_type],
+        b"".join(chunks),
+    )
+
+
+class PdfDocument:
+    def __init__(self):
+        self._pages: list[list[bytes]] = []
+        self._images: list[tuple[int, int, int, bytes]] = []
+        self.y = 0.0
+        self.add_page()
+
+    def add_page(self):
+        self._pages.append([])
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure(self, height: float):
+        if self.y - height < MARGIN:
+            self.add_page()
+
+    def _draw(self, operations: bytes):
+        self._pages[-1].append(operations)
+
+    def text(
+        self,
+        x: float,
+        y: float,
+        text: str,
+        font: str = "F1",
+        size: float = 9.0,
+        gray: float = 0.0,
+    ):
+        self._draw(
+            b"BT %.3f g /%s %.1f Tf %.2f %.2f Td %s Tj ET\n"
+            % (
+                gray,
+                font.encode(),
+                size,
+                x,
+                y,
+                _pdf_string(text),
+            )
+        )
+
+    def line(
+        self,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        gray: float = 0.6,
+        width: float = 0.5,
+    ):
+        self._draw(
+            b"%.3f G %.2f w %.2f %.2f m %.2f %.2f l S\n"
+            % (gray, width, x1, y1, x2, y2)
+        )
+
+    def rect(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        fill: Optional[float] = None,
+        stroke: Optional[float] = None,
+    ):
+        operations = b""
+        if fill is not None:
+            operations += b"%.3f g " % fill
+        if stroke is not None:
+            operations += b"%.3f G 0.5 w " % stroke
+        operator = (
+            b"B"
+            if fill is not None and stroke is not None
+            else b"f" if fill is not None else b"S"
+        )
+        self._draw(
+            operations
+            + b"%.2f %.2f %.2f %.2f re %s\n"
+            % (x, y, width, height, operator)
+        )
+
+    def strokes(
+        self,
+        strokes: tuple[tuple[Point, ...], ...],
+        x: float,
+        y: float,
+        scale: float,
+        width: float = 1.2,
+    ):
+        operations = [b"0 G %.2f w 1 J 1 j" % width]
+        for stroke in strokes:
+            if not stroke:
+                continue
+            operations.extend(
+                b"%.2f %.2f %s"
+                % (
+                    x + point_x * scale,
+                    y - point_y * scale,
+                    b"l" if index else b"m",
+                )
+                for index, (point_x, point_y) in enumerate(
+                    stroke
+                    if len(stroke) > 1
+                    else stroke * 2
+                )
+            )
+            operations.append(b"S")
+        self._draw(b" ".join(operations) + b"\n")
+
+    def image(
+        self,
+        png: tuple[int, int, int, bytes],
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+    ):
+        if png not in self._images:
+            self._images.append(png)
+        self._draw(
+            b"q %.2f 0 0 %.2f %.2f %.2f cm /Im%d Do Q\n"
+            % (
+                width,
+                height,
+                x,
+                y,
+                self._images.index(png) + 1,
+            )
+        )
+
+    def to_bytes(self) -> bytes:
+        first_image = 3 + len(FONTS)
+        first_page = first_image + len(self._images)
+        page_ids = [
+            first_page + 2 * index
+            for index in range(len(self._pages))
+        ]
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [%s] /Count %d >>"
+            % (
+                b" ".join(
+                    b"%d 0 R" % page_id
+                    for page_id in page_ids
+                ),
+                len(page_ids),
+            ),
+            *(
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+                % base_font.encode()
+                for base_font in FONTS.values()
+            ),
+            *(
+                b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /%s /BitsPerComponent 8 /Filter /FlateDecode /DecodeParms << /Predictor 15 /Colors %d /BitsPerComponent 8 /Columns %d >> /Length %d >>\nstream\n%s\nendstream"
+                % (
+                    width,
+                    height,
+                    (
+                        b"DeviceRGB"
+                        if colors == 3
+                        else b"DeviceGray"
+                    ),
+                    colors,
+                    width,
+                    len(data),
+                    data,
+                )
+                for width, height, colors, data in self._images
+            ),
+        ]
+        resources = (
+            b"<< /Font << %s >> /XObject << %s >> >>"
+            % (
+                b" ".join(
+                    b"/%s %d 0 R"
+                    % (name.encode(), 3 + index)
+                    for index, name in enumerate(FONTS)
+                ),
+                b" ".join(
+                    b"/Im%d %d 0 R"
+                    % (index + 1, first_image + index)
+                    for index in range(len(self._images))
+                ),
+            )
+        )
+        for index, operations in enumerate(self._pages):
+            footer = (
+                f"Página {index + 1} de {len(self._pages)}"
+            )
+            content = zlib.compress(
+                b"".join(operations)
+                + b"BT 0.400 g /F1 8.0 Tf %.2f %.2f Td %s Tj ET\n"
+                % (
+                    PAGE_WIDTH
+                    - MARGIN
+                    - text_width(footer, "F1", 8),
+                    MARGIN / 2,
+                    _pdf_string(footer),
+                )
+            )
+            objects.append(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+                % (
+                    PAGE_WIDTH,
+                    PAGE_HEIGHT,
+                    resources,
+                    page_ids[index] + 1,
+                )
+            )
+            objects.append(
+                b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+                % (len(content), content)
+            )
+        output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(output))
+            output += b"%d 0 obj\n%s\nendobj\n" % (
+                number,
+                body,
+            )
+        xref = len(output)
+        output += b"xref\n0 %d\n0000000000 65535 f \n" % (
+            len(objects) + 1
+        )
+        for offset in offsets:
+            output += b"%010d 00000 n \n" % offset
+        output += (
+            b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(objects) + 1, xref)
+        )
+        return bytes(output)
+
+
+def _section_title(document: PdfDocument, title: str):
+    document.ensure(40)
+    document.y -= 22
+    document.rect(
+        MARGIN, document.y - 4, CONTENT_WIDTH, 18, fill=0.92
+    )
+    document.text(
+        MARGIN + 6, document.y + 1, title, "F2", 11
+    )
+    document.y -= 12
+
+
+def _paragraph(
+    document: PdfDocument,
+    text: str,
+    x: float = MARGIN,
+    width: float = CONTENT_WIDTH,
+    font: str = "F1",
+    size: float = 9.0,
+):
+    for line in wrap_text(text, font, size, width):
+        document.ensure(size + 3)
+        document.y -= size + 3
+        document.text(x, document.y, line, font, size)
+
+
+def _fields(
+    document: PdfDocument, fields: list[tuple[str, Any]]
+):
+    column_width = (CONTENT_WIDTH - COLUMN_GAP) / 2
+    for row in range(0, len(fields), 2):
+        cells = [
+            (
+                label,
+                wrap_text(
+                    format_value(value),
+                    "F1",
+                    9,
+                    column_width,
+                ),
+            )
+            for label, value in fields[row : row + 2]
+        ]
+        height = 22 + 12 * max(
+            len(lines) - 1 for _, lines in cells
+        )
+        document.ensure(height)
+        top = document.y
+        for column, (label, lines) in enumerate(cells):
+            x = MARGIN + column * (
+                column_width + COLUMN_GAP
+            )
+            document.text(
+                x, top - 9, label, "F2", 7.5, gray=0.4
+            )
+            for index, line in enumerate(lines):
+                document.text(
+                    x, top - 20 - 12 * index, line
+                )
+        document.y = top - height - 4
+
+
+def _odontogram_table(document: PdfDocument, code: str):
+    teeth = decode_teeth(code)
+    if not teeth:
+        _paragraph(document, "Sin hallazgos registrados.")
+        return
+    tooth_width = 60.0
+    state_width = CONTENT_WIDTH - tooth_width
+    document.ensure(36)
+    document.y -= 18
+    document.rect(
+        MARGIN,
+        document.y,
+        CONTENT_WIDTH,
+        18,
+        fill=0.96,
+        stroke=0.6,
+    )
+    document.text(
+        MARGIN + 6, document.y + 6, "Diente", "F2", 9
+    )
+    document.text(
+        MARGIN + tooth_width + 6,
+        document.y + 6,
+        "Estado",
+        "F2",
+        9,
+    )
+    for tooth, tooth_state in sorted(teeth.items()):
+        findings = (
+            ["Ausente"]
+            if tooth_state.get("missing")
+            else []
+        )
+        findings.extend(
+            f"{surface.capitalize()}: {finding}"
+            for surface, finding in tooth_state.get(
+                "surfaces", {}
+            ).items()
+        )
+        lines = wrap_text(
+            ", ".join(findings) or "Sano",
+            "F1",
+            9,
+            state_width - 12,
+        )
+        height = 6 + 12 * len(lines)
+        document.ensure(height)
+        document.y -= height
+        document.rect(
+            MARGIN,
+            document.y,
+            tooth_width,
+            height,
+            stroke=0.6,
+        )
+        document.rect(
+            MARGIN + tooth_width,
+            document.y,
+            state_width,
+            height,
+            stroke=0.6,
+        )
+        document.text(
+            MARGIN + 6, document.y + height - 12, tooth
+        )
+        for index, line in enumerate(lines):
+            document.text(
+                MARGIN + tooth_width + 6,
+                document.y + height - 12 - 12 * index,
+                line,
+            )
+
+
+def _notes(document: PdfDocument, notes: list[dict]):
+    if not notes:
+        _paragraph(document, "Sin notas de evolución.")
+        return
+    for note in notes:
+        document.ensure(40)
+        document.y -= 6
+        _paragraph(
+            document,
+            f"Fecha: {format_value(note.get('fecha_hora'))}",
+            font="F2",
+        )
+        _paragraph(
+            document,
+            "Procedimiento: "
+            + format_value(
+                note.get("procedimiento_signos_vitales")
+            ),
+        )
+        _paragraph(
+            document,
+            "Observaciones: "
+            + format_value(note.get("observaciones")),
+        )
+        document.y -= 4
+        document.line(
+            MARGIN,
+            document.y,
+            PAGE_WIDTH - MARGIN,
+            document.y,
+            gray=0.85,
+        )
+
+
+def _signature(document: PdfDocument, code: Any):
+    if not is_stroke_code(code):
+        return
+    try:
+        width, height, strokes = simplified_strokes(code)
+    except ValueError:
+        return
+    scale = SIGNATURE_BOX_WIDTH / width
+    box_height = height * scale
+    document.ensure(box_height + 18)
+    document.text(
+        MARGIN,
+        document.y - 9,
+        "Firma del Paciente",
+        "F2",
+        7.5,
+        gray=0.4,
+    )
+    top = document.y - 14
+    document.rect(
+        MARGIN,
+        top - box_height,
+        SIGNATURE_BOX_WIDTH,
+        box_height,
+        stroke=0.8,
+    )
+    document.strokes(strokes, MARGIN, top, scale)
+    document.y = top - box_height - 4
+
+
+def render_history_pdf(patient: Patient) -> bytes:
+    history: Any = patient["historia_clinica"]
+    document = PdfDocument()
+    logo_size = 54.0
+    document.image(
+        read_png(LOGO_PATH),
+        MARGIN,
+        document.y - logo_size,
+        logo_size,
+        logo_size,
+    )
+    document.text(
+        MARGIN + logo_size + 14,
+        document.y - 24,
+        "Historia Clínica Odontológica",
+        "F2",
+        18,
+    )
+    document.text(
+        MARGIN + logo_size + 14,
+        document.y - 42,
+        f"{patient['nombre']} · {patient['status']} · "
+        f"Registro {patient['fecha_registro']}",
+        size=10,
+        gray=0.3,
+    )
+    document.y -= logo_size + 8
+    document.line(
+        MARGIN,
+        document.y,
+        PAGE_WIDTH - MARGIN,
+        document.y,
+        gray=0.0,
+        width=1.5,
+    )
+    datos_generales = history.get("datos_generales", {})
+    _section_title(document, "Datos Generales")
+    _fields(
+        document,
+        [
+            (label, datos_generales.get(field))
+            for label, field in DATOS_GENERALES_FIELDS
+        ],
+    )
+    for section in FIELD_SECTIONS:
+        _section_title(document, SECTION_TITLES[section])
+        _fields(
+            document,
+            [
+                (field_label([field]), value)
+                for field, value in history.get(
+                    section, {}
+                ).items()
+            ],
+        )
+    odontograma = history.get("odontograma", {})
+    _section_title(document, "Odontograma")
+    _odontogram_table(
+        document, odontograma.get("codigo", "")
+    )
+    if odontograma.get("general_notes"):
+        document.y -= 6
+        _paragraph(
+            document,
+            f"Notas: {odontograma['general_notes']}",
+        )
+    _section_title(document, "Notas de Evolución")
+    _notes(document, history.get("seguimiento", []))
+    _section_title(document, "Firmas y Consentimiento")
+    _fields(
+        document,
+        [
+            (
+                "Consentimiento Paciente",
+                (
+                    "Aceptado"
+                    if history.get(
+                        "firma_consentimiento", {}
+                    ).get("aceptado")
+                    else "No Aceptado"
+                ),
+            ),
+            (
+                "Firma Profesor",
+                (
+                    f"Firmado el {patient.get('fecha_firma_profesor')}"
+                    if patient.get("firma_profesor_url")
+                    else "Sin firma"
+                ),
+            ),
+        ],
+    )
+    _signature(
+        document,
+        history.get("firma_consentimiento", {}).get(
+            "firma_trazos"
+        ),
+    )
+    return document.to_bytes()
+
+
+class HistoryPdfRenderer:
+    def __init__(
+        self,
+        workers: int = PDF_WORKERS,
+        capacity: int = PDF_CACHE_SIZE,
+    ):
+        self._workers = workers
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._renders: OrderedDict[
+            tuple[str, int], Future
+        ] = OrderedDict()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context(
+                    "spawn"
+                ),
+            )
+        return self._executor
+
+    def submit(
+        self, patient: Patient, version: int
+    ) -> Future:
+        key = (patient["id"], version)
+        with self._lock:
+            future = self._renders.get(key)
+            if future is None or (
+                future.done()
+                and future.exception() is not None
+            ):
+                for stale in [
+                    cached
+                    for cached in self._renders
+                    if cached[0] == key[0]
+                ]:
+                    del self._renders[stale]
+                future = self._pool().submit(
+                    render_history_pdf,
+                    copy.deepcopy(patient),
+                )
+                self._renders[key] = future
+            self._renders.move_to_end(key)
+            while len(self._renders) > self._capacity:
+                self._renders.popitem(last=False)
+            return future
+
+    async def render(
+        self, patient: Patient, version: int
+    ) -> bytes:
+        return await asyncio.wrap_future(
+            self.submit(patient, version)
+        )
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+@functools.cache
+def get_pdf_renderer() -> HistoryPdfRenderer:
+    return HistoryPdfRenderer()
\ No newline at end of file
@@ -0,0 +1,282 @@
+import functools
+import heapq
+import math
+import operator
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Iterator
+
+EXCLUDED_SECTIONS = {"odontograma", "firma_consentimiento"}
+
+STOPWORDS = {
+    "a",
+    "al",
+    "como",
+    "con",
+    "de",
+    "del",
+    "el",
+    "en",
+    "es",
+    "la",
+    "las",
+    "lo",
+    "los",
+    "no",
+    "o",
+    "para",
+    "por",
+    "que",
+    "se",
+    "sin",
+    "su",
+    "sus",
+    "un",
+    "una",
+    "y",
+}
+
+DERIVATIONAL_SUFFIXES = sorted(
+    (
+        "amientos",
+        "imientos",
+        "aciones",
+        "uciones",
+        "amiento",
+        "imiento",
+        "idades",
+        "adoras",
+        "adores",
+        "ancias",
+        "encias",
+        "mente",
+        "acion",
+        "ucion",
+        "adora",
+        "ador",
+        "ancia",
+        "encia",
+        "idad",
+        "ismos",
+        "istas",
+        "ismo",
+        "ista",
+        "ables",
+        "ibles",
+        "able",
+        "ible",
+        "icos",
+        "icas",
+        "osos",
+        "osas",
+        "ivos",
+        "ivas",
+        "ico",
+        "ica",
+        "oso",
+        "osa",
+        "ivo",
+        "iva",
+        "ias",
+        "ios",
+        "ia",
+        "io",
+    ),
+    key=len,
+    reverse=True,
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def fold_accents(text: str) -> str:
+    return (
+        unicodedata.normalize("NFKD", text.lower())
+        .encode("ascii", "ignore")
+        .decode("ascii")
+    )
+
+
+@functools.lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    for suffix in DERIVATIONAL_SUFFIXES:
+        if word.endswith(suffix) and (
+            len(word) - len(suffix) >= 3
+        ):
+            return word[: -len(suffix)]
+    for suffix in ("es", "s"):
+        if word.endswith(suffix) and (
+            len(word) - len(suffix) >= 3
+        ):
+            word = word[: -len(suffix)]
+            break
+    if word[-1] in "aeo" and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        stem(word)
+        for word in TOKEN_PATTERN.findall(
+            fold_accents(text)
+        )
+        if word not in STOPWORDS
+    ]
+
+
+def text_fields(
+    value: Any, prefix: tuple[str, ...] = ()
+) -> Iterator[tuple[tuple[str, ...], str]]:
+    if isinstance(value, dict):
+        for key, child in value.items():
+            if not prefix and key in EXCLUDED_SECTIONS:
+                continue
+            yield from text_fields(child, (*prefix, key))
+    elif isinstance(value, list):
+        for position, child in enumerate(value):
+            yield from text_fields(
+                child, (*prefix, str(position))
+            )
+    elif isinstance(value, str) and value:
+        yield prefix, value
+
+
+class HistorySearchIndex:
+    def __init__(self):
+        self._postings: dict[str, dict[str, int]] = {}
+        self._field_terms: dict[
+            str, dict[tuple[str, ...], Counter]
+        ] = {}
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+
+    def __contains__(self, patient_id: str) -> bool:
+        return patient_id in self._field_terms
+
+    def __len__(self) -> int:
+        return len(self._field_terms)
+
+    def _add_terms(self, patient_id: str, terms: Counter):
+        for term, frequency in terms.items():
+            postings = self._postings.setdefault(term, {})
+            postings[patient_id] = (
+                postings.get(patient_id, 0) + frequency
+            )
+        length = sum(terms.values())
+        self._lengths[patient_id] = (
+            self._lengths.get(patient_id, 0) + length
+        )
+        self._total_length += length
+
+    def _remove_terms(
+        self, patient_id: str, terms: Counter
+    ):
+        for term, frequency in terms.items():
+            postings = self._postings[term]
+            remaining = postings[patient_id] - frequency
+            if remaining > 0:
+                postings[patient_id] = remaining
+            else:
+                del postings[patient_id]
+                if not postings:
+                    del self._postings[term]
+        length = sum(terms.values())
+        self._lengths[patient_id] -= length
+        self._total_length -= length
+
+    def update(
+        self,
+        patient_id: str,
+        field_path: list[str],
+        value: Any,
+    ):
+        if (
+            field_path
+            and field_path[0] in EXCLUDED_SECTIONS
+        ):
+            return
+        prefix = tuple(field_path)
+        fields = self._field_terms.setdefault(
+            patient_id, {}
+        )
+        for key in [
+            key
+            for key in fields
+            if key[: len(prefix)] == prefix
+        ]:
+            self._remove_terms(patient_id, fields.pop(key))
+        for key, text in text_fields(value, prefix):
+            terms = Counter(tokenize(text))
+            if terms:
+                fields[key] = terms
+                self._add_terms(patient_id, terms)
+
+    def add(self, patient_id: str, history: dict):
+        self.remove(patient_id)
+        self.update(patient_id, [], history)
+
+    def remove(self, patient_id: str):
+        for terms in self._field_terms.pop(
+            patient_id, {}
+        ).values():
+            self._remove_terms(patient_id, terms)
+        self._lengths.pop(patient_id, None)
+
+    def search(
+        self, query: str, offset: int = 0, limit: int = 10
+    ) -> tuple[list[str], int]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._field_terms:
+            return [], 0
+        postings = [
+            self._postings.get(term, {}) for term in terms
+        ]
+        postings.sort(key=len)
+        if not postings[0]:
+            return [], 0
+        candidates = postings[0].keys()
+        for posting in postings[1:]:
+            candidates = candidates & posting.keys()
+        if not candidates:
+            return [], 0
+        document_count = len(self._field_terms)
+        average_length = (
+            self._total_length / document_count or 1
+        )
+        base_normalization = BM25_K1 * (1 - BM25_B)
+        length_normalization = (
+            BM25_K1 * BM25_B / average_length
+        )
+        lengths = self._lengths
+        scores = dict.fromkeys(candidates, 0.0)
+        for posting in postings:
+            weight = (BM25_K1 + 1) * math.log(
+                1
+                + (document_count - len(posting) + 0.5)
+                / (len(posting) + 0.5)
+            )
+            for patient_id in scores:
+                frequency = posting[patient_id]
+                scores[patient_id] += (
+                    weight
+                    * frequency
+                    / (
+                        frequency
+                        + base_normalization
+                        + length_normalization
+                        * lengths[patient_id]
+                    )
+                )
+        ranked = heapq.nlargest(
+            offset + limit,
+            scores.items(),
+            key=operator.itemgetter(1, 0),
+        )
+        return [
+            patient_id for patient_id, _ in ranked[offset:]
+        ], len(scores)
\ No newline at end of file
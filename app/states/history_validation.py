@@ -0,0 +1,374 @@
+import datetime
+import re
+from typing import Any, Callable
+from app.states.models import ClinicalHistory
+from app.states.odontogram_codec import TOOTH_INDEX
+
+SECTIONS = tuple(ClinicalHistory.__annotations__)
+SECTION_BITS = {
+    section: 1 << index
+    for index, section in enumerate(SECTIONS)
+}
+SECTION_TITLES = {
+    "datos_generales": "Datos Generales",
+    "datos_administrativos": "Datos Administrativos",
+    "antecedentes_heredo_familiares": "Antecedentes Heredo-Familiares",
+    "antecedentes_personales_patologicos": "Antecedentes Personales Patológicos",
+    "antecedentes_personales_no_patologicos": "Antecedentes Personales No Patológicos",
+    "padecimiento_actual": "Padecimiento Actual",
+    "exploracion_clinica_general": "Exploración Clínica General",
+    "exploracion_fisica_extraoral": "Exploración Física Extraoral",
+    "articulacion_temporomandibular": "Articulación Temporomandibular",
+    "exploracion_tejidos_blandos": "Exploración de Tejidos Blandos",
+    "odontograma": "Odontograma",
+    "diagnostico": "Diagnóstico",
+    "plan_tratamiento": "Plan de Tratamiento",
+    "seguimiento": "Hoja de Nota de Evolución",
+    "firma_consentimiento": "Consentimiento Informado",
+    "antecedentes_dentales": "Antecedentes Dentales",
+    "resumen_historia_medica": "Resumen de la Historia Médica",
+    "ruta_clinica": "Ruta Clínica",
+}
+BLOOD_PRESSURE = re.compile(r"^(\d{2,3})\s*/\s*(\d{2,3})$")
+TEXT_MAX_LENGTH = 4000
+
+
+def _text(value: Any) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def required(value: Any) -> bool:
+    return bool(_text(value))
+
+
+def number_between(
+    low: float, high: float
+) -> Callable[[Any], bool]:
+    def check(value: Any) -> bool:
+        text = _text(value).replace(",", ".")
+        if not text:
+            return True
+        try:
+            return low <= float(text) <= high
+        except ValueError:
+            return False
+
+    return check
+
+
+def iso_date(
+    allow_future: bool = True,
+) -> Callable[[Any], bool]:
+    def check(value: Any) -> bool:
+        text = _text(value)
+        if not text:
+            return True
+        try:
+            date = datetime.date.fromisoformat(text)
+        except ValueError:
+            return False
+        return allow_future or date <= datetime.date.today()
+
+    return check
+
+
+def boolean(value: Any) -> bool:
+    return value is None or isinstance(value, bool)
+
+
+def short_text(value: Any) -> bool:
+    return value is None or (
+        isinstance(value, str)
+        and len(value) <= TEXT_MAX_LENGTH
+    )
+
+
+def tooth_list(value: Any) -> bool:
+    return all(
+        tooth.strip() in TOOTH_INDEX
+        for tooth in _text(value).split(",")
+        if tooth.strip()
+    )
+
+
+def evolution_notes(value: Any) -> bool:
+    return value is None or (
+        isinstance(value, list)
+        and all(
+            isinstance(note, dict)
+            and required(note.get("fecha_hora"))
+            for note in value
+        )
+    )
+
+
+def blood_pressure(value: Any) -> bool:
+    text = _text(value)
+    if not text:
+        return True
+    match = BLOOD_PRESSURE.match(text)
+    return bool(match) and (
+        int(match.group(1)) > int(match.group(2))
+    )
+
+
+FIELD_RULES: dict[
+    tuple[str, ...], tuple[Callable[[Any], bool], ...]
+] = {
+    ("datos_generales", "nombre_completo"): (required,),
+    ("datos_generales", "edad"): (
+        required,
+        number_between(0, 130),
+    ),
+    ("datos_generales", "fecha_nacimiento"): (
+        iso_date(allow_future=False),
+    ),
+    ("datos_generales", "fecha_ingreso"): (iso_date(),),
+    **{
+        ("datos_administrativos", field): (short_text,)
+        for field in (
+            "matricula_estudiante",
+            "nombre_estudiante",
+            "profesor_responsable",
+        )
+    },
+    **{
+        ("antecedentes_heredo_familiares", field): (
+            boolean,
+        )
+        for field in (
+            "diabetes",
+            "hipertension",
+            "cancer",
+            "tuberculosis",
+            "enfermedades_mentales",
+        )
+    },
+    ("antecedentes_heredo_familiares", "otros"): (
+        short_text,
+    ),
+    **{
+        ("antecedentes_personales_patologicos", field): (
+            short_text,
+        )
+        for field in (
+            "hospitalizaciones",
+            "cirugias",
+            "alergias",
+            "medicamentos_actuales",
+            "enfermedades_actuales",
+            "vacunas_recientes",
+        )
+    },
+    **{
+        ("antecedentes_personales_no_patologicos", field): (
+            short_text,
+        )
+        for field in (
+            "higiene_bucal",
+            "frecuencia_cepillado",
+            "uso_hilo_enjuague",
+            "consumo_tabaco",
+            "consumo_alcohol",
+            "consumo_drogas",
+            "dieta",
+        )
+    },
+    ("padecimiento_actual", "motivo_consulta"): (required,),
+    (
+        "exploracion_clinica_general",
+        "frecuencia_cardiaca",
+    ): (number_between(20, 250),),
+    ("exploracion_clinica_general", "presion_arterial"): (
+        blood_pressure,
+    ),
+    ("exploracion_clinica_general", "temperatura"): (
+        number_between(30, 45),
+    ),
+    ("exploracion_clinica_general", "saturacion"): (
+        number_between(50, 100),
+    ),
+    ("exploracion_clinica_general", "peso"): (
+        number_between(0.5, 400),
+    ),
+    ("exploracion_clinica_general", "talla"): (
+        number_between(30, 250),
+    ),
+    **{
+        ("exploracion_fisica_extraoral", field): (
+            short_text,
+        )
+        for field in (
+            "cabeza",
+            "cuello",
+            "ganglios_linfaticos",
+        )
+    },
+    **{
+        ("articulacion_temporomandibular", field): (
+            boolean,
+        )
+        for field in (
+            "dolor",
+            "ruido",
+            "dificultad_abrir_cerrar",
+            "cansancio_muscular",
+        )
+    },
+    (
+        "articulacion_temporomandibular",
+        "limitacion_apertura",
+    ): (number_between(0, 80),),
+    (
+        "exploracion_tejidos_blandos",
+        "resumen_diagnostico_presuncion_bucal",
+    ): (short_text,),
+    ("odontograma", "general_notes"): (short_text,),
+    **{
+        ("diagnostico", field): (short_text,)
+        for field in (
+            "clinico",
+            "cie_10",
+            "diferencial",
+            "pronostico",
+        )
+    },
+    **{
+        ("plan_tratamiento", field): (short_text,)
+        for field in (
+            "fases",
+            "procedimientos",
+            "frecuencia_citas",
+            "materiales",
+        )
+    },
+    ("seguimiento",): (evolution_notes,),
+    ("firma_consentimiento", "aceptado"): (boolean,),
+    ("antecedentes_dentales", "primera_vez_consulta"): (
+        short_text,
+    ),
+    **{
+        ("antecedentes_dentales", field): (boolean,)
+        for field in (
+            "golpeado_dientes",
+            "rechina_dientes",
+            "dolor_chasquido_atm",
+            "protesis_dental",
+        )
+    },
+    ("resumen_historia_medica",): (short_text,),
+    **{
+        ("ruta_clinica", field): (tooth_list,)
+        for field in (
+            "periodontal",
+            "endodental",
+            "resinas_incrustaciones",
+            "cirugia_extracciones",
+            "rehabilitacion_estetico",
+        )
+    },
+}
+SECTION_FIELDS: dict[str, list[tuple[str, ...]]] = {}
+for _field in FIELD_RULES:
+    SECTION_FIELDS.setdefault(_field[0], []).append(_field)
+
+
+def field_valid(field: tuple[str, ...], value: Any) -> bool:
+    return all(rule(value) for rule in FIELD_RULES[field])
+
+
+def _value_at(value: Any, path: tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def invalid_sections(bitmap: int) -> list[str]:
+    return [
+        section
+        for section in SECTIONS
+        if bitmap & SECTION_BITS[section]
+    ]
+
+
+class HistoryValidationIndex:
+    def __init__(self):
+        self._invalid_fields: dict[
+            str, set[tuple[str, ...]]
+        ] = {}
+        self._bitmaps: dict[str, int] = {}
+
+    def __contains__(self, patient_id: str) -> bool:
+        return patient_id in self._bitmaps
+
+    def _set_field(
+        self,
+        patient_id: str,
+        field: tuple[str, ...],
+        valid: bool,
+    ):
+        invalid_fields = self._invalid_fields[patient_id]
+        if valid:
+            invalid_fields.discard(field)
+        else:
+            invalid_fields.add(field)
+        section = field[0]
+        if any(
+            section_field in invalid_fields
+            for section_field in SECTION_FIELDS[section]
+        ):
+            self._bitmaps[patient_id] |= SECTION_BITS[
+                section
+            ]
+        else:
+            self._bitmaps[patient_id] &= ~SECTION_BITS[
+                section
+            ]
+
+    def add(
+        self, patient_id: str, history: ClinicalHistory
+    ):
+        self._invalid_fields[patient_id] = set()
+        self._bitmaps[patient_id] = 0
+        for field in FIELD_RULES:
+            self._set_field(
+                patient_id,
+                field,
+                field_valid(
+                    field, _value_at(history, field)
+                ),
+            )
+
+    def update(
+        self,
+        patient_id: str,
+        field_path: list[str],
+        value: Any,
+        history: ClinicalHistory,
+    ):
+        if patient_id not in self._bitmaps:
+            return
+        path = tuple(field_path)
+        for field in SECTION_FIELDS.get(path[0], ()):
+            if field[: len(path)] == path:
+                current = _value_at(
+                    value, field[len(path) :]
+                )
+            elif path[: len(field)] == field:
+                current = _value_at(history, field)
+            else:
+                continue
+            self._set_field(
+                patient_id,
+                field,
+                field_valid(field, current),
+            )
+
+    def remove(self, patient_id: str):
+        self._invalid_fields.pop(patient_id, None)
+        self._bitmaps.pop(patient_id, None)
+
+    def bitmap(self, patient_id: str) -> int:
+        return self._bitmaps.get(patient_id, 0)
\ No newline at end of file
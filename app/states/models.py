@@ -0,0 +1,397 @@
+import datetime
+from typing import Any, TypedDict, Literal, Optional, Union
+from app.states.odontogram_codec import (
+    EMPTY_CODE,
+    encode_teeth,
+)
+
+Status = Literal[
+    "Borrador", "Pendiente", "Aprobado", "Rechazado"
+]
+FieldValue = Union[str, int, bool, dict, list]
+
+ODONTOGRAM_DIAGNOSTICS = [
+    "Ninguno",
+    "Caries",
+    "Sellante",
+    "Restauración",
+]
+OPCIONES_SEXO = [
+    "Masculino",
+    "Femenino",
+    "No especificado",
+]
+OPCIONES_ESTADO_CIVIL = [
+    "Soltero(a)",
+    "Casado(a)",
+    "Divorciado(a)",
+    "Viudo(a)",
+    "Unión Libre",
+]
+OPCIONES_ESCOLARIDAD = [
+    "Sin estudios",
+    "Primaria",
+    "Secundaria",
+    "Bachillerato",
+    "Licenciatura",
+    "Posgrado",
+]
+
+
+class ToothSurfaces(TypedDict, total=False):
+    vestibular: str
+    lingual: str
+    distal: str
+    mesial: str
+    oclusal: str
+
+
+class ToothState(TypedDict, total=False):
+    surfaces: ToothSurfaces
+    missing: bool
+
+
+class Odontograma(TypedDict, total=False):
+    codigo: str
+    teeth: dict[str, ToothState]
+    general_notes: str
+
+
+class AntecedentesDentales(TypedDict, total=False):
+    primera_vez_consulta: str
+    motivo_ultima_consulta: str
+    experiencia_negativa: str
+    golpeado_dientes: bool
+    rechina_dientes: bool
+    dolor_chasquido_atm: bool
+    protesis_dental: bool
+    tipo_protesis: str
+
+
+class ExploracionFisicaExtraoral(TypedDict, total=False):
+    cabeza: str
+    cuello: str
+    ganglios_linfaticos: str
+
+
+class ArticulacionTemporomandibular(TypedDict, total=False):
+    dolor: bool
+    ruido: bool
+    dificultad_abrir_cerrar: bool
+    cansancio_muscular: bool
+    limitacion_apertura: str
+
+
+class ExploracionTejidosBlandos(TypedDict, total=False):
+    labios: str
+    carrillos: str
+    encia: str
+    vestibulo: str
+    paladar: str
+    orofaringe: str
+    region_retromolar: str
+    piso_boca: str
+    frenillos: str
+    lengua: str
+    glandulas_salivales: str
+    resumen_diagnostico_presuncion_bucal: str
+
+
+class FirmaConsentimiento(TypedDict, total=False):
+    aceptado: bool
+    firma_data_url: str
+    firma_trazos: str
+
+
+class DatosGenerales(TypedDict, total=False):
+    nombre_completo: str
+    edad: str
+    sexo: str
+    fecha_nacimiento: str
+    estado_civil: str
+    escolaridad: str
+    ocupacion: str
+    direccion: str
+    telefono: str
+    correo: str
+    fecha_ingreso: str
+    responsable_paciente: str
+
+
+class DatosAdministrativos(TypedDict, total=False):
+    matricula_estudiante: str
+    nombre_estudiante: str
+    profesor_responsable: str
+
+
+class AntecedentesHeredoFamiliares(TypedDict, total=False):
+    diabetes: bool
+    hipertension: bool
+    cancer: bool
+    tuberculosis: bool
+    enfermedades_mentales: bool
+    otros: str
+
+
+class AntecedentesPersonalesPatologicos(
+    TypedDict, total=False
+):
+    hospitalizaciones: str
+    cirugias: str
+    alergias: str
+    medicamentos_actuales: str
+    enfermedades_actuales: str
+    vacunas_recientes: str
+
+
+class AntecedentesPersonalesNoPatologicos(
+    TypedDict, total=False
+):
+    higiene_bucal: str
+    frecuencia_cepillado: str
+    uso_hilo_enjuague: str
+    consumo_tabaco: str
+    consumo_alcohol: str
+    consumo_drogas: str
+    dieta: str
+
+
+class PadecimientoActual(TypedDict, total=False):
+    motivo_consulta: str
+    descripcion_problema: str
+    evolucion: str
+    factores_asociados: str
+
+
+class ExploracionClinicaGeneral(TypedDict, total=False):
+    frecuencia_cardiaca: str
+    presion_arterial: str
+    temperatura: str
+    saturacion: str
+    peso: str
+    talla: str
+    estado_general: str
+
+
+class Diagnostico(TypedDict, total=False):
+    clinico: str
+    cie_10: str
+    diferencial: str
+    pronostico: str
+
+
+class PlanTratamiento(TypedDict, total=False):
+    fases: str
+    procedimientos: str
+    frecuencia_citas: str
+    materiales: str
+
+
+class NotaEvolucion(TypedDict, total=False):
+    fecha_hora: str
+    procedimiento_signos_vitales: str
+    observaciones: str
+
+
+class RutaClinica(TypedDict, total=False):
+    periodontal: str
+    endodental: str
+    resinas_incrustaciones: str
+    cirugia_extracciones: str
+    rehabilitacion_estetico: str
+    radiografia_panoramica: str
+    observaciones: str
+
+
+class ClinicalHistory(TypedDict, total=False):
+    datos_generales: DatosGenerales
+    datos_administrativos: DatosAdministrativos
+    antecedentes_heredo_familiares: (
+        AntecedentesHeredoFamiliares
+    )
+    antecedentes_personales_patologicos: (
+        AntecedentesPersonalesPatologicos
+    )
+    antecedentes_personales_no_patologicos: (
+        AntecedentesPersonalesNoPatologicos
+    )
+    padecimiento_actual: PadecimientoActual
+    exploracion_clinica_general: ExploracionClinicaGeneral
+    exploracion_fisica_extraoral: ExploracionFisicaExtraoral
+    articulacion_temporomandibular: (
+        ArticulacionTemporomandibular
+    )
+    exploracion_tejidos_blandos: ExploracionTejidosBlandos
+    odontograma: Odontograma
+    diagnostico: Diagnostico
+    plan_tratamiento: PlanTratamiento
+    seguimiento: list[NotaEvolucion]
+    firma_consentimiento: FirmaConsentimiento
+    antecedentes_dentales: AntecedentesDentales
+    resumen_historia_medica: str
+    ruta_clinica: RutaClinica
+
+
+class PatientSummary(TypedDict):
+    id: str
+    nombre: str
+    edad: int
+    fecha_registro: str
+    status: Status
+    estudiante_email: str
+    cpod: int
+
+
+class DMFT(TypedDict):
+    cariados: int
+    perdidos: int
+    obturados: int
+    cpod: int
+
+
+class StudentStatusCounts(TypedDict):
+    estudiante_email: str
+    pendiente: int
+    aprobado: int
+    rechazado: int
+    cpod_promedio: float
+
+
+class HistoryChange(TypedDict):
+    seq: int
+    operation: str
+    field_path: list[str]
+    old_value: Any
+    new_value: Any
+    changed_at: str
+
+
+class ReviewChange(TypedDict):
+    campo: str
+    anterior: str
+    actual: str
+
+
+class Patient(TypedDict):
+    id: str
+    nombre: str
+    edad: int
+    fecha_registro: str
+    status: Status
+    estudiante_email: str
+    historia_clinica: ClinicalHistory
+    firma_paciente_url: Optional[str]
+    firma_profesor_url: Optional[str]
+    fecha_firma_profesor: Optional[str]
+    observaciones_rechazo: Optional[str]
+
+
+def create_empty_history() -> ClinicalHistory:
+    return {
+        "datos_generales": {},
+        "datos_administrativos": {},
+        "antecedentes_heredo_familiares": {
+            "diabetes": False,
+            "hipertension": False,
+            "cancer": False,
+            "tuberculosis": False,
+            "enfermedades_mentales": False,
+        },
+        "antecedentes_personales_patologicos": {},
+        "antecedentes_personales_no_patologicos": {},
+        "padecimiento_actual": {},
+        "exploracion_clinica_general": {},
+        "exploracion_fisica_extraoral": {},
+        "articulacion_temporomandibular": {
+            "dolor": False,
+            "ruido": False,
+            "dificultad_abrir_cerrar": False,
+            "cansancio_muscular": False,
+            "limitacion_apertura": "",
+        },
+        "exploracion_tejidos_blandos": {},
+        "odontograma": {
+            "codigo": EMPTY_CODE,
+            "general_notes": "",
+        },
+        "diagnostico": {},
+        "plan_tratamiento": {},
+        "seguimiento": [],
+        "firma_consentimiento": {
+            "aceptado": False,
+            "firma_data_url": "",
+            "firma_trazos": "",
+        },
+        "antecedentes_dentales": {
+            "golpeado_dientes": False,
+            "rechina_dientes": False,
+            "dolor_chasquido_atm": False,
+            "protesis_dental": False,
+        },
+        "resumen_historia_medica": "",
+        "ruta_clinica": {},
+    }
+
+
+def create_initial_patients() -> list[Patient]:
+    today = datetime.date.today().isoformat()
+    history1 = create_empty_history()
+    history1["datos_generales"].update(
+        {"nombre_completo": "Ana Torres", "edad": "34"}
+    )
+    history1["datos_administrativos"].update(
+        {
+            "matricula_estudiante": "estudiante@odontotess.com",
+            "nombre_estudiante": "Juan Pérez Estudiante",
+        }
+    )
+    history1["padecimiento_actual"][
+        "motivo_consulta"
+    ] = "Revisión general y limpieza."
+    history1["odontograma"]["codigo"] = encode_teeth(
+        {
+            "16": {"surfaces": {"oclusal": "Caries"}},
+            "36": {"missing": True},
+        }
+    )
+    history2 = create_empty_history()
+    history2["datos_generales"].update(
+        {"nombre_completo": "Carlos Ruiz", "edad": "52"}
+    )
+    history2["datos_administrativos"].update(
+        {
+            "matricula_estudiante": "estudiante@odontotess.com",
+            "nombre_estudiante": "Juan Pérez Estudiante",
+        }
+    )
+    history2["padecimiento_actual"][
+        "motivo_consulta"
+    ] = "Dolor en molar superior derecho."
+    return [
+        {
+            "id": "p1",
+            "nombre": "Ana Torres",
+            "edad": 34,
+            "fecha_registro": today,
+            "status": "Borrador",
+            "estudiante_email": "estudiante@odontotess.com",
+            "historia_clinica": history1,
+            "firma_paciente_url": None,
+            "firma_profesor_url": None,
+            "fecha_firma_profesor": None,
+            "observaciones_rechazo": None,
+        },
+        {
+            "id": "p2",
+            "nombre": "Carlos Ruiz",
+            "edad": 52,
+            "fecha_registro": today,
+            "status": "Pendiente",
+            "estudiante_email": "estudiante@odontotess.com",
+            "historia_clinica": history2,
+            "firma_paciente_url": None,
+            "firma_profesor_url": None,
+            "fecha_firma_profesor": None,
+            "observaciones_rechazo": None,
+        },
+    ]
\ No newline at end of file
@@ -0,0 +1,135 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Iterator
+
+JOURNAL_COMMIT_MS = float(
+    os.environ.get("ODONTOTESS_JOURNAL_COMMIT_MS", "5")
+)
+JOURNAL_SNAPSHOT_ENTRIES = int(
+    os.environ.get("ODONTOTESS_JOURNAL_SNAPSHOT", "10000")
+)
+
+logger = logging.getLogger("odontotess.journal")
+
+
+class MutationJournal:
+    def __init__(
+        self,
+        path: str,
+        commit_interval_ms: float = JOURNAL_COMMIT_MS,
+    ):
+        self._path = path
+        self._commit_interval = commit_interval_ms / 1000
+        self._lock = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._pending: list[bytes] = []
+        self._seq = 0
+        self._durable_seq = 0
+        self._closed = False
+        for seq, _, _ in self.entries():
+            self._seq = seq
+        self._durable_seq = self._seq
+        self._file = open(path, "ab")
+        atexit.register(self.close)
+        if self._commit_interval > 0:
+            threading.Thread(
+                target=self._run,
+                name="odontotess-journal",
+                daemon=True,
+            ).start()
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    @property
+    def durable_seq(self) -> int:
+        return self._durable_seq
+
+    def entries(
+        self, after: int = 0
+    ) -> Iterator[tuple[int, str, list[Any]]]:
+        if not os.path.exists(self._path):
+            return
+        with open(self._path, "rb") as journal:
+            for line in journal:
+                try:
+                    seq, operation, arguments = json.loads(
+                        line
+                    )
+                except ValueError:
+                    logger.warning(
+                        "Entrada de bitácora incompleta descartada"
+                    )
+                    return
+                if seq > after:
+                    yield seq, operation, arguments
+
+    def advance(self, seq: int):
+        with self._lock:
+            self._seq = max(self._seq, seq)
+            self._durable_seq = max(self._durable_seq, seq)
+
+    def append(
+        self, operation: str, arguments: list[Any]
+    ) -> int:
+        with self._lock:
+            self._seq += 1
+            self._pending.append(
+                json.dumps(
+                    [self._seq, operation, arguments],
+                    ensure_ascii=False,
+                ).encode()
+                + b"\n"
+            )
+            seq = self._seq
+        if self._commit_interval <= 0:
+            self.commit()
+        return seq
+
+    def commit(self):
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                seq = self._seq
+            if pending and not self._closed:
+                self._file.write(b"".join(pending))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            with self._lock:
+                self._durable_seq = max(
+                    self._durable_seq, seq
+                )
+                self._lock.notify_all()
+
+    def wait(self, seq: int):
+        with self._lock:
+            while (
+                self._durable_seq < seq and not self._closed
+            ):
+                self._lock.wait()
+
+    def truncate(self):
+        with self._io_lock:
+            self._file.truncate(0)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _run(self):
+        while not self._closed:
+            time.sleep(self._commit_interval)
+            self.commit()
+
+    def close(self):
+        if self._closed:
+            return
+        self.commit()
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        with self._io_lock:
+            self._file.close()
\ No newline at end of file
@@ -0,0 +1,269 @@
+import base64
+from typing import Optional, get_args
+import numpy as np
+from app.states.models import Status
+from app.states.odontogram_codec import (
+    BITS_PER_SURFACE,
+    CODE_BYTES,
+    FINDINGS,
+    SURFACE_BITS,
+    SURFACE_MASK,
+    SURFACES,
+    TEETH,
+)
+
+STATUSES = get_args(Status)
+SURFACE_BYTES = SURFACE_BITS // 8
+CARIES = FINDINGS.index("Caries")
+RESTORATION = FINDINGS.index("Restauración")
+SURFACE_SHIFTS = np.arange(
+    0, 8, BITS_PER_SURFACE, dtype=np.uint8
+)
+
+
+def unpack_codes(
+    codes: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    findings = (
+        codes[:, :SURFACE_BYTES, None] >> SURFACE_SHIFTS
+    ) & SURFACE_MASK
+    missing = np.unpackbits(
+        codes[:, SURFACE_BYTES:], axis=1, bitorder="little"
+    ).astype(bool)
+    return (
+        findings.reshape(
+            len(codes), len(TEETH), len(SURFACES)
+        ),
+        missing,
+    )
+
+
+def finding_rates(findings: np.ndarray) -> np.ndarray:
+    if not len(findings):
+        return np.zeros(
+            (len(FINDINGS), len(TEETH), len(SURFACES))
+        )
+    counts = np.stack(
+        [
+            np.count_nonzero(findings == finding, axis=0)
+            for finding in range(len(FINDINGS))
+        ]
+    )
+    return counts / len(findings)
+
+
+def missing_rates(missing: np.ndarray) -> np.ndarray:
+    if not len(missing):
+        return np.zeros(len(TEETH))
+    return missing.mean(axis=0)
+
+
+def dmft_counts(codes: np.ndarray) -> np.ndarray:
+    findings, missing = unpack_codes(codes)
+    decayed = (findings == CARIES).any(axis=2) & ~missing
+    filled = (
+        (findings == RESTORATION).any(axis=2)
+        & ~decayed
+        & ~missing
+    )
+    return np.stack(
+        [
+            decayed.sum(axis=1),
+            missing.sum(axis=1),
+            filled.sum(axis=1),
+        ],
+        axis=1,
+    )
+
+
+class OdontogramCohort:
+    def __init__(self, capacity: int = 1024):
+        self._row_by_id: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._student_codes: dict[str, int] = {}
+        self._codes = np.zeros(
+            (capacity, CODE_BYTES), dtype=np.uint8
+        )
+        self._students = np.zeros(capacity, dtype=np.int32)
+        self._statuses = np.zeros(capacity, dtype=np.int8)
+        self._dates = np.zeros(
+            capacity, dtype="datetime64[D]"
+        )
+        self._versions = np.zeros(capacity, dtype=np.int64)
+        self._dmft_versions = np.zeros(
+            capacity, dtype=np.int64
+        )
+        self._dmft = np.zeros((capacity, 3), dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _grow(self):
+        capacity = len(self._codes) * 2
+        for name in (
+            "_codes",
+            "_students",
+            "_statuses",
+            "_dates",
+            "_versions",
+            "_dmft_versions",
+            "_dmft",
+        ):
+            current = getattr(self, name)
+            grown = np.zeros(
+                (capacity, *current.shape[1:]),
+                dtype=current.dtype,
+            )
+            grown[: len(current)] = current
+            setattr(self, name, grown)
+
+    def _row(self, patient_id: str) -> int:
+        row = self._row_by_id.get(patient_id)
+        if row is None:
+            if len(self._ids) == len(self._codes):
+                self._grow()
+            row = len(self._ids)
+            self._row_by_id[patient_id] = row
+            self._ids.append(patient_id)
+        return row
+
+    def add(
+        self,
+        patient_id: str,
+        code: str,
+        estudiante_email: str,
+        status: str,
+        fecha_registro: str,
+    ):
+        row = self._row(patient_id)
+        self.set_code(patient_id, code)
+        self._students[row] = (
+            self._student_codes.setdefault(
+                estudiante_email, len(self._student_codes)
+            )
+        )
+        self.set_status(patient_id, status)
+        self._dates[row] = np.datetime64(
+            fecha_registro, "D"
+        )
+
+    def set_code(self, patient_id: str, code: str):
+        row = self._row_by_id.get(patient_id)
+        if row is not None:
+            self._codes[row] = np.frombuffer(
+                (
+                    base64.b64decode(code)
+                    if code
+                    else bytes(CODE_BYTES)
+                ),
+                dtype=np.uint8,
+            )
+            self._versions[row] += 1
+
+    def set_status(self, patient_id: str, status: str):
+        row = self._row_by_id.get(patient_id)
+        if row is not None:
+            self._statuses[row] = STATUSES.index(status)
+
+    def remove(self, patient_id: str):
+        row = self._row_by_id.pop(patient_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._row_by_id[moved_id] = row
+            for values in (
+                self._codes,
+                self._students,
+                self._statuses,
+                self._dates,
+                self._versions,
+                self._dmft_versions,
+                self._dmft,
+            ):
+                values[row] = values[last]
+        self._ids.pop()
+
+    def select(
+        self,
+        estudiante_email: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> np.ndarray:
+        size = len(self._ids)
+        mask = np.ones(size, dtype=bool)
+        if estudiante_email:
+            student = self._student_codes.get(
+                estudiante_email
+            )
+            if student is None:
+                return self._codes[:0]
+            mask &= self._students[:size] == student
+        if status:
+            mask &= self._statuses[:size] == STATUSES.index(
+                status
+            )
+        if date_from:
+            mask &= self._dates[:size] >= np.datetime64(
+                date_from, "D"
+            )
+        if date_to:
+            mask &= self._dates[:size] <= np.datetime64(
+                date_to, "D"
+            )
+        return self._codes[:size][mask]
+
+    def _refresh_dmft(self, rows: np.ndarray):
+        stale = rows[
+            self._dmft_versions[rows]
+            != self._versions[rows]
+        ]
+        if len(stale):
+            self._dmft[stale] = dmft_counts(
+                self._codes[stale]
+            )
+            self._dmft_versions[stale] = self._versions[
+                stale
+            ]
+
+    def dmft(self, patient_ids: list[str]) -> np.ndarray:
+        rows = np.array(
+            [
+                self._row_by_id[patient_id]
+                for patient_id in patient_ids
+            ],
+            dtype=np.int64,
+        )
+        self._refresh_dmft(rows)
+        return self._dmft[rows]
+
+    def dmft_average(self) -> float:
+        size = len(self._ids)
+        if not size:
+            return 0.0
+        self._refresh_dmft(np.arange(size))
+        return float(self._dmft[:size].sum(axis=1).mean())
+
+    def student_dmft_averages(self) -> dict[str, float]:
+        size = len(self._ids)
+        self._refresh_dmft(np.arange(size))
+        students = self._students[:size]
+        patient_counts = np.bincount(
+            students, minlength=len(self._student_codes)
+        )
+        dmft_totals = np.bincount(
+            students,
+            weights=self._dmft[:size].sum(axis=1),
+            minlength=len(self._student_codes),
+        )
+        return {
+            estudiante_email: float(
+                dmft_totals[student]
+                / patient_counts[student]
+            )
+            for estudiante_email, student in self._student_codes.items()
+            if patient_counts[student]
+        }
\ No newline at end of file
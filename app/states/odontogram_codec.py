@@ -0,0 +1,235 @@
+import base64
+
+TEETH = tuple(
+    str(quadrant * 10 + position)
+    for quadrant in range(1, 5)
+    for position in range(1, 9)
+)
+SURFACES = (
+    "vestibular",
+    "lingual",
+    "distal",
+    "mesial",
+    "oclusal",
+)
+FINDINGS = ("", "Caries", "Sellante", "Restauración")
+BITS_PER_SURFACE = 2
+SURFACE_MASK = (1 << BITS_PER_SURFACE) - 1
+SURFACE_COUNT = len(TEETH) * len(SURFACES)
+SURFACE_BITS = SURFACE_COUNT * BITS_PER_SURFACE
+CODE_BYTES = (SURFACE_BITS + len(TEETH)) // 8
+
+TOOTH_INDEX = {
+    tooth: index for index, tooth in enumerate(TEETH)
+}
+SURFACE_INDEX = {
+    surface: index for index, surface in enumerate(SURFACES)
+}
+TOOTH_BITS = len(SURFACES) * BITS_PER_SURFACE
+TOOTH_MASK = (1 << TOOTH_BITS) - 1
+TOOTH_SURFACES = [
+    tuple(
+        (surface, FINDINGS[finding])
+        for surface_index, surface in enumerate(SURFACES)
+        if (
+            finding := bits
+            >> surface_index * BITS_PER_SURFACE
+            & SURFACE_MASK
+        )
+    )
+    for bits in range(1 << TOOTH_BITS)
+]
+FINDING_INDEX = {
+    finding: index for index, finding in enumerate(FINDINGS)
+}
+
+
+def surface_indices(
+    teeth: tuple[str, ...],
+    surfaces: tuple[str, ...] = SURFACES,
+) -> tuple[int, ...]:
+    return tuple(
+        TOOTH_INDEX[tooth] * len(SURFACES)
+        + SURFACE_INDEX[surface]
+        for tooth in teeth
+        for surface in surfaces
+    )
+
+
+SELECTION_PRESETS = {
+    **{
+        f"Cuadrante {quadrant}": surface_indices(
+            TEETH[(quadrant - 1) * 8 : quadrant * 8]
+        )
+        for quadrant in range(1, 5)
+    },
+    "Arcada superior": surface_indices(TEETH[:16]),
+    "Arcada inferior": surface_indices(TEETH[16:]),
+    "Todas las oclusales": surface_indices(
+        TEETH, ("oclusal",)
+    ),
+    "Toda la boca": surface_indices(TEETH),
+}
+
+
+def _tooth_index(tooth: str) -> int:
+    try:
+        return TOOTH_INDEX[tooth]
+    except KeyError:
+        raise ValueError(f"Diente desconocido: {tooth}")
+
+
+def _surface_shift(tooth: str, surface: str) -> int:
+    try:
+        surface_index = SURFACE_INDEX[surface]
+    except KeyError:
+        raise ValueError(
+            f"Superficie desconocida: {surface}"
+        )
+    return (
+        _tooth_index(tooth) * len(SURFACES) + surface_index
+    ) * BITS_PER_SURFACE
+
+
+def _missing_shift(tooth: str) -> int:
+    return SURFACE_BITS + _tooth_index(tooth)
+
+
+def _finding_code(finding: str) -> int:
+    try:
+        return FINDING_INDEX[finding or ""]
+    except KeyError:
+        raise ValueError(f"Hallazgo desconocido: {finding}")
+
+
+def pack(value: int) -> str:
+    return base64.b64encode(
+        value.to_bytes(CODE_BYTES, "little")
+    ).decode("ascii")
+
+
+def unpack(code: str) -> int:
+    if not code:
+        return 0
+    try:
+        data = base64.b64decode(code, validate=True)
+    except ValueError as error:
+        raise ValueError(
+            f"Código de odontograma inválido: {code}"
+        ) from error
+    if len(data) != CODE_BYTES:
+        raise ValueError(
+            f"Código de odontograma inválido: {code}"
+        )
+    return int.from_bytes(data, "little")
+
+
+EMPTY_CODE = pack(0)
+
+
+def encode_teeth(teeth: dict) -> str:
+    value = 0
+    for tooth, tooth_state in teeth.items():
+        for surface, finding in tooth_state.get(
+            "surfaces", {}
+        ).items():
+            value |= _finding_code(
+                finding
+            ) << _surface_shift(tooth, surface)
+        if tooth_state.get("missing"):
+            value |= 1 << _missing_shift(tooth)
+    return pack(value)
+
+
+def decode_teeth(code: str) -> dict:
+    value = unpack(code)
+    teeth: dict = {}
+    if not value:
+        return teeth
+    missing = value >> SURFACE_BITS
+    for tooth_index, tooth in enumerate(TEETH):
+        surfaces = TOOTH_SURFACES[
+            value >> tooth_index * TOOTH_BITS & TOOTH_MASK
+        ]
+        tooth_state: dict = {}
+        if surfaces:
+            tooth_state["surfaces"] = dict(surfaces)
+        if missing >> tooth_index & 1:
+            tooth_state["missing"] = True
+        if tooth_state:
+            teeth[tooth] = tooth_state
+    return teeth
+
+
+def surface_finding(
+    code: str, tooth: str, surface: str
+) -> str:
+    return FINDINGS[
+        unpack(code) >> _surface_shift(tooth, surface)
+        & SURFACE_MASK
+    ]
+
+
+def is_missing(code: str, tooth: str) -> bool:
+    return bool(unpack(code) >> _missing_shift(tooth) & 1)
+
+
+def with_surface_finding(
+    code: str, tooth: str, surface: str, finding: str
+) -> str:
+    shift = _surface_shift(tooth, surface)
+    value = unpack(code) & ~(SURFACE_MASK << shift)
+    return pack(value | _finding_code(finding) << shift)
+
+
+def with_missing(
+    code: str, tooth: str, missing: bool
+) -> str:
+    shift = _missing_shift(tooth)
+    value = unpack(code) & ~(1 << shift)
+    return pack(value | int(missing) << shift)
+
+
+def finding_digits(code: str) -> str:
+    value = unpack(code)
+    return "".join(
+        str(
+            value >> index * BITS_PER_SURFACE & SURFACE_MASK
+        )
+        for index in range(SURFACE_COUNT)
+    ) + "".join(
+        str(value >> SURFACE_BITS + index & 1)
+        for index in range(len(TEETH))
+    )
+
+
+def with_findings(
+    code: str, indices: list[int], finding: str
+) -> tuple[str, dict[int, int]]:
+    value = unpack(code)
+    missing = value >> SURFACE_BITS
+    finding_code = _finding_code(finding)
+    previous: dict[int, int] = {}
+    for index in indices:
+        if missing >> index // len(SURFACES) & 1:
+            continue
+        shift = index * BITS_PER_SURFACE
+        current = value >> shift & SURFACE_MASK
+        if current != finding_code:
+            previous[index] = current
+            value = value & ~(SURFACE_MASK << shift) | (
+                finding_code << shift
+            )
+    return pack(value), previous
+
+
+def with_finding_codes(
+    code: str, finding_codes: dict[int, int]
+) -> str:
+    value = unpack(code)
+    for index, finding_code in finding_codes.items():
+        shift = index * BITS_PER_SURFACE
+        value = value & ~(SURFACE_MASK << shift) | (
+            finding_code << shift
+        )
+    return pack(value)
\ No newline at end of file
@@ -0,0 +1,278 @@
+import reflex as rx
+from app.states.clinic_state import ClinicState
+from app.states.clinic_store import get_clinic_store
+from app.states.models import Patient
+from app.states.odontogram_codec import (
+    FINDING_INDEX,
+    SELECTION_PRESETS,
+    SURFACE_COUNT,
+    SURFACE_INDEX,
+    TOOTH_INDEX,
+    finding_digits,
+    is_missing,
+    surface_finding,
+    surface_indices,
+    with_finding_codes,
+    with_findings,
+    with_missing,
+    with_surface_finding,
+)
+
+EMPTY_DIGITS = finding_digits("")
+NO_TOOL = "Ninguno"
+
+
+def is_odontogram_tool(tool: str) -> bool:
+    return tool == NO_TOOL or (
+        bool(tool) and tool in FINDING_INDEX
+    )
+
+
+def patient_finding_digits(patient: Patient) -> str:
+    return finding_digits(
+        patient["historia_clinica"]
+        .get("odontograma", {})
+        .get("codigo", "")
+    )
+
+
+class OdontogramState(ClinicState):
+    odontogram_tool: str = NO_TOOL
+    odontogram_selecting: bool = False
+    odontogram_selection: str = ""
+    odontogram_undo_patient: str = ""
+    odontogram_digits: str = ""
+    _odontogram_undo: dict[int, int] = {}
+
+    @rx.var
+    def odontogram_selection_count(self) -> int:
+        return self.odontogram_selection.count("1")
+
+    @rx.var
+    def can_undo_odontogram(self) -> bool:
+        return (
+            bool(self.odontogram_undo_patient)
+            and self.odontogram_undo_patient
+            == self._route_patient_id()
+        )
+
+    def _sync_odontogram(self):
+        self._sync_store_version()
+        digits = self._derive(
+            patient_finding_digits, EMPTY_DIGITS
+        )
+        if self.odontogram_digits != digits:
+            self.odontogram_digits = digits
+
+    def _drop_undo(self):
+        if self.odontogram_undo_patient:
+            self.odontogram_undo_patient = ""
+            self._odontogram_undo = {}
+
+    def _selection_valid(self) -> bool:
+        selection = self.odontogram_selection
+        return len(selection) == SURFACE_COUNT and (
+            set(selection) <= {"0", "1"}
+        )
+
+    def _selected_surfaces(self) -> set[int]:
+        if not self._selection_valid():
+            return set()
+        return {
+            index
+            for index, digit in enumerate(
+                self.odontogram_selection
+            )
+            if digit == "1"
+        }
+
+    def _set_selected_surfaces(self, indices: set[int]):
+        self.odontogram_selection = (
+            "".join(
+                "1" if index in indices else "0"
+                for index in range(SURFACE_COUNT)
+            )
+            if indices
+            else ""
+        )
+
+    def _toggle_selected_surfaces(
+        self, indices: tuple[int, ...]
+    ):
+        selected = self._selected_surfaces()
+        if selected.issuperset(indices):
+            selected.difference_update(indices)
+        else:
+            selected.update(indices)
+        self._set_selected_surfaces(selected)
+
+    @rx.event
+    def set_odontogram_tool(self, tool: str):
+        if not is_odontogram_tool(tool):
+            return rx.toast.error(
+                "Herramienta de odontograma desconocida."
+            )
+        self.odontogram_tool = tool
+
+    @rx.event
+    def load_odontogram(self):
+        self.odontogram_selecting = False
+        self.odontogram_selection = ""
+        self._sync_odontogram()
+
+    @rx.event
+    def toggle_odontogram_selecting(self):
+        self.odontogram_selecting = (
+            not self.odontogram_selecting
+        )
+        self.odontogram_selection = ""
+
+    @rx.event
+    def toggle_tooth_selection(self, tooth_id: str):
+        if (
+            self.odontogram_selecting
+            and tooth_id in TOOTH_INDEX
+        ):
+            self._toggle_selected_surfaces(
+                surface_indices((tooth_id,))
+            )
+
+    @rx.event
+    def select_odontogram_preset(self, preset: str):
+        if preset in SELECTION_PRESETS:
+            self.odontogram_selecting = True
+            self._toggle_selected_surfaces(
+                SELECTION_PRESETS[preset]
+            )
+
+    @rx.event
+    def clear_odontogram_selection(self):
+        self.odontogram_selection = ""
+
+    @rx.event
+    def apply_odontogram_selection(self, clear: bool):
+        patient_id = self._route_patient_id()
+        if self.odontogram_selection and (
+            not self._selection_valid()
+        ):
+            self.odontogram_selection = ""
+            return rx.toast.error(
+                "La selección del odontograma no es válida."
+            )
+        if not clear and not is_odontogram_tool(
+            self.odontogram_tool
+        ):
+            return rx.toast.error(
+                "Herramienta de odontograma desconocida."
+            )
+        indices = sorted(self._selected_surfaces())
+        if (
+            self._get_patient(patient_id) is None
+            or not indices
+            or (
+                not clear
+                and self.odontogram_tool == NO_TOOL
+            )
+        ):
+            return
+        finding = "" if clear else self.odontogram_tool
+        previous: dict[int, int] = {}
+
+        def apply(code: str) -> str:
+            updated, changed = with_findings(
+                code, indices, finding
+            )
+            previous.clear()
+            previous.update(changed)
+            return updated
+
+        get_clinic_store().update_odontogram(
+            patient_id, apply
+        )
+        self._odontogram_undo = previous
+        self.odontogram_undo_patient = (
+            patient_id if previous else ""
+        )
+        self.odontogram_selection = ""
+        self._sync_odontogram()
+
+    @rx.event
+    def undo_odontogram(self):
+        patient_id = self._route_patient_id()
+        if (
+            patient_id
+            and patient_id == self.odontogram_undo_patient
+        ):
+            undo = self._odontogram_undo
+            get_clinic_store().update_odontogram(
+                patient_id,
+                lambda code: with_finding_codes(code, undo),
+            )
+            self._odontogram_undo = {}
+            self.odontogram_undo_patient = ""
+            self._sync_odontogram()
+
+    @rx.event
+    def update_tooth_surface(
+        self, tooth_id: str, surface: str
+    ):
+        if (
+            tooth_id not in TOOTH_INDEX
+            or surface not in SURFACE_INDEX
+        ):
+            return rx.toast.error(
+                "Diente o superficie desconocidos."
+            )
+        if self.odontogram_selecting:
+            self._toggle_selected_surfaces(
+                surface_indices((tooth_id,), (surface,))
+            )
+            return
+        patient_id = self._route_patient_id()
+        patient = self._get_patient(patient_id)
+        if (
+            patient is not None
+            and self.odontogram_tool != NO_TOOL
+            and is_odontogram_tool(self.odontogram_tool)
+        ):
+            tool = self.odontogram_tool
+            get_clinic_store().update_odontogram(
+                patient_id,
+                lambda code: (
+                    code
+                    if is_missing(code, tooth_id)
+                    else with_surface_finding(
+                        code,
+                        tooth_id,
+                        surface,
+                        (
+                            ""
+                            if surface_finding(
+                                code, tooth_id, surface
+                            )
+                            == tool
+                            else tool
+                        ),
+                    )
+                ),
+            )
+            self._drop_undo()
+            self._sync_odontogram()
+
+    @rx.event
+    def toggle_tooth_missing(self, tooth_id: str):
+        if tooth_id not in TOOTH_INDEX:
+            return rx.toast.error("Diente desconocido.")
+        patient_id = self._route_patient_id()
+        patient = self._get_patient(patient_id)
+        if patient is not None:
+            get_clinic_store().update_odontogram(
+                patient_id,
+                lambda code: with_missing(
+                    code,
+                    tooth_id,
+                    not is_missing(code, tooth_id),
+                ),
+            )
+            self._drop_undo()
+            self._sync_odontogram()
\ No newline at end of file
@@ -0,0 +1,266 @@
+import bisect
+from collections import Counter
+
+
+def trigrams(text: str) -> set[str]:
+    text = text.lower()
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class PatientFilterIndex:
+    def __init__(self):
+        self._student_by_id: dict[str, str] = {}
+        self._status_by_id: dict[str, str] = {}
+        self._ids_by_student: dict[str, dict[str, None]] = (
+            {}
+        )
+        self._ids_by_status: dict[str, set[str]] = {}
+        self._name_by_id: dict[str, str] = {}
+        self._names_by_student: dict[str, Counter] = {}
+        self._student_search_text: dict[str, str] = {}
+        self._students_by_trigram: dict[str, set[str]] = {}
+        self._students: list[str] = []
+        self._status_counts_by_student: dict[
+            str, dict[str, int]
+        ] = {}
+
+    def __contains__(self, patient_id: str) -> bool:
+        return patient_id in self._student_by_id
+
+    def __len__(self) -> int:
+        return len(self._student_by_id)
+
+    def _index_student_text(self, estudiante_email: str):
+        previous = self._student_search_text.get(
+            estudiante_email, ""
+        )
+        search_text = " ".join(
+            [
+                estudiante_email,
+                *sorted(
+                    name
+                    for name in self._names_by_student[
+                        estudiante_email
+                    ]
+                    if name
+                ),
+            ]
+        ).lower()
+        self._student_search_text[estudiante_email] = (
+            search_text
+        )
+        previous_trigrams = trigrams(previous)
+        current_trigrams = trigrams(search_text)
+        for trigram in previous_trigrams - current_trigrams:
+            students = self._students_by_trigram[trigram]
+            students.discard(estudiante_email)
+            if not students:
+                del self._students_by_trigram[trigram]
+        for trigram in current_trigrams - previous_trigrams:
+            self._students_by_trigram.setdefault(
+                trigram, set()
+            ).add(estudiante_email)
+
+    def _add_student(self, estudiante_email: str):
+        bisect.insort(self._students, estudiante_email)
+        self._status_counts_by_student[estudiante_email] = (
+            {}
+        )
+        self._names_by_student[estudiante_email] = Counter()
+
+    def _remove_student(self, estudiante_email: str):
+        search_text = self._student_search_text.pop(
+            estudiante_email, ""
+        )
+        position = bisect.bisect_left(
+            self._students, estudiante_email
+        )
+        if (
+            position < len(self._students)
+            and self._students[position] == estudiante_email
+        ):
+            del self._students[position]
+        self._status_counts_by_student.pop(
+            estudiante_email, None
+        )
+        self._names_by_student.pop(estudiante_email, None)
+        for trigram in trigrams(search_text):
+            students = self._students_by_trigram.get(
+                trigram, set()
+            )
+            students.discard(estudiante_email)
+            if not students:
+                self._students_by_trigram.pop(trigram, None)
+
+    def _count_name(
+        self, patient_id: str, name: str, delta: int
+    ):
+        names = self._names_by_student[
+            self._student_by_id[patient_id]
+        ]
+        names[name] += delta
+        if names[name] <= 0:
+            del names[name]
+
+    def add(
+        self,
+        patient_id: str,
+        estudiante_email: str,
+        status: str,
+        nombre_estudiante: str = "",
+    ):
+        self.remove(patient_id)
+        if estudiante_email not in self._ids_by_student:
+            self._ids_by_student[estudiante_email] = {}
+            self._add_student(estudiante_email)
+        self._ids_by_student[estudiante_email][
+            patient_id
+        ] = None
+        self._student_by_id[patient_id] = estudiante_email
+        self._name_by_id[patient_id] = (
+            nombre_estudiante or ""
+        )
+        self._count_name(
+            patient_id, self._name_by_id[patient_id], 1
+        )
+        self._index_student_text(estudiante_email)
+        self.set_status(patient_id, status)
+
+    def set_student_name(
+        self, patient_id: str, nombre_estudiante: str
+    ):
+        previous = self._name_by_id.get(patient_id)
+        if (
+            previous is None
+            or previous == nombre_estudiante
+        ):
+            return
+        self._count_name(patient_id, previous, -1)
+        self._name_by_id[patient_id] = nombre_estudiante
+        self._count_name(patient_id, nombre_estudiante, 1)
+        self._index_student_text(
+            self._student_by_id[patient_id]
+        )
+
+    def _count_status(
+        self, patient_id: str, status: str, delta: int
+    ):
+        counts = self._status_counts_by_student[
+            self._student_by_id[patient_id]
+        ]
+        counts[status] = counts.get(status, 0) + delta
+
+    def set_status(self, patient_id: str, status: str):
+        previous = self._status_by_id.get(patient_id)
+        if previous is not None:
+            self._ids_by_status[previous].discard(
+                patient_id
+            )
+            self._count_status(patient_id, previous, -1)
+        self._status_by_id[patient_id] = status
+        self._ids_by_status.setdefault(status, set()).add(
+            patient_id
+        )
+        self._count_status(patient_id, status, 1)
+
+    def remove(self, patient_id: str):
+        if patient_id not in self._student_by_id:
+            return
+        status = self._status_by_id.pop(patient_id)
+        self._ids_by_status[status].discard(patient_id)
+        self._count_status(patient_id, status, -1)
+        self._count_name(
+            patient_id, self._name_by_id.pop(patient_id), -1
+        )
+        estudiante_email = self._student_by_id.pop(
+            patient_id
+        )
+        student_ids = self._ids_by_student[estudiante_email]
+        student_ids.pop(patient_id, None)
+        if not student_ids:
+            del self._ids_by_student[estudiante_email]
+            self._remove_student(estudiante_email)
+        else:
+            self._index_student_text(estudiante_email)
+
+    def student_patient_ids(
+        self, estudiante_email: str
+    ) -> list[str]:
+        return list(
+            self._ids_by_student.get(estudiante_email, {})
+        )
+
+    @property
+    def students(self) -> list[str]:
+        return self._students
+
+    def status_count(self, status: str) -> int:
+        return len(self._ids_by_status.get(status, ()))
+
+    def student_status_count(
+        self, estudiante_email: str, status: str
+    ) -> int:
+        return self._status_counts_by_student.get(
+            estudiante_email, {}
+        ).get(status, 0)
+
+    def matching_students(self, text: str) -> list[str]:
+        text = text.lower()
+        query_trigrams = trigrams(text)
+        if query_trigrams:
+            candidates = set.intersection(
+                *(
+                    self._students_by_trigram.get(
+                        trigram, set()
+                    )
+                    for trigram in query_trigrams
+                )
+            )
+        else:
+            candidates = set(self._student_search_text)
+        return [
+            estudiante_email
+            for estudiante_email in candidates
+            if text
+            in self._student_search_text[estudiante_email]
+        ]
+
+    def patient_ids(
+        self,
+        student_text: str | None = None,
+        status: str | None = None,
+    ) -> list[str]:
+        status_ids = (
+            self._ids_by_status.get(status, set())
+            if status
+            else None
+        )
+        return [
+            patient_id
+            for estudiante_email in (
+                sorted(self.matching_students(student_text))
+                if student_text
+                else self._students
+            )
+            for patient_id in self._ids_by_student[
+                estudiante_email
+            ]
+            if status_ids is None
+            or patient_id in status_ids
+        ]
+
+    def query(
+        self, student_text: str, status: str | None = None
+    ) -> set[str]:
+        patient_ids: set[str] = set()
+        for estudiante_email in self.matching_students(
+            student_text
+        ):
+            patient_ids.update(
+                self._ids_by_student[estudiante_email]
+            )
+        if status:
+            patient_ids &= self._ids_by_status.get(
+                status, set()
+            )
+        return patient_ids
\ No newline at end of file
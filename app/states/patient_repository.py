@@ -0,0 +1,603 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from app.states.models import (
+    HistoryChange,
+    Patient,
+    PatientSummary,
+)
+from app.states.odontogram_codec import encode_teeth
+
+DATABASE_PATH = os.environ.get(
+    "ODONTOTESS_DB_PATH", "odontotess.db"
+)
+JOURNAL_PATH = os.environ.get(
+    "ODONTOTESS_JOURNAL_PATH", f"{DATABASE_PATH}.mutations"
+)
+BLOB_PATH = os.environ.get(
+    "ODONTOTESS_BLOB_PATH", f"{DATABASE_PATH}.blobs"
+)
+
+PATIENT_COLUMNS = (
+    "id",
+    "nombre",
+    "edad",
+    "fecha_registro",
+    "status",
+    "estudiante_email",
+    "historia_clinica",
+    "firma_paciente_url",
+    "firma_profesor_url",
+    "fecha_firma_profesor",
+    "observaciones_rechazo",
+)
+
+SUMMARY_COLUMNS = (
+    "id",
+    "nombre",
+    "edad",
+    "fecha_registro",
+    "status",
+    "estudiante_email",
+)
+
+SORT_COLUMNS = {
+    "fecha_registro": "fecha_registro",
+    "status": "status",
+    "nombre": "nombre",
+    "estudiante": "estudiante_email",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS patients (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    edad INTEGER NOT NULL,
+    fecha_registro TEXT NOT NULL,
+    status TEXT NOT NULL,
+    estudiante_email TEXT NOT NULL,
+    historia_clinica TEXT NOT NULL,
+    firma_paciente_url TEXT,
+    firma_profesor_url TEXT,
+    fecha_firma_profesor TEXT,
+    observaciones_rechazo TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_patients_estudiante_email
+    ON patients (estudiante_email);
+CREATE INDEX IF NOT EXISTS idx_patients_status
+    ON patients (status);
+CREATE INDEX IF NOT EXISTS idx_patients_fecha_registro
+    ON patients (fecha_registro);
+CREATE INDEX IF NOT EXISTS idx_patients_nombre
+    ON patients (nombre);
+CREATE INDEX IF NOT EXISTS idx_patients_status_fecha_registro
+    ON patients (status, fecha_registro);
+CREATE TABLE IF NOT EXISTS history_changes (
+    patient_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    operation TEXT NOT NULL,
+    field_path TEXT NOT NULL,
+    old_value TEXT,
+    new_value TEXT,
+    changed_at TEXT NOT NULL,
+    PRIMARY KEY (patient_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_history_changes_operation
+    ON history_changes (patient_id, operation, seq);
+CREATE TABLE IF NOT EXISTS history_checkpoints (
+    patient_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    historia_clinica TEXT NOT NULL,
+    PRIMARY KEY (patient_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS patient_ids (
+    id INTEGER PRIMARY KEY AUTOINCREMENT
+);
+CREATE TABLE IF NOT EXISTS journal_state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    seq INTEGER NOT NULL
+);
+"""
+
+REVIEW_STATUSES = ("Rechazado", "Aprobado")
+
+
+def _patient_to_row(patient: Patient) -> tuple:
+    return tuple(
+        (
+            json.dumps(
+                patient["historia_clinica"],
+                ensure_ascii=False,
+            )
+            if column == "historia_clinica"
+            else patient.get(column)
+        )
+        for column in PATIENT_COLUMNS
+    )
+
+
+def _json_path(field_path: list[str]) -> str:
+    if not field_path or not all(
+        isinstance(key, str) and key and '"' not in key
+        for key in field_path
+    ):
+        raise ValueError(
+            f"Ruta de historia inválida: {field_path!r}"
+        )
+    return "$" + "".join(f'."{key}"' for key in field_path)
+
+
+def _summary_filters(
+    patient_ids: list[str] | None,
+    status: str | None,
+    after: tuple[str, str, str] | None = None,
+) -> tuple[str, list[Any]]:
+    clauses = []
+    params: list[Any] = []
+    if patient_ids is not None:
+        clauses.append(
+            "id IN (SELECT value FROM json_each(?))"
+        )
+        params.append(json.dumps(patient_ids))
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if after and after[2]:
+        column, operator, cursor = after
+        clauses.append(
+            f"({column}, rowid) {operator} (?, ?)"
+        )
+        params.extend(json.loads(cursor))
+    where = (
+        f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    )
+    return where, params
+
+
+def _json_value(value: Optional[str]) -> Any:
+    return json.loads(value) if value is not None else None
+
+
+def _row_to_change(row: sqlite3.Row) -> HistoryChange:
+    return {
+        "seq": row["seq"],
+        "operation": row["operation"],
+        "field_path": json.loads(row["field_path"]),
+        "old_value": _json_value(row["old_value"]),
+        "new_value": _json_value(row["new_value"]),
+        "changed_at": row["changed_at"],
+    }
+
+
+def _row_to_patient(row: sqlite3.Row) -> Patient:
+    patient: dict[str, Any] = dict(row)
+    patient["historia_clinica"] = json.loads(
+        patient["historia_clinica"]
+    )
+    return patient  # type: ignore[return-value]
+
+
+class PatientRepository:
+    def __init__(self, path: str):
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "PRAGMA synchronous=NORMAL"
+        )
+        self._connection.executescript(SCHEMA)
+        self._migrate_odontograms()
+        self._migrate_patient_ids()
+
+    def _migrate_odontograms(self):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, json_extract(historia_clinica, '$.odontograma.teeth') FROM patients WHERE json_type(historia_clinica, '$.odontograma.teeth') IS NOT NULL"
+            ).fetchall()
+            if not rows:
+                return
+            self._connection.execute("BEGIN")
+            for patient_id, teeth in rows:
+                self._connection.execute(
+                    "UPDATE patients SET historia_clinica = json_remove(json_set(historia_clinica, '$.odontograma.codigo', ?), '$.odontograma.teeth') WHERE id = ?",
+                    (
+                        encode_teeth(json.loads(teeth)),
+                        patient_id,
+                    ),
+                )
+            self._connection.execute("COMMIT")
+
+    def _migrate_patient_ids(self):
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO patient_ids (id) SELECT MAX(CAST(substr(id, 2) AS INTEGER)) FROM patients WHERE id GLOB 'p[0-9]*' AND NOT EXISTS (SELECT 1 FROM patient_ids) HAVING COUNT(*) > 0"
+            )
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                yield
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def journal_seq(self) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT seq FROM journal_state WHERE id = 0"
+            ).fetchone()
+        return row[0] if row is not None else 0
+
+    def set_journal_seq(self, seq: int):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO journal_state (id, seq) VALUES (0, ?)",
+                (seq,),
+            )
+
+    def checkpoint(self) -> bool:
+        with self._lock:
+            busy, _, _ = self._connection.execute(
+                "PRAGMA wal_checkpoint(TRUNCATE)"
+            ).fetchone()
+        return not busy
+
+    def _fetch_patients(
+        self, query: str, params: tuple = ()
+    ) -> list[Patient]:
+        with self._lock:
+            rows = self._connection.execute(
+                query, params
+            ).fetchall()
+        return [_row_to_patient(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM patients"
+            ).fetchone()[0]
+
+    def get(self, patient_id: str) -> Optional[Patient]:
+        patients = self._fetch_patients(
+            "SELECT * FROM patients WHERE id = ?",
+            (patient_id,),
+        )
+        return patients[0] if patients else None
+
+    def get_many(
+        self, patient_ids: list[str]
+    ) -> list[Patient]:
+        if not patient_ids:
+            return []
+        placeholders = ", ".join("?" * len(patient_ids))
+        return self._fetch_patients(
+            f"SELECT * FROM patients WHERE id IN ({placeholders})",
+            tuple(patient_ids),
+        )
+
+    def _fetch_summaries(
+        self, query: str, params: tuple = ()
+    ) -> list[PatientSummary]:
+        with self._lock:
+            rows = self._connection.execute(
+                query, params
+            ).fetchall()
+        return [dict(row) for row in rows]  # type: ignore[misc]
+
+    def get_summaries(
+        self, patient_ids: list[str]
+    ) -> list[PatientSummary]:
+        if not patient_ids:
+            return []
+        placeholders = ", ".join("?" * len(patient_ids))
+        summaries = {
+            summary["id"]: summary
+            for summary in self._fetch_summaries(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM patients WHERE id IN ({placeholders})",
+                tuple(patient_ids),
+            )
+        }
+        return [
+            summaries[patient_id]
+            for patient_id in patient_ids
+            if patient_id in summaries
+        ]
+
+    def count_summaries(
+        self,
+        patient_ids: list[str] | None = None,
+        status: str | None = None,
+    ) -> int:
+        where, params = _summary_filters(
+            patient_ids, status
+        )
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM patients{where}",
+                tuple(params),
+            ).fetchone()[0]
+
+    def page_summaries(
+        self,
+        patient_ids: list[str] | None = None,
+        status: str | None = None,
+        sort_by: str = "fecha_registro",
+        descending: bool = False,
+        cursor: str = "",
+        limit: int = 20,
+    ) -> tuple[list[PatientSummary], str]:
+        if patient_ids is not None and not patient_ids:
+            return [], ""
+        column = SORT_COLUMNS.get(sort_by, "fecha_registro")
+        direction = "DESC" if descending else "ASC"
+        where, params = _summary_filters(
+            patient_ids,
+            status,
+            (column, "<" if descending else ">", cursor),
+        )
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)}, rowid AS row_position FROM patients{where} ORDER BY {column} {direction}, rowid {direction} LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        next_cursor = (
+            json.dumps(
+                [
+                    rows[limit - 1][column],
+                    rows[limit - 1]["row_position"],
+                ]
+            )
+            if len(rows) > limit
+            else ""
+        )
+        return [
+            {column: row[column] for column in SUMMARY_COLUMNS}  # type: ignore[misc]
+            for row in rows[:limit]
+        ], next_cursor
+
+    def patient_index(
+        self,
+    ) -> list[tuple[str, str, str, str]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, estudiante_email, status, json_extract(historia_clinica, '$.datos_administrativos.nombre_estudiante') FROM patients ORDER BY rowid"
+            ).fetchall()
+        return [
+            (row[0], row[1], row[2], row[3] or "")
+            for row in rows
+        ]
+
+    def iter_histories(self) -> Iterator[tuple[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, historia_clinica FROM patients ORDER BY rowid"
+            ).fetchall()
+        for patient_id, history in rows:
+            yield patient_id, json.loads(history)
+
+    def odontogram_rows(
+        self,
+    ) -> list[tuple[str, str, str, str, str]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, estudiante_email, status, fecha_registro, json_extract(historia_clinica, '$.odontograma.codigo') FROM patients ORDER BY rowid"
+            ).fetchall()
+        return [tuple(row) for row in rows]  # type: ignore[misc]
+
+    def next_patient_id(self) -> str:
+        with self._lock:
+            while True:
+                cursor = self._connection.execute(
+                    "INSERT INTO patient_ids DEFAULT VALUES"
+                )
+                patient_id = f"p{cursor.lastrowid}"
+                if (
+                    self._connection.execute(
+                        "SELECT 1 FROM patients WHERE id = ?",
+                        (patient_id,),
+                    ).fetchone()
+                    is None
+                ):
+                    return patient_id
+
+    def add(self, patient: Patient):
+        placeholders = ", ".join("?" * len(PATIENT_COLUMNS))
+        with self._lock:
+            self._connection.execute(
+                f"INSERT INTO patients ({', '.join(PATIENT_COLUMNS)}) VALUES ({placeholders})",
+                _patient_to_row(patient),
+            )
+
+    def update_columns(
+        self, patient_id: str, values: dict[str, Any]
+    ):
+        columns = [
+            column
+            for column in values
+            if column in PATIENT_COLUMNS[1:]
+        ]
+        assignments = ", ".join(
+            f"{column} = ?" for column in columns
+        )
+        with self._lock:
+            self._connection.execute(
+                f"UPDATE patients SET {assignments} WHERE id = ?",
+                (
+                    *(values[column] for column in columns),
+                    patient_id,
+                ),
+            )
+
+    def apply_history_patch(
+        self,
+        patient_id: str,
+        patches: list[tuple[list[str], Any]],
+    ):
+        arguments = ", ".join("?, json(?)" for _ in patches)
+        params: list[Any] = []
+        for field_path, value in patches:
+            params.append(_json_path(field_path))
+            params.append(
+                json.dumps(value, ensure_ascii=False)
+            )
+        with self._lock:
+            self._connection.execute(
+                f"UPDATE patients SET historia_clinica = json_set(historia_clinica, {arguments}) WHERE id = ?",
+                (*params, patient_id),
+            )
+
+    def append_history_item(
+        self,
+        patient_id: str,
+        field_path: list[str],
+        item: Any,
+    ):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE patients SET historia_clinica = json_insert(historia_clinica, ?, json(?)) WHERE id = ?",
+                (
+                    _json_path(field_path) + "[#]",
+                    json.dumps(item, ensure_ascii=False),
+                    patient_id,
+                ),
+            )
+
+    def remove_history_item(
+        self,
+        patient_id: str,
+        field_path: list[str],
+        index: int,
+    ):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE patients SET historia_clinica = json_remove(historia_clinica, ?) WHERE id = ?",
+                (
+                    f"{_json_path(field_path)}[{index}]",
+                    patient_id,
+                ),
+            )
+
+    def change_head(self, patient_id: str) -> int:
+        with self._lock:
+            return (
+                self._connection.execute(
+                    "SELECT MAX(seq) FROM history_changes WHERE patient_id = ?",
+                    (patient_id,),
+                ).fetchone()[0]
+                or 0
+            )
+
+    def append_changes(
+        self,
+        patient_id: str,
+        changes: list[HistoryChange],
+    ):
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO history_changes (patient_id, seq, operation, field_path, old_value, new_value, changed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        patient_id,
+                        change["seq"],
+                        change["operation"],
+                        json.dumps(change["field_path"]),
+                        json.dumps(
+                            change["old_value"],
+                            ensure_ascii=False,
+                        ),
+                        json.dumps(
+                            change["new_value"],
+                            ensure_ascii=False,
+                        ),
+                        change["changed_at"],
+                    )
+                    for change in changes
+                ],
+            )
+
+    def add_checkpoint(
+        self, patient_id: str, seq: int, history: Any
+    ):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO history_checkpoints (patient_id, seq, historia_clinica) VALUES (?, ?, ?)",
+                (
+                    patient_id,
+                    seq,
+                    json.dumps(history, ensure_ascii=False),
+                ),
+            )
+
+    def checkpoint_at(
+        self, patient_id: str, seq: int
+    ) -> Optional[tuple[int, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT seq, historia_clinica FROM history_checkpoints WHERE patient_id = ? AND seq <= ? ORDER BY seq DESC LIMIT 1",
+                (patient_id, seq),
+            ).fetchone()
+        return (
+            (row[0], json.loads(row[1]))
+            if row is not None
+            else None
+        )
+
+    def changes_between(
+        self, patient_id: str, after: int, until: int
+    ) -> list[HistoryChange]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM history_changes WHERE patient_id = ? AND seq > ? AND seq <= ? ORDER BY seq",
+                (patient_id, after, until),
+            ).fetchall()
+        return [_row_to_change(row) for row in rows]
+
+    def changes_since_review(
+        self, patient_id: str
+    ) -> list[HistoryChange]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM history_changes WHERE patient_id = ? AND operation != 'status' AND seq > (SELECT MAX(seq) FROM history_changes WHERE patient_id = ? AND operation = 'status' AND json_extract(new_value, '$') IN (SELECT value FROM json_each(?))) ORDER BY seq",
+                (
+                    patient_id,
+                    patient_id,
+                    json.dumps(REVIEW_STATUSES),
+                ),
+            ).fetchall()
+        return [_row_to_change(row) for row in rows]
+
+    def delete(self, patient_id: str):
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM patients WHERE id = ?",
+                (patient_id,),
+            )
+            self._connection.execute(
+                "DELETE FROM history_changes WHERE patient_id = ?",
+                (patient_id,),
+            )
+            self._connection.execute(
+                "DELETE FROM history_checkpoints WHERE patient_id = ?",
+                (patient_id,),
+            )
+
+    def seed(self, patients: list[Patient]):
+        with self._lock:
+            if self.count() == 0:
+                for patient in patients:
+                    self.add(patient)
\ No newline at end of file
@@ -0,0 +1,132 @@
+import reflex as rx
+import datetime
+from app.states.auth_state import AuthState
+from app.states.blob_store import get_blob_store
+from app.states.clinic_state import ClinicState
+from app.states.clinic_store import get_clinic_store
+from app.states.history_validation import (
+    SECTION_TITLES,
+    invalid_sections,
+)
+from app.states.models import ReviewChange
+from app.states.signatures import professor_signature_svg
+
+
+class ReviewState(ClinicState):
+    show_reject_dialog: bool = False
+    reject_observation: str = ""
+
+    @rx.var(deps=["history_key"])
+    def invalid_section_bits(self) -> int:
+        patient_id = self._route_patient_id()
+        return (
+            get_clinic_store().validation_bitmap(patient_id)
+            if patient_id
+            else 0
+        )
+
+    @rx.var(deps=["header_key", "history_key"])
+    def is_history_form_invalid(self) -> bool:
+        return (
+            not self.has_patient
+            or self.invalid_section_bits != 0
+        )
+
+    @rx.var(deps=["header_key"])
+    def review_changes(self) -> list[ReviewChange]:
+        patient_id = self._route_patient_id()
+        if (
+            not patient_id
+            or self.safe_status != "Pendiente"
+        ):
+            return []
+        return get_clinic_store().review_changes(patient_id)
+
+    @rx.event
+    def toggle_reject_dialog(self):
+        self.show_reject_dialog = (
+            not self.show_reject_dialog
+        )
+        if not self.show_reject_dialog:
+            self.reject_observation = ""
+
+    @rx.event
+    def set_reject_observation(self, observation: str):
+        self.reject_observation = observation
+
+    @rx.event
+    def submit_for_review(self):
+        patient_id = self._route_patient_id()
+        bitmap = (
+            get_clinic_store().validation_bitmap(patient_id)
+            if patient_id
+            else 0
+        )
+        if bitmap:
+            return rx.toast.error(
+                "Revise las secciones: "
+                + ", ".join(
+                    SECTION_TITLES[section]
+                    for section in invalid_sections(bitmap)
+                )
+            )
+        if self._update_patient_columns(
+            patient_id,
+            {
+                "status": "Pendiente",
+                "observaciones_rechazo": None,
+            },
+        ):
+            return rx.toast.info(
+                "Historia clínica enviada para revisión."
+            )
+
+    @rx.event
+    async def approve_history(self):
+        patient_id = self._route_patient_id()
+        patient = self._get_patient(patient_id)
+        if patient is None:
+            return
+        auth_state = await self.get_state(AuthState)
+        signed_at = datetime.datetime.now().strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        if self._update_patient_columns(
+            patient_id,
+            {
+                "status": "Aprobado",
+                "firma_profesor_url": get_blob_store().put(
+                    professor_signature_svg(
+                        patient,
+                        auth_state.current_user_name,
+                        auth_state.current_user_email,
+                        signed_at,
+                    ),
+                    "image/svg+xml",
+                ),
+                "fecha_firma_profesor": signed_at,
+            },
+        ):
+            return rx.toast.success(
+                "Historia clínica aprobada y firmada."
+            )
+
+    @rx.event
+    def reject_history(self):
+        patient_id = self._route_patient_id()
+        if not self.reject_observation:
+            return rx.toast.error(
+                "Las observaciones son requeridas para rechazar."
+            )
+        if self._update_patient_columns(
+            patient_id,
+            {
+                "status": "Rechazado",
+                "observaciones_rechazo": self.reject_observation,
+            },
+        ):
+            self.reject_observation = ""
+            self.show_reject_dialog = False
+            return rx.toast.warning(
+                "Historia clínica rechazada con observaciones."
+            )
\ No newline at end of file
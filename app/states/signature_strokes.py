@@ -0,0 +1,185 @@
+import base64
+import functools
+import math
+
+STROKE_PREFIX = "s1."
+STROKE_MAX_LENGTH = 16 * 1024
+STROKE_TOLERANCE = 1.0
+
+Point = tuple[int, int]
+
+
+def is_stroke_code(value: object) -> bool:
+    return isinstance(value, str) and value.startswith(
+        STROKE_PREFIX
+    )
+
+
+def _write_varint(output: bytearray, value: int):
+    while value > 0x7F:
+        output.append(value & 0x7F | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def _read_varints(data: bytes):
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        yield value
+        value = shift = 0
+    if shift:
+        raise ValueError("Firma truncada")
+
+
+def encode_strokes(
+    width: int, height: int, strokes: list[list[Point]]
+) -> str:
+    output = bytearray()
+    _write_varint(output, width)
+    _write_varint(output, height)
+    _write_varint(output, len(strokes))
+    previous_x = previous_y = 0
+    for stroke in strokes:
+        _write_varint(output, len(stroke))
+        for x, y in stroke:
+            for delta in (x - previous_x, y - previous_y):
+                _write_varint(
+                    output,
+                    (
+                        delta << 1
+                        if delta >= 0
+                        else ~delta << 1 | 1
+                    ),
+                )
+            previous_x, previous_y = x, y
+    return STROKE_PREFIX + base64.urlsafe_b64encode(
+        bytes(output)
+    ).decode("ascii").rstrip("=")
+
+
+@functools.lru_cache(maxsize=256)
+def decode_strokes(
+    code: str,
+) -> tuple[int, int, tuple[tuple[Point, ...], ...]]:
+    if not is_stroke_code(code) or (
+        len(code) > STROKE_MAX_LENGTH
+    ):
+        raise ValueError("Firma inválida")
+    payload = code[len(STROKE_PREFIX) :]
+    try:
+        data = base64.urlsafe_b64decode(
+            payload + "=" * (-len(payload) % 4)
+        )
+    except ValueError as error:
+        raise ValueError("Firma inválida") from error
+    values = _read_varints(data)
+    try:
+        width, height, stroke_count = (
+            next(values),
+            next(values),
+            next(values),
+        )
+        strokes = []
+        x = y = 0
+        for _ in range(stroke_count):
+            stroke = []
+            for _ in range(next(values)):
+                for axis in range(2):
+                    value = next(values)
+                    delta = (
+                        ~(value >> 1)
+                        if value & 1
+                        else value >> 1
+                    )
+                    if axis:
+                        y += delta
+                    else:
+                        x += delta
+                stroke.append((x, y))
+            strokes.append(tuple(stroke))
+    except StopIteration as error:
+        raise ValueError("Firma truncada") from error
+    if next(values, None) is not None:
+        raise ValueError("Firma inválida")
+    if not width or not height:
+        raise ValueError("Firma sin dimensiones")
+    return width, height, tuple(strokes)
+
+
+def _distance_to_segment(
+    point: Point, start: Point, end: Point
+) -> float:
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    if dx == dy == 0:
+        return math.dist(point, start)
+    return abs(
+        dx * (start[1] - point[1])
+        - dy * (start[0] - point[0])
+    ) / math.hypot(dx, dy)
+
+
+def simplify(
+    points: tuple[Point, ...],
+    tolerance: float = STROKE_TOLERANCE,
+) -> tuple[Point, ...]:
+    if len(points) < 3:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    ranges = [(0, len(points) - 1)]
+    while ranges:
+        first, last = ranges.pop()
+        farthest, distance = first, 0.0
+        for index in range(first + 1, last):
+            candidate = _distance_to_segment(
+                points[index], points[first], points[last]
+            )
+            if candidate > distance:
+                farthest, distance = index, candidate
+        if distance > tolerance:
+            keep[farthest] = True
+            ranges.append((first, farthest))
+            ranges.append((farthest, last))
+    return tuple(
+        point for point, kept in zip(points, keep) if kept
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def simplified_strokes(
+    code: str,
+) -> tuple[int, int, tuple[tuple[Point, ...], ...]]:
+    width, height, strokes = decode_strokes(code)
+    return (
+        width,
+        height,
+        tuple(simplify(stroke) for stroke in strokes),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def signature_svg(code: str) -> str:
+    width, height, strokes = simplified_strokes(code)
+    paths = " ".join(
+        "M"
+        + " L".join(f"{x} {y}" for x, y in stroke)
+        + (" l0 0" if len(stroke) == 1 else "")
+        for stroke in strokes
+        if stroke
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="{width}" height="{height}"><path d="{paths}" fill="none" '
+        'stroke="#111827" stroke-width="2.5" stroke-linecap="round" '
+        'stroke-linejoin="round"/></svg>'
+    )
+
+
+def signature_data_url(code: str) -> str:
+    return "data:image/svg+xml;base64," + base64.b64encode(
+        signature_svg(code).encode()
+    ).decode("ascii")
\ No newline at end of file
@@ -0,0 +1,39 @@
+import hashlib
+import html
+import json
+from app.states.models import Patient
+
+SIGNATURE_WIDTH = 360
+SIGNATURE_HEIGHT = 120
+
+
+def history_fingerprint(patient: Patient) -> str:
+    return hashlib.sha256(
+        json.dumps(
+            patient["historia_clinica"],
+            sort_keys=True,
+            ensure_ascii=False,
+        ).encode()
+    ).hexdigest()[:16]
+
+
+def professor_signature_svg(
+    patient: Patient,
+    nombre: str,
+    email: str,
+    signed_at: str,
+) -> bytes:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SIGNATURE_WIDTH}" '
+        f'height="{SIGNATURE_HEIGHT}" viewBox="0 0 {SIGNATURE_WIDTH} {SIGNATURE_HEIGHT}">'
+        f'<rect x="1" y="1" width="{SIGNATURE_WIDTH - 2}" height="{SIGNATURE_HEIGHT - 2}" '
+        'rx="8" fill="#fff" stroke="#15803d" stroke-width="2"/>'
+        '<text x="16" y="48" font-family="Brush Script MT, Segoe Script, cursive" '
+        f'font-size="30" fill="#1e3a8a">{html.escape(nombre)}</text>'
+        '<line x1="16" y1="60" x2="344" y2="60" stroke="#1e3a8a" stroke-width="1"/>'
+        '<text x="16" y="80" font-family="Arial, sans-serif" font-size="11" fill="#374151">'
+        f"{html.escape(email)} · {html.escape(signed_at)}</text>"
+        '<text x="16" y="98" font-family="Arial, sans-serif" font-size="10" fill="#6b7280">'
+        f"Historia {html.escape(patient['id'])} · Huella {history_fingerprint(patient)}</text>"
+        "</svg>"
+    ).encode()
\ No newline at end of file
@@ -0,0 +1,49 @@
+window.odontotessHistoryPatch = (() => {
+  const FLUSH_BUTTON_ID = "history-patch-flush";
+  const IDLE_FLUSH_MS = 2000;
+  const pending = new Map();
+  let idleTimer = null;
+
+  const flush = () => {
+    if (pending.size > 0) {
+      document.getElementById(FLUSH_BUTTON_ID)?.click();
+    }
+  };
+
+  const put = (patientId, fieldPath, value) => {
+    if (!pending.has(patientId)) {
+      pending.set(patientId, new Map());
+    }
+    pending.get(patientId).set(fieldPath.join("."), [fieldPath, value]);
+  };
+
+  return {
+    set(patientId, fieldPath, value) {
+      if (!patientId) {
+        return;
+      }
+      put(patientId, fieldPath, value);
+      clearTimeout(idleTimer);
+      idleTimer = setTimeout(flush, IDLE_FLUSH_MS);
+    },
+    drain(patientId) {
+      clearTimeout(idleTimer);
+      idleTimer = null;
+      const patches = Array.from(pending.get(patientId)?.values() ?? []);
+      pending.delete(patientId);
+      return { patient_id: patientId, patches };
+    },
+    restore(patientId, patches) {
+      for (const [fieldPath, value] of patches) {
+        if (!pending.get(patientId)?.has(fieldPath.join("."))) {
+          put(patientId, fieldPath, value);
+        }
+      }
+    },
+    flush,
+  };
+})();
+
+window.addEventListener("beforeunload", () =>
+  window.odontotessHistoryPatch.flush()
+);
@@ -0,0 +1,165 @@
+window.odontotessSignaturePad = (() => {
+  const PREFIX = "s1.";
+  const MIN_DISTANCE = 2;
+  const pads = new Map();
+
+  const writeVarint = (bytes, value) => {
+    while (value > 0x7f) {
+      bytes.push((value & 0x7f) | 0x80);
+      value >>>= 7;
+    }
+    bytes.push(value);
+  };
+
+  const encode = (width, height, strokes) => {
+    const bytes = [];
+    writeVarint(bytes, width);
+    writeVarint(bytes, height);
+    writeVarint(bytes, strokes.length);
+    let previousX = 0;
+    let previousY = 0;
+    for (const stroke of strokes) {
+      writeVarint(bytes, stroke.length);
+      for (const [x, y] of stroke) {
+        for (const delta of [x - previousX, y - previousY]) {
+          writeVarint(bytes, delta >= 0 ? delta << 1 : (~delta << 1) | 1);
+        }
+        previousX = x;
+        previousY = y;
+      }
+    }
+    return (
+      PREFIX +
+      btoa(String.fromCharCode(...bytes))
+        .replace(/\+/g, "-")
+        .replace(/\//g, "_")
+        .replace(/=+$/, "")
+    );
+  };
+
+  const decode = (code) => {
+    if (!code || !code.startsWith(PREFIX)) {
+      return [];
+    }
+    const binary = atob(
+      code.slice(PREFIX.length).replace(/-/g, "+").replace(/_/g, "/")
+    );
+    const values = [];
+    let value = 0;
+    let shift = 0;
+    for (let index = 0; index < binary.length; index++) {
+      const byte = binary.charCodeAt(index);
+      value |= (byte & 0x7f) << shift;
+      if (byte & 0x80) {
+        shift += 7;
+      } else {
+        values.push(value);
+        value = 0;
+        shift = 0;
+      }
+    }
+    const strokes = [];
+    let cursor = 3;
+    let x = 0;
+    let y = 0;
+    for (let stroke = 0; stroke < values[2]; stroke++) {
+      const points = [];
+      for (let point = values[cursor++]; point > 0; point--) {
+        const dx = values[cursor++];
+        const dy = values[cursor++];
+        x += dx & 1 ? ~(dx >>> 1) : dx >>> 1;
+        y += dy & 1 ? ~(dy >>> 1) : dy >>> 1;
+        points.push([x, y]);
+      }
+      strokes.push(points);
+    }
+    return strokes;
+  };
+
+  const redraw = (canvas, strokes) => {
+    const context = canvas.getContext("2d");
+    context.clearRect(0, 0, canvas.width, canvas.height);
+    context.lineWidth = 2.5;
+    context.lineCap = "round";
+    context.lineJoin = "round";
+    context.strokeStyle = "#111827";
+    for (const stroke of strokes) {
+      context.beginPath();
+      stroke.forEach(([x, y], index) =>
+        index ? context.lineTo(x, y) : context.moveTo(x, y)
+      );
+      if (stroke.length === 1) {
+        context.lineTo(stroke[0][0], stroke[0][1]);
+      }
+      context.stroke();
+    }
+  };
+
+  const position = (canvas, event) => {
+    const bounds = canvas.getBoundingClientRect();
+    const clamp = (value, limit) =>
+      Math.min(Math.max(Math.round(value), 0), limit);
+    return [
+      clamp(((event.clientX - bounds.left) * canvas.width) / bounds.width, canvas.width),
+      clamp(((event.clientY - bounds.top) * canvas.height) / bounds.height, canvas.height),
+    ];
+  };
+
+  const mount = (id, code) => {
+    const canvas = document.getElementById(id);
+    if (!canvas) {
+      return;
+    }
+    const pad = { strokes: decode(code), current: null };
+    pads.set(id, pad);
+    redraw(canvas, pad.strokes);
+    if (canvas.dataset.signaturePad) {
+      return;
+    }
+    canvas.dataset.signaturePad = "true";
+    canvas.addEventListener("pointerdown", (event) => {
+      const active = pads.get(id);
+      canvas.setPointerCapture(event.pointerId);
+      active.current = [position(canvas, event)];
+      active.strokes.push(active.current);
+    });
+    canvas.addEventListener("pointermove", (event) => {
+      const active = pads.get(id);
+      if (!active.current) {
+        return;
+      }
+      const [x, y] = position(canvas, event);
+      const [lastX, lastY] = active.current[active.current.length - 1];
+      if (Math.hypot(x - lastX, y - lastY) >= MIN_DISTANCE) {
+        active.current.push([x, y]);
+        redraw(canvas, active.strokes);
+      }
+    });
+    const finish = () => {
+      pads.get(id).current = null;
+    };
+    canvas.addEventListener("pointerup", finish);
+    canvas.addEventListener("pointercancel", finish);
+  };
+
+  return {
+    mount,
+    encode(id) {
+      const canvas = document.getElementById(id);
+      const pad = pads.get(id);
+      if (!canvas || !pad || pad.strokes.length === 0) {
+        return "";
+      }
+      return encode(canvas.width, canvas.height, pad.strokes);
+    },
+    clear(id) {
+      const canvas = document.getElementById(id);
+      const pad = pads.get(id);
+      if (canvas && pad) {
+        pad.strokes = [];
+        pad.current = null;
+        redraw(canvas, pad.strokes);
+      }
+    },
+  };
+})();
\ No newline at end of file
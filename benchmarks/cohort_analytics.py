@@ -0,0 +1,63 @@
+import argparse
+import time
+from fixtures import populate_store, run_isolated
+
+PATIENT_COUNTS = (1000, 10000, 50000)
+REPETITIONS = 20
+FILTERS = (
+    {},
+    {"estudiante_email": "alumno7@odontotess.com"},
+    {"status": "Pendiente"},
+    {"date_from": "2023-06-01", "date_to": "2024-06-01"},
+)
+
+
+def run(patient_count: int):
+    from app.states.clinic_store import get_clinic_store
+    from app.states.odontogram_analytics import (
+        finding_rates,
+        missing_rates,
+        unpack_codes,
+    )
+
+    populate_store(patient_count)
+    store = get_clinic_store()
+    started = time.perf_counter()
+    store.odontogram_codes()
+    build_seconds = time.perf_counter() - started
+    for filters in FILTERS:
+        started = time.perf_counter()
+        for _ in range(REPETITIONS):
+            codes = store.odontogram_codes(**filters)
+            findings, missing = unpack_codes(codes)
+            finding_rates(findings)
+            missing_rates(missing)
+        elapsed = (
+            time.perf_counter() - started
+        ) / REPETITIONS
+        print(
+            f"{patient_count:>6} patients, "
+            f"{str(filters or 'sin filtro'):>55}: "
+            f"{len(codes):>6} rows, {elapsed * 1000:7.2f} ms"
+        )
+    print(
+        f"{patient_count:>6} patients: cohort built in "
+        f"{build_seconds * 1000:.0f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patients", type=int)
+    args = parser.parse_args()
+    if args.patients:
+        run(args.patients)
+        return
+    for patient_count in PATIENT_COUNTS:
+        run_isolated(
+            __file__, "--patients", str(patient_count)
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
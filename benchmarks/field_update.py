@@ -0,0 +1,164 @@
+import argparse
+import copy
+import json
+import time
+from fixtures import (
+    build_patients,
+    new_session,
+    populate_store,
+    run_isolated,
+    session_state,
+)
+
+PATIENT_COUNTS = (10, 100, 1000, 10000)
+EVENTS = 500
+BASELINE_EVENTS = {10: 500, 100: 500, 1000: 60, 10000: 6}
+
+
+def run(patient_count: int, events: int):
+    from app.states.history_editor_state import (
+        HistoryEditorState,
+    )
+    from app.states.odontogram_state import (
+        OdontogramState,
+    )
+
+    patient_ids = populate_store(patient_count)
+    root = new_session(patient_ids[len(patient_ids) // 2])
+    editor_state = session_state(root, HistoryEditorState)
+    odontogram_state = session_state(root, OdontogramState)
+    root.get_delta()
+    root._clean()
+    handlers = [
+        lambda i: HistoryEditorState.update_history_field_str.fn(
+            editor_state,
+            ["padecimiento_actual", "motivo_consulta"],
+            f"Dolor {i}",
+        ),
+        lambda i: OdontogramState.update_tooth_surface.fn(
+            odontogram_state, "11", "oclusal"
+        ),
+        lambda i: OdontogramState.toggle_tooth_missing.fn(
+            odontogram_state, "48"
+        ),
+    ]
+    odontogram_state.odontogram_tool = "Caries"
+    total_seconds = 0.0
+    delta_bytes = 0
+    for i in range(events):
+        started = time.perf_counter()
+        handlers[i % len(handlers)](i)
+        delta = root.get_delta()
+        root._clean()
+        total_seconds += time.perf_counter() - started
+        delta_bytes += len(json.dumps(delta, default=str))
+    report(
+        "store",
+        patient_count,
+        total_seconds,
+        delta_bytes,
+        events,
+    )
+
+
+def run_baseline(patient_count: int, events: int):
+    patients = build_patients(patient_count)
+    for index, patient in enumerate(patients):
+        patient["id"] = f"p{index + 1}"
+    target = patient_count // 2
+
+    def set_field(history: dict, i: int):
+        history["padecimiento_actual"][
+            "motivo_consulta"
+        ] = f"Dolor {i}"
+
+    def toggle_surface(history: dict, i: int):
+        surfaces = (
+            history["odontograma"]
+            .setdefault("teeth", {})
+            .setdefault("11", {})
+            .setdefault("surfaces", {})
+        )
+        surfaces["oclusal"] = (
+            ""
+            if surfaces.get("oclusal") == "Caries"
+            else "Caries"
+        )
+
+    def toggle_missing(history: dict, i: int):
+        tooth = (
+            history["odontograma"]
+            .setdefault("teeth", {})
+            .setdefault("48", {})
+        )
+        tooth["missing"] = not tooth.get("missing", False)
+
+    handlers = [set_field, toggle_surface, toggle_missing]
+    total_seconds = 0.0
+    delta_bytes = 0
+    for i in range(events):
+        started = time.perf_counter()
+        patients = copy.deepcopy(patients)
+        handlers[i % len(handlers)](
+            patients[target]["historia_clinica"], i
+        )
+        delta = json.dumps({"patients": patients})
+        total_seconds += time.perf_counter() - started
+        delta_bytes += len(delta)
+    report(
+        "deepcopy",
+        patient_count,
+        total_seconds,
+        delta_bytes,
+        events,
+    )
+
+
+def report(
+    mode: str,
+    patient_count: int,
+    total_seconds: float,
+    delta_bytes: int,
+    events: int,
+):
+    print(
+        f"{mode:>8} {patient_count:>6} patients: "
+        f"{total_seconds / events * 1e6:10.1f} us/event, "
+        f"{delta_bytes / events:10.0f} delta bytes/event"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patients", type=int)
+    parser.add_argument(
+        "--events", type=int, default=EVENTS
+    )
+    parser.add_argument("--baseline", action="store_true")
+    args = parser.parse_args()
+    if args.patients:
+        (run_baseline if args.baseline else run)(
+            args.patients, args.events
+        )
+        return
+    for patient_count in PATIENT_COUNTS:
+        for mode in ((), ("--baseline",)):
+            run_isolated(
+                __file__,
+                "--patients",
+                str(patient_count),
+                "--events",
+                str(
+                    args.events
+                    if not mode
+                    else min(
+                        args.events,
+                        BASELINE_EVENTS[patient_count],
+                    )
+                ),
+                *mode,
+            )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
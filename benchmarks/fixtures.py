@@ -0,0 +1,166 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+
+
+def rss_mib() -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def max_loop_lag(work) -> tuple[float, float]:
+    lags = []
+    running = True
+
+    async def probe():
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(
+                time.perf_counter() - started - 0.001
+            )
+
+    task = asyncio.create_task(probe())
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    running = False
+    await task
+    return elapsed, max(lags)
+
+
+def run_isolated(script: str, *args: str):
+    with tempfile.TemporaryDirectory() as directory:
+        subprocess.run(
+            [sys.executable, script, *args],
+            env={
+                **os.environ,
+                "ODONTOTESS_DB_PATH": os.path.join(
+                    directory, "bench.db"
+                ),
+                "PYTHONPATH": ROOT,
+            },
+            check=True,
+        )
+
+
+def build_patients(count: int) -> list:
+    from app.states.models import create_empty_history
+    from app.states.odontogram_codec import encode_teeth
+
+    patients = []
+    for i in range(count):
+        history = create_empty_history()
+        history["datos_generales"].update(
+            {
+                "nombre_completo": f"Paciente {i}",
+                "edad": "40",
+                "direccion": "Calle Falsa 123, Colonia Centro",
+            }
+        )
+        history["padecimiento_actual"].update(
+            {
+                "motivo_consulta": "Dolor al masticar " * 8,
+                "descripcion_problema": "Sensibilidad "
+                * 20,
+            }
+        )
+        history["odontograma"]["codigo"] = encode_teeth(
+            {
+                str(tooth): {
+                    "surfaces": {"oclusal": "Caries"}
+                }
+                for tooth in range(11, 19)
+            }
+        )
+        history["seguimiento"] = [
+            {
+                "fecha_hora": "2024-01-01 10:00",
+                "procedimiento_signos_vitales": "TA 120/80 "
+                * 5,
+                "observaciones": "Sin complicaciones " * 5,
+            }
+            for _ in range(5)
+        ]
+        patients.append(
+            {
+                "id": "",
+                "nombre": f"Paciente {i}",
+                "edad": 40,
+                "fecha_registro": "2024-01-01",
+                "status": "Pendiente",
+                "estudiante_email": f"alumno{i % 50}@odontotess.com",
+                "historia_clinica": history,
+                "firma_paciente_url": None,
+                "firma_profesor_url": None,
+                "fecha_firma_profesor": None,
+                "observaciones_rechazo": None,
+            }
+        )
+    return patients
+
+
+def populate_store(count: int) -> list[str]:
+    warnings.filterwarnings("ignore")
+    from app.states.clinic_store import get_clinic_store
+
+    store = get_clinic_store()
+    patient_ids = []
+    for patient in build_patients(count):
+        patient["id"] = store.next_patient_id()
+        store.add(patient)
+        patient_ids.append(patient["id"])
+    return patient_ids
+
+
+def session_state(root, state_class):
+    return root.get_substate(
+        state_class.get_full_name().split(".")[1:]
+    )
+
+
+def warm(state, *var_names: str):
+    for var_name in var_names:
+        getattr(state, var_name)
+
+
+def new_session(patient_id: str):
+    from reflex.istate.data import RouterData
+    from reflex.state import State
+    from app.states.clinic_state import ClinicState
+    from app.states.dashboard_state import DashboardState
+    from app.states.odontogram_state import (
+        OdontogramState,
+    )
+
+    root = State(_reflex_internal_init=True)
+    root.router = RouterData.from_router_data(
+        {
+            "pathname": "/history/[patient_id]",
+            "asPath": f"/history/{patient_id}",
+            "query": {"patient_id": patient_id},
+        }
+    )
+    clinic_state = session_state(root, ClinicState)
+    ClinicState.sync_store.fn(clinic_state)
+    warm(clinic_state, "has_patient", "patient_history")
+    OdontogramState.load_odontogram.fn(
+        session_state(root, OdontogramState)
+    )
+    warm(
+        session_state(root, DashboardState),
+        "professor_patients",
+    )
+    return root
\ No newline at end of file
@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import io
+import os
+import tracemalloc
+import zipfile
+from fixtures import (
+    max_loop_lag,
+    populate_store,
+    run_isolated,
+)
+
+PATIENT_COUNTS = (24, 96)
+WORKER_COUNTS = (1, 2)
+
+
+def run(patient_count: int, workers: int):
+    from app.states.clinic_store import get_clinic_store
+    from app.states.history_archive import HistoryArchive
+    from app.states.history_pdf import (
+        HistoryPdfRenderer,
+        render_history_pdf,
+    )
+
+    patient_ids = populate_store(patient_count)
+    store = get_clinic_store()
+
+    async def in_memory():
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for patient in store.get_many(patient_ids):
+                archive.writestr(
+                    f"{patient['id']}.pdf",
+                    render_history_pdf(patient),
+                )
+
+    renderer = HistoryPdfRenderer(
+        workers=workers, capacity=0
+    )
+    for warmup in [
+        renderer.submit(patient, 0)
+        for patient in store.get_many(patient_ids[:workers])
+    ]:
+        warmup.result()
+    archives = []
+
+    async def streamed():
+        archive = HistoryArchive(patient_ids)
+        archives.append(archive.path)
+        async for _ in archive.write(store, renderer):
+            pass
+
+    for label, work in (
+        ("one by one in memory", in_memory),
+        (f"{workers} workers streamed", streamed),
+    ):
+        elapsed, lag = asyncio.run(max_loop_lag(work))
+        tracemalloc.start()
+        asyncio.run(work())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{patient_count:>3} histories, {label:>20}: "
+            f"{patient_count / elapsed:6.1f} PDF/s, "
+            f"max loop lag {lag * 1000:7.1f} ms, "
+            f"peak {peak / 2**20:5.1f} MiB"
+        )
+    renderer.shutdown()
+    print(
+        f"archive {os.path.getsize(archives[0]) / 2**20:.1f} MiB"
+    )
+    for path in archives:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patients", type=int)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+    if args.patients:
+        run(args.patients, args.workers)
+        return
+    for patient_count in PATIENT_COUNTS:
+        for workers in WORKER_COUNTS:
+            run_isolated(
+                __file__,
+                "--patients",
+                str(patient_count),
+                "--workers",
+                str(workers),
+            )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
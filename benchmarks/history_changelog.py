@@ -0,0 +1,76 @@
+import argparse
+import json
+import random
+import time
+from fixtures import populate_store, run_isolated
+
+CHANGE_COUNTS = (1000, 10000, 50000)
+RECONSTRUCTIONS = 200
+
+
+def run(change_count: int):
+    from app.states.clinic_store import get_clinic_store
+
+    store = get_clinic_store()
+    patient_id = populate_store(1)[0]
+    started = time.perf_counter()
+    for i in range(change_count):
+        store.apply_history_patch(
+            patient_id,
+            [
+                (
+                    [
+                        "padecimiento_actual",
+                        "motivo_consulta",
+                    ],
+                    f"Dolor {i}",
+                )
+            ],
+        )
+    write_seconds = time.perf_counter() - started
+    connection = store._repository._connection
+    log_bytes = connection.execute(
+        "SELECT SUM(LENGTH(field_path) + LENGTH(old_value) + LENGTH(new_value)) FROM history_changes"
+    ).fetchone()[0]
+    checkpoint_bytes = connection.execute(
+        "SELECT SUM(LENGTH(historia_clinica)) FROM history_checkpoints"
+    ).fetchone()[0]
+    snapshot_bytes = change_count * len(
+        json.dumps(
+            store.get(patient_id)["historia_clinica"],
+            ensure_ascii=False,
+        )
+    )
+    versions = random.Random(0).choices(
+        range(change_count), k=RECONSTRUCTIONS
+    )
+    started = time.perf_counter()
+    for version in versions:
+        store.history_at(patient_id, version)
+    read_seconds = (
+        time.perf_counter() - started
+    ) / RECONSTRUCTIONS
+    print(
+        f"{change_count:>6} changes: "
+        f"{write_seconds / change_count * 1e6:7.1f} us/write, "
+        f"{read_seconds * 1000:6.2f} ms/version, "
+        f"log {(log_bytes + checkpoint_bytes) / 1024:8.0f} KiB "
+        f"vs snapshots {snapshot_bytes / 1024:8.0f} KiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--changes", type=int)
+    args = parser.parse_args()
+    if args.changes:
+        run(args.changes)
+        return
+    for change_count in CHANGE_COUNTS:
+        run_isolated(
+            __file__, "--changes", str(change_count)
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,48 @@
+import argparse
+import time
+from fixtures import build_patients, run_isolated
+
+NOTE_COUNTS = (10, 100, 1000, 10000)
+REPETITIONS = 5
+
+
+def run():
+    from app.states.history_export import (
+        iter_history_html,
+    )
+
+    for note_count in NOTE_COUNTS:
+        (patient,) = build_patients(1)
+        patient["historia_clinica"]["seguimiento"] = (
+            patient["historia_clinica"]["seguimiento"]
+            * (note_count // 5)
+        )
+        first_chunk = total = 0.0
+        for _ in range(REPETITIONS):
+            started = time.perf_counter()
+            chunks = iter_history_html(patient)
+            size = len(next(chunks))
+            first_chunk += time.perf_counter() - started
+            size += sum(len(chunk) for chunk in chunks)
+            total += time.perf_counter() - started
+        total /= REPETITIONS
+        print(
+            f"{note_count:>6} notes: {total * 1000:8.2f} ms, "
+            f"{total / note_count * 1e6:6.2f} us/note, "
+            f"first chunk {first_chunk / REPETITIONS * 1000:5.2f} ms, "
+            f"{size / 1024:8.0f} KiB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--render", action="store_true")
+    args = parser.parse_args()
+    if args.render:
+        run()
+        return
+    run_isolated(__file__, "--render")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+import argparse
+import random
+import statistics
+import time
+from fixtures import build_patients, run_isolated
+
+PATIENT_COUNTS = (1000, 10000, 30000)
+QUERIES = (
+    "bruxismo",
+    "alergia penicilina",
+    "dolor al masticar",
+    "sensibilidad",
+    "férula nocturna",
+)
+DIAGNOSES = (
+    "Bruxismo nocturno con desgaste incisal",
+    "Gingivitis asociada a placa",
+    "Caries dental múltiple",
+    "Periodontitis crónica generalizada",
+    "Pulpitis irreversible",
+)
+ALLERGIES = (
+    "Alergia a la penicilina",
+    "Alérgico al látex",
+    "Niega alergias",
+    "Alergia a AINES",
+)
+REPETITIONS = 50
+
+
+def run(patient_count: int):
+    from app.states.clinic_store import get_clinic_store
+
+    store = get_clinic_store()
+    generator = random.Random(patient_count)
+    for patient in build_patients(patient_count):
+        history = patient["historia_clinica"]
+        history["diagnostico"]["clinico"] = (
+            generator.choice(DIAGNOSES)
+        )
+        history["antecedentes_personales_patologicos"][
+            "alergias"
+        ] = generator.choice(ALLERGIES)
+        patient["id"] = store.next_patient_id()
+        store.add(patient)
+    started = time.perf_counter()
+    store.search_histories("")
+    build_seconds = time.perf_counter() - started
+    for query in QUERIES:
+        timings = []
+        for _ in range(REPETITIONS):
+            started = time.perf_counter()
+            _, total = store.search_histories(query)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(
+            f"{patient_count:>6} histories, {query!r:>22}: "
+            f"{total:>6} hits, "
+            f"median {statistics.median(timings) * 1000:7.2f} ms, "
+            f"p95 {timings[int(len(timings) * 0.95)] * 1000:7.2f} ms"
+        )
+    print(
+        f"{patient_count:>6} histories: index built in "
+        f"{build_seconds:.2f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patients", type=int)
+    args = parser.parse_args()
+    if args.patients:
+        run(args.patients)
+        return
+    for patient_count in PATIENT_COUNTS:
+        run_isolated(
+            __file__, "--patients", str(patient_count)
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+import argparse
+import os
+import threading
+import time
+from fixtures import populate_store, run_isolated
+
+COMMIT_INTERVALS_MS = ("0", "2", "5", "20")
+SESSIONS = (1, 8, 32)
+EDITS = 400
+
+
+def run(commit_ms: str, sessions: int):
+    os.environ["ODONTOTESS_JOURNAL_COMMIT_MS"] = commit_ms
+    from app.states.clinic_store import get_clinic_store
+
+    patient_ids = populate_store(sessions)
+    store = get_clinic_store()
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def edit(patient_id: str):
+        session_latencies = []
+        for i in range(EDITS):
+            started = time.perf_counter()
+            store.apply_history_patch(
+                patient_id,
+                [
+                    (
+                        [
+                            "padecimiento_actual",
+                            "motivo_consulta",
+                        ],
+                        f"Dolor {i}",
+                    )
+                ],
+            )
+            session_latencies.append(
+                time.perf_counter() - started
+            )
+        with lock:
+            latencies.extend(session_latencies)
+
+    threads = [
+        threading.Thread(target=edit, args=(patient_id,))
+        for patient_id in patient_ids
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.flush()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(
+        f"commit {commit_ms:>2} ms, {sessions:>2} sessions: "
+        f"{len(latencies) / elapsed:8.0f} mutations/s, "
+        f"p50 {latencies[len(latencies) // 2] * 1000:6.2f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commit-ms")
+    parser.add_argument("--sessions", type=int)
+    args = parser.parse_args()
+    if args.commit_ms:
+        run(args.commit_ms, args.sessions)
+        return
+    for commit_ms in COMMIT_INTERVALS_MS:
+        for sessions in SESSIONS:
+            run_isolated(
+                __file__,
+                "--commit-ms",
+                commit_ms,
+                "--sessions",
+                str(sessions),
+            )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
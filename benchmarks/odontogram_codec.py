@@ -0,0 +1,96 @@
+import json
+import random
+import sys
+import time
+import tracemalloc
+from fixtures import ROOT
+
+sys.path.insert(0, ROOT)
+
+from app.states.odontogram_codec import (
+    FINDINGS,
+    SURFACES,
+    TEETH,
+    decode_teeth,
+    encode_teeth,
+)
+
+ODONTOGRAMS = 2000
+FILL_RATIOS = (0.1, 0.5, 1.0)
+
+
+def random_teeth(
+    generator: random.Random, fill: float
+) -> dict:
+    teeth = {}
+    for tooth in TEETH:
+        if generator.random() >= fill:
+            continue
+        surfaces = {
+            surface: generator.choice(FINDINGS[1:])
+            for surface in SURFACES
+            if generator.random() < 0.5
+        }
+        tooth_state: dict = {}
+        if surfaces:
+            tooth_state["surfaces"] = surfaces
+        if generator.random() < 0.1:
+            tooth_state["missing"] = True
+        if tooth_state:
+            teeth[tooth] = tooth_state
+    return teeth
+
+
+def retained_bytes(build) -> int:
+    tracemalloc.start()
+    values = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del values
+    return size
+
+
+def timed(function, values) -> float:
+    started = time.perf_counter()
+    for value in values:
+        function(value)
+    return (time.perf_counter() - started) / len(values)
+
+
+def run(fill: float):
+    generator = random.Random(fill)
+    dicts = [
+        random_teeth(generator, fill)
+        for _ in range(ODONTOGRAMS)
+    ]
+    codes = [encode_teeth(teeth) for teeth in dicts]
+    dict_json = [json.dumps(teeth) for teeth in dicts]
+    code_json = [json.dumps(code) for code in codes]
+    dict_memory = retained_bytes(
+        lambda: [json.loads(text) for text in dict_json]
+    )
+    code_memory = retained_bytes(
+        lambda: [json.loads(text) for text in code_json]
+    )
+    print(
+        f"fill {fill:>4.0%}: "
+        f"memory {dict_memory / ODONTOGRAMS:7.0f} -> "
+        f"{code_memory / ODONTOGRAMS:5.0f} B, "
+        f"json {sum(map(len, dict_json)) / ODONTOGRAMS:6.0f} -> "
+        f"{sum(map(len, code_json)) / ODONTOGRAMS:3.0f} B, "
+        f"dumps {timed(json.dumps, dicts) * 1e6:6.1f} -> "
+        f"{timed(json.dumps, codes) * 1e6:4.1f} us, "
+        f"loads {timed(json.loads, dict_json) * 1e6:6.1f} -> "
+        f"{timed(json.loads, code_json) * 1e6:4.1f} us, "
+        f"encode {timed(encode_teeth, dicts) * 1e6:5.1f} us, "
+        f"decode {timed(decode_teeth, codes) * 1e6:5.1f} us"
+    )
+
+
+def main():
+    for fill in FILL_RATIOS:
+        run(fill)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
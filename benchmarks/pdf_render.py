@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import time
+from fixtures import (
+    build_patients,
+    max_loop_lag,
+    run_isolated,
+)
+
+NOTE_COUNTS = (5, 50, 500)
+WORKER_COUNTS = (1, 2, 4)
+PATIENTS = 24
+REPETITIONS = 5
+
+
+def build(note_count: int, patient_count: int = 1) -> list:
+    patients = build_patients(patient_count)
+    for index, patient in enumerate(patients):
+        patient["id"] = f"p{index + 1}"
+        patient["historia_clinica"]["seguimiento"] = (
+            patient["historia_clinica"]["seguimiento"]
+            * (note_count // 5)
+        )
+    return patients
+
+
+def run():
+    from app.states.history_pdf import (
+        HistoryPdfRenderer,
+        render_history_pdf,
+    )
+
+    for note_count in NOTE_COUNTS:
+        (patient,) = build(note_count)
+        started = time.perf_counter()
+        for _ in range(REPETITIONS):
+            pdf = render_history_pdf(patient)
+        elapsed = (
+            time.perf_counter() - started
+        ) / REPETITIONS
+        print(
+            f"{note_count:>4} notes: {elapsed * 1000:7.1f} ms "
+            f"in-process, {len(pdf) / 1024:6.0f} KiB"
+        )
+    patients = build(50, PATIENTS)
+
+    async def inline():
+        for patient in patients:
+            render_history_pdf(patient)
+
+    elapsed, lag = asyncio.run(max_loop_lag(inline))
+    print(
+        f"inline on the event loop: {PATIENTS / elapsed:6.1f} "
+        f"PDF/s, max loop lag {lag * 1000:7.1f} ms"
+    )
+    for workers in WORKER_COUNTS:
+        renderer = HistoryPdfRenderer(workers=workers)
+        for warmup in [
+            renderer.submit(patient, 0)
+            for patient in patients[:workers]
+        ]:
+            warmup.result()
+
+        async def pooled(renderer=renderer):
+            await asyncio.gather(
+                *(
+                    renderer.render(patient, 1)
+                    for patient in patients
+                )
+            )
+
+        elapsed, lag = asyncio.run(max_loop_lag(pooled))
+        started = time.perf_counter()
+        for patient in patients:
+            renderer.submit(patient, 1).result()
+        cached = (time.perf_counter() - started) / PATIENTS
+        renderer.shutdown()
+        print(
+            f"{workers} workers: {PATIENTS / elapsed:6.1f} PDF/s, "
+            f"max loop lag {lag * 1000:5.1f} ms, "
+            f"cached {cached * 1e6:5.1f} us"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--render", action="store_true")
+    args = parser.parse_args()
+    if args.render:
+        run()
+        return
+    run_isolated(__file__, "--render")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
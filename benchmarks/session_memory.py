@@ -0,0 +1,61 @@
+import argparse
+import copy
+from fixtures import (
+    new_session,
+    populate_store,
+    rss_mib,
+    run_isolated,
+)
+
+SESSIONS = 500
+PATIENTS = 1000
+
+
+def run(mode: str, sessions: int, patient_count: int):
+    from app.states.clinic_store import get_clinic_store
+
+    patient_ids = populate_store(patient_count)
+    clinic = get_clinic_store().get_many(patient_ids)
+    baseline = rss_mib()
+    kept = []
+    for i in range(sessions):
+        if mode == "before":
+            kept.append(copy.deepcopy(clinic))
+        kept.append(
+            new_session(patient_ids[i % patient_count])
+        )
+    print(
+        f"{mode:>6}: {sessions} sessions, {patient_count} patients, "
+        f"+{rss_mib() - baseline:.1f} MiB RSS"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--mode", choices=["before", "after"]
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=SESSIONS
+    )
+    parser.add_argument(
+        "--patients", type=int, default=PATIENTS
+    )
+    args = parser.parse_args()
+    if args.mode:
+        run(args.mode, args.sessions, args.patients)
+        return
+    for mode in ("before", "after"):
+        run_isolated(
+            __file__,
+            "--mode",
+            mode,
+            "--sessions",
+            str(args.sessions),
+            "--patients",
+            str(args.patients),
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
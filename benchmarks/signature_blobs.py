@@ -0,0 +1,68 @@
+import argparse
+import base64
+import json
+import os
+import time
+from fixtures import ROOT, build_patients, run_isolated
+
+REPETITIONS = 2000
+
+
+def measure(patient: dict) -> tuple[int, float]:
+    started = time.perf_counter()
+    for _ in range(REPETITIONS):
+        json.dumps(patient)
+    elapsed = (time.perf_counter() - started) / REPETITIONS
+    return len(json.dumps(patient).encode()), elapsed
+
+
+def run():
+    from app.states.blob_store import get_blob_store
+
+    with open(
+        os.path.join(ROOT, "assets", "logo_pdf.png"), "rb"
+    ) as logo:
+        data_url = (
+            "data:image/png;base64,"
+            + base64.b64encode(logo.read()).decode("ascii")
+        )
+    (patient,) = build_patients(1)
+    consent = patient["historia_clinica"][
+        "firma_consentimiento"
+    ]
+    consent["firma_data_url"] = data_url
+    inline = measure(patient)
+    started = time.perf_counter()
+    consent["firma_data_url"] = (
+        get_blob_store().put_data_url(data_url)
+    )
+    stored = time.perf_counter() - started
+    referenced = measure(patient)
+    for label, (size, elapsed) in (
+        ("inline data URL", inline),
+        ("blob reference", referenced),
+    ):
+        print(
+            f"{label:>15}: patient payload {size / 1024:7.1f} KiB, "
+            f"serialize {elapsed * 1e6:7.1f} us"
+        )
+    started = time.perf_counter()
+    get_blob_store().put_data_url(data_url)
+    print(
+        f"first store {stored * 1000:.2f} ms, deduplicated "
+        f"store {(time.perf_counter() - started) * 1000:.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blobs", action="store_true")
+    args = parser.parse_args()
+    if args.blobs:
+        run()
+        return
+    run_isolated(__file__, "--blobs")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
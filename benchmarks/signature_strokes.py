@@ -0,0 +1,158 @@
+import argparse
+import base64
+import math
+import struct
+import time
+import zlib
+import numpy as np
+from fixtures import run_isolated
+
+WIDTH = 400
+HEIGHT = 150
+MIN_DISTANCE = 2
+REPETITIONS = 200
+
+
+def sample_strokes(stroke_count: int) -> list:
+    strokes = []
+    for index in range(stroke_count):
+        left = 30 + index * (WIDTH - 60) / stroke_count
+        stroke = []
+        for step in range(400):
+            t = step / 400
+            point = (
+                round(
+                    left
+                    + t * (WIDTH - 60) / stroke_count
+                    + 8 * math.sin(t * 23 + index)
+                ),
+                round(
+                    HEIGHT / 2
+                    + 35
+                    * math.sin(t * 11 + index * 2)
+                    * math.cos(t * 3)
+                ),
+            )
+            if not stroke or (
+                math.dist(point, stroke[-1]) >= MIN_DISTANCE
+            ):
+                stroke.append(point)
+        strokes.append(stroke)
+    return strokes
+
+
+def png_data_url(strokes: list) -> str:
+    alpha = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+    offsets = [
+        (dx, dy)
+        for dx in range(-1, 2)
+        for dy in range(-1, 2)
+        if dx * dx + dy * dy <= 2
+    ]
+    for stroke in strokes:
+        for (x1, y1), (x2, y2) in zip(stroke, stroke[1:]):
+            steps = max(
+                2, int(math.dist((x1, y1), (x2, y2)) * 2)
+            )
+            xs = (
+                np.linspace(x1, x2, steps)
+                .round()
+                .astype(int)
+            )
+            ys = (
+                np.linspace(y1, y2, steps)
+                .round()
+                .astype(int)
+            )
+            for dx, dy in offsets:
+                alpha[
+                    np.clip(ys + dy, 0, HEIGHT - 1),
+                    np.clip(xs + dx, 0, WIDTH - 1),
+                ] = 255
+    pixels = np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8)
+    pixels[..., :3] = 17
+    pixels[..., 3] = alpha
+    raw = b"".join(
+        b"\x00" + row.tobytes() for row in pixels
+    )
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    png = (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(
+            b"IHDR",
+            struct.pack(
+                ">IIBBBBB", WIDTH, HEIGHT, 8, 6, 0, 0, 0
+            ),
+        )
+        + chunk(b"IDAT", zlib.compress(raw, 9))
+        + chunk(b"IEND", b"")
+    )
+    return "data:image/png;base64," + base64.b64encode(
+        png
+    ).decode("ascii")
+
+
+def run():
+    from app.states.signature_strokes import (
+        decode_strokes,
+        encode_strokes,
+        signature_svg,
+        simplified_strokes,
+    )
+
+    for stroke_count in (1, 3, 6):
+        strokes = sample_strokes(stroke_count)
+        code = encode_strokes(WIDTH, HEIGHT, strokes)
+        points = sum(len(stroke) for stroke in strokes)
+        kept = sum(
+            len(stroke)
+            for stroke in simplified_strokes(code)[2]
+        )
+        started = time.perf_counter()
+        for _ in range(REPETITIONS):
+            for cached in (
+                decode_strokes,
+                simplified_strokes,
+                signature_svg,
+            ):
+                cached.cache_clear()
+            signature_svg(code)
+        uncached = (
+            time.perf_counter() - started
+        ) / REPETITIONS
+        started = time.perf_counter()
+        for _ in range(REPETITIONS):
+            signature_svg(code)
+        cached_time = (
+            time.perf_counter() - started
+        ) / REPETITIONS
+        print(
+            f"{stroke_count} strokes, {points:4} points: "
+            f"code {len(code):5} B vs PNG data URL "
+            f"{len(png_data_url(strokes)):6} B, "
+            f"{kept:3} points after simplification, "
+            f"SVG {uncached * 1000:5.2f} ms "
+            f"(cached {cached_time * 1e6:4.1f} us)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strokes", action="store_true")
+    args = parser.parse_args()
+    if args.strokes:
+        run()
+        return
+    run_isolated(__file__, "--strokes")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import argparse
+import json
+from fixtures import (
+    new_session,
+    populate_store,
+    run_isolated,
+    session_state,
+    warm,
+)
+
+PATIENTS = 1000
+
+
+def run(patient_count: int):
+    from app.delta_trace import delta_vars
+    from app.states.clinic_state import ClinicState
+    from app.states.clinic_store import get_clinic_store
+    from app.states.dashboard_state import DashboardState
+    from app.states.history_editor_state import (
+        HistoryEditorState,
+    )
+    from app.states.odontogram_state import (
+        OdontogramState,
+    )
+    from app.states.review_state import ReviewState
+
+    patient_ids = populate_store(patient_count)
+    root = new_session(patient_ids[len(patient_ids) // 2])
+    clinic = session_state(root, ClinicState)
+    dashboard = session_state(root, DashboardState)
+    editor = session_state(root, HistoryEditorState)
+    odontogram = session_state(root, OdontogramState)
+    review = session_state(root, ReviewState)
+    warm(review, "is_history_form_invalid")
+    root.get_delta()
+    root._clean()
+    events = [
+        (
+            "set_nueva_nota_evolucion",
+            lambda: HistoryEditorState.set_nueva_nota_evolucion.fn(
+                editor, "Profilaxis"
+            ),
+        ),
+        (
+            "toggle_add_patient_modal",
+            lambda: DashboardState.toggle_add_patient_modal.fn(
+                dashboard
+            ),
+        ),
+        (
+            "set_reject_observation",
+            lambda: ReviewState.set_reject_observation.fn(
+                review, "Faltan datos"
+            ),
+        ),
+        (
+            "set_odontogram_tool",
+            lambda: OdontogramState.set_odontogram_tool.fn(
+                odontogram, "Caries"
+            ),
+        ),
+        (
+            "sync_store (otro paciente)",
+            lambda: (
+                get_clinic_store().apply_history_patch(
+                    patient_ids[0],
+                    [
+                        (
+                            [
+                                "padecimiento_actual",
+                                "motivo_consulta",
+                            ],
+                            "Control",
+                        )
+                    ],
+                ),
+                ClinicState.sync_store.fn(clinic),
+            ),
+        ),
+        (
+            "update_tooth_surface",
+            lambda: OdontogramState.update_tooth_surface.fn(
+                odontogram, "11", "oclusal"
+            ),
+        ),
+        (
+            "update_history_field_str",
+            lambda: HistoryEditorState.update_history_field_str.fn(
+                editor,
+                ["padecimiento_actual", "motivo_consulta"],
+                "Dolor",
+            ),
+        ),
+    ]
+    for name, handler in events:
+        handler()
+        delta = root.get_delta()
+        root._clean()
+        print(
+            f"{name:>26}: "
+            f"{len(json.dumps(delta, default=str)):>6} B "
+            f"{json.dumps(delta_vars(delta))}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--patients", type=int)
+    args = parser.parse_args()
+    if args.patients:
+        run(args.patients)
+        return
+    run_isolated(__file__, "--patients", str(PATIENTS))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import pytest
+
+os.environ.setdefault(
+    "ODONTOTESS_DB_PATH",
+    os.path.join(tempfile.mkdtemp(), "odontotess.db"),
+)
+from app.states.clinic_store import ClinicStore
+from app.states.models import Patient, create_empty_history
+from app.states.patient_repository import PatientRepository
+
+
+def make_patient(patient_id: str, **values) -> Patient:
+    history = create_empty_history()
+    history["datos_generales"][
+        "nombre_completo"
+    ] = f"Paciente {patient_id}"
+    return {
+        "id": patient_id,
+        "nombre": f"Paciente {patient_id}",
+        "edad": 30,
+        "fecha_registro": "2024-01-01",
+        "status": "Pendiente",
+        "estudiante_email": "estudiante@odontotess.com",
+        "historia_clinica": history,
+        "firma_paciente_url": None,
+        "firma_profesor_url": None,
+        "fecha_firma_profesor": None,
+        "observaciones_rechazo": None,
+        **values,
+    }
+
+
+@pytest.fixture
+def database_path(tmp_path) -> str:
+    return os.path.join(tmp_path, "clinic.db")
+
+
+@pytest.fixture
+def store(database_path):
+    repository = PatientRepository(database_path)
+    yield ClinicStore(repository)
+    repository.close()
+
+
+def session_state(patient_id: str, state_class):
+    from reflex.istate.data import RouterData
+    from reflex.state import State
+
+    root = State(_reflex_internal_init=True)
+    root.router = RouterData.from_router_data(
+        {
+            "pathname": "/history/[patient_id]",
+            "asPath": f"/history/{patient_id}",
+            "query": {"patient_id": patient_id},
+        }
+    )
+    return root.get_substate(
+        state_class.get_full_name().split(".")[1:]
+    )
\ No newline at end of file
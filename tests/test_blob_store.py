@@ -0,0 +1,122 @@
+import base64
+import os
+import pytest
+from app.states.blob_store import (
+    BlobStore,
+    decode_data_url,
+    is_blob_ref,
+)
+from app.states.clinic_store import ClinicStore
+from app.states.patient_repository import PatientRepository
+from conftest import make_patient
+
+PNG = b"\x89PNG\r\n\x1a\nfirma"
+PNG_URL = "data:image/png;base64," + base64.b64encode(
+    PNG
+).decode("ascii")
+
+
+@pytest.fixture
+def blobs(tmp_path) -> BlobStore:
+    return BlobStore(os.path.join(tmp_path, "blobs"))
+
+
+@pytest.fixture
+def blob_store(database_path, blobs):
+    repository = PatientRepository(database_path)
+    yield ClinicStore(repository, blobs=blobs)
+    repository.close()
+
+
+def test_put_is_content_addressed(blobs):
+    ref = blobs.put(PNG, "image/png")
+    assert is_blob_ref(ref)
+    assert blobs.put(PNG, "image/png") == ref
+    assert blobs.read(ref) == ("image/png", PNG)
+    assert blobs.data_url(ref) == PNG_URL
+
+
+def test_put_rejects_unsupported_media_type(blobs):
+    with pytest.raises(ValueError):
+        blobs.put(b"<html>", "text/html")
+
+
+def test_decode_data_url():
+    assert decode_data_url(PNG_URL) == ("image/png", PNG)
+    assert decode_data_url(
+        "data:image/svg+xml,%3Csvg%2F%3E"
+    ) == ("image/svg+xml", b"<svg/>")
+    for invalid in (
+        "data:image/png;base64,@@@",
+        "image/png;base64,AAAA",
+    ):
+        with pytest.raises(ValueError):
+            decode_data_url(invalid)
+
+
+def test_locate_rejects_unknown_names(blobs):
+    ref = blobs.put(PNG, "image/png")
+    assert blobs.locate(ref.rsplit("/", 1)[1]) is not None
+    assert blobs.locate("../clinic.db") is None
+    assert blobs.locate("0" * 64 + ".png") is None
+
+
+def test_only_signature_fields_are_externalized(
+    blob_store,
+):
+    blob_store.add(make_patient("p1"))
+    patient = blob_store.apply_history_patch(
+        "p1",
+        [
+            (
+                ["firma_consentimiento", "firma_data_url"],
+                PNG_URL,
+            ),
+            (
+                ["padecimiento_actual", "motivo_consulta"],
+                "data:no es una imagen",
+            ),
+        ],
+    )
+    history = patient["historia_clinica"]
+    assert is_blob_ref(
+        history["firma_consentimiento"]["firma_data_url"]
+    )
+    assert (
+        history["padecimiento_actual"]["motivo_consulta"]
+        == "data:no es una imagen"
+    )
+    patient = blob_store.update_columns(
+        "p1",
+        {
+            "firma_paciente_url": PNG_URL,
+            "observaciones_rechazo": "data:texto",
+        },
+    )
+    assert is_blob_ref(patient["firma_paciente_url"])
+    assert patient["observaciones_rechazo"] == "data:texto"
+
+
+def test_invalid_signature_leaves_patient_untouched(
+    blob_store,
+):
+    blob_store.add(make_patient("p1"))
+    with pytest.raises(ValueError):
+        blob_store.apply_history_patch(
+            "p1",
+            [
+                (
+                    [
+                        "firma_consentimiento",
+                        "firma_data_url",
+                    ],
+                    "data:text/html,<script>",
+                )
+            ],
+        )
+    assert (
+        blob_store.get("p1")["historia_clinica"][
+            "firma_consentimiento"
+        ]["firma_data_url"]
+        == ""
+    )
\ No newline at end of file
@@ -0,0 +1,130 @@
+import copy
+import pytest
+from app.states.clinic_store import ClinicStore
+from app.states.patient_repository import (
+    PatientRepository,
+    _json_path,
+)
+from conftest import make_patient
+
+MOTIVO = ["padecimiento_actual", "motivo_consulta"]
+NOTE = {
+    "fecha_hora": "2024-01-01 10:00",
+    "procedimiento_signos_vitales": "Profilaxis",
+    "observaciones": "",
+}
+
+
+def stored(database_path: str, patient_id: str):
+    repository = PatientRepository(database_path)
+    try:
+        return repository.get(patient_id)
+    finally:
+        repository.close()
+
+
+def test_json_path_quotes_keys():
+    assert (
+        _json_path(["odontograma", "general_notes"])
+        == '$."odontograma"."general_notes"'
+    )
+    for field_path in ([], ["a", 'b"c'], ["a", ""], [1]):
+        with pytest.raises(ValueError):
+            _json_path(field_path)
+
+
+def test_rejected_path_leaves_cache_untouched(
+    store, database_path
+):
+    store.add(make_patient("p1"))
+    before = copy.deepcopy(store.get("p1"))
+    with pytest.raises(ValueError):
+        store.apply_history_patch(
+            "p1",
+            [
+                (MOTIVO, "Dolor"),
+                (["nueva", 'se"ccion'], "x"),
+            ],
+        )
+    assert store.get("p1") == before
+    assert stored(database_path, "p1") == before
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda store: store.apply_history_patch(
+            "p1",
+            [(MOTIVO, "Dolor"), (["nueva", "clave"], "x")],
+        ),
+        lambda store: store.update_columns(
+            "p1", {"status": "Aprobado"}
+        ),
+        lambda store: store.append_history_item(
+            "p1", ["seguimiento"], NOTE
+        ),
+        lambda store: store.remove_history_item(
+            "p1", ["seguimiento"], 0
+        ),
+    ],
+)
+def test_failed_write_restores_cached_patient(
+    store, database_path, monkeypatch, mutate
+):
+    patient = make_patient("p1")
+    patient["historia_clinica"]["seguimiento"] = [NOTE]
+    store.add(patient)
+    before = copy.deepcopy(store.get("p1"))
+    version = store.patient_version("p1")
+
+    def append_changes(patient_id, changes):
+        raise RuntimeError("disco lleno")
+
+    monkeypatch.setattr(
+        store._repository, "append_changes", append_changes
+    )
+    with pytest.raises(RuntimeError):
+        mutate(store)
+    assert store.get("p1") == before
+    assert store.patient_version("p1") == version
+    assert stored(database_path, "p1") == before
+    monkeypatch.undo()
+    mutate(store)
+    assert store.get("p1") == stored(database_path, "p1")
+    head = store.history_version("p1")
+    assert [
+        change["seq"]
+        for change in store._repository.changes_between(
+            "p1", 0, head
+        )
+    ] == list(range(1, head + 1))
+
+
+def test_store_matches_repository_after_writes(
+    store, database_path
+):
+    store.add(make_patient("p1"))
+    store.apply_history_patch("p1", [(MOTIVO, "Dolor")])
+    store.append_history_item("p1", ["seguimiento"], NOTE)
+    store.update_columns("p1", {"status": "Rechazado"})
+    store.remove_history_item("p1", ["seguimiento"], 0)
+    reloaded = ClinicStore(PatientRepository(database_path))
+    assert reloaded.get("p1") == store.get("p1")
+
+
+def test_patient_ids_are_never_reused(store, database_path):
+    store.add(make_patient("p1"))
+    first = store.next_patient_id()
+    assert first != "p1"
+    store.add(make_patient(first))
+    store.delete(first)
+    second = store.next_patient_id()
+    store.add(make_patient(second))
+    reopened = PatientRepository(database_path)
+    try:
+        assert (
+            len({first, second, reopened.next_patient_id()})
+            == 3
+        )
+    finally:
+        reopened.close()
\ No newline at end of file
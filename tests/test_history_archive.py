@@ -0,0 +1,94 @@
+import asyncio
+import concurrent.futures
+import os
+import zipfile
+import pytest
+from app.states import history_archive
+from app.states.history_archive import (
+    HistoryArchive,
+    archive_member,
+    archive_path,
+)
+from app.states.history_pdf import HistoryPdfRenderer
+from conftest import make_patient
+
+
+class FailingRenderer:
+    def submit(self, patient, version):
+        future = concurrent.futures.Future()
+        if patient["id"] == "p2":
+            future.set_exception(RuntimeError("fallo"))
+        else:
+            future.set_result(b"%PDF-1.4")
+        return future
+
+
+async def drain(archive, store, renderer, window):
+    return [
+        written
+        async for written in archive.write(
+            store, renderer, window
+        )
+    ]
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        history_archive, "ARCHIVE_DIR", str(tmp_path)
+    )
+
+
+def test_archive_member_is_sanitised():
+    patient = make_patient(
+        "p7",
+        nombre="Ana / Torres",
+        estudiante_email="../alumno@odontotess.com",
+    )
+    assert (
+        archive_member(patient)
+        == ".._alumno@odontotess.com/Ana_Torres_p7.pdf"
+    )
+
+
+def test_archive_path_rejects_traversal():
+    assert archive_path("../secreto") is None
+    assert archive_path("abc_DEF-1").endswith(
+        "abc_DEF-1.zip"
+    )
+
+
+def test_archive_contains_one_pdf_per_patient(store):
+    for index in range(1, 6):
+        store.add(make_patient(f"p{index}"))
+    patient_ids = ["p3", "p1", "p5", "p2", "p4"]
+    archive = HistoryArchive(patient_ids)
+    renderer = HistoryPdfRenderer(workers=1)
+    try:
+        progress = asyncio.run(
+            drain(archive, store, renderer, 2)
+        )
+    finally:
+        renderer.shutdown()
+    assert progress == [1, 2, 3, 4, 5]
+    with zipfile.ZipFile(archive.path) as written:
+        names = written.namelist()
+        assert names == [
+            f"estudiante@odontotess.com/Paciente_{patient_id}_{patient_id}.pdf"
+            for patient_id in patient_ids
+        ]
+        assert all(
+            written.read(name).startswith(b"%PDF")
+            for name in names
+        )
+
+
+def test_failed_render_removes_partial_archive(store):
+    for index in range(1, 4):
+        store.add(make_patient(f"p{index}"))
+    archive = HistoryArchive(["p1", "p2", "p3"])
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            drain(archive, store, FailingRenderer(), 1)
+        )
+    assert not os.path.exists(archive.path)
\ No newline at end of file
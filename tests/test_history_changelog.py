@@ -0,0 +1,143 @@
+import copy
+from app.states.clinic_store import ClinicStore
+from app.states.history_changelog import (
+    CHECKPOINT_INTERVAL,
+    replay,
+)
+from app.states.odontogram_codec import encode_teeth
+from app.states.patient_repository import PatientRepository
+from conftest import make_patient
+
+MOTIVO = ["padecimiento_actual", "motivo_consulta"]
+CLINICO = ["diagnostico", "clinico"]
+NOTE = {
+    "fecha_hora": "2024-01-01 10:00",
+    "procedimiento_signos_vitales": "Profilaxis",
+    "observaciones": "",
+}
+
+
+def edit_history(store, patient_id: str) -> list:
+    snapshots = [
+        copy.deepcopy(
+            store.get(patient_id)["historia_clinica"]
+        )
+    ]
+    for step in range(CHECKPOINT_INTERVAL + 10):
+        if step % 10 == 3:
+            store.append_history_item(
+                patient_id,
+                ["seguimiento"],
+                {**NOTE, "observaciones": f"Nota {step}"},
+            )
+        elif step % 10 == 7:
+            store.remove_history_item(
+                patient_id, ["seguimiento"], 0
+            )
+        else:
+            store.apply_history_patch(
+                patient_id, [(MOTIVO, f"Motivo {step}")]
+            )
+        snapshots.extend(
+            copy.deepcopy(
+                store.get(patient_id)["historia_clinica"]
+            )
+            for _ in range(
+                store.history_version(patient_id)
+                - len(snapshots)
+                + 1
+            )
+        )
+    return snapshots
+
+
+def test_replay_from_checkpoint_matches_live_history(
+    store, database_path
+):
+    store.add(make_patient("p1"))
+    snapshots = edit_history(store, "p1")
+    head = store.history_version("p1")
+    assert head >= CHECKPOINT_INTERVAL
+    repository = PatientRepository(database_path)
+    try:
+        checkpoint_seq, checkpoint = (
+            repository.checkpoint_at("p1", 0)
+        )
+        assert checkpoint_seq == 0
+        assert (
+            replay(
+                checkpoint,
+                repository.changes_between(
+                    "p1", checkpoint_seq, head
+                ),
+            )
+            == store.get("p1")["historia_clinica"]
+        )
+        reloaded = ClinicStore(repository)
+        for seq in range(head + 1):
+            assert (
+                reloaded.history_at("p1", seq)
+                == snapshots[seq]
+            )
+    finally:
+        repository.close()
+
+
+def test_review_changes_coalesce_edits_since_review(
+    store,
+):
+    store.add(make_patient("p1"))
+    store.apply_history_patch(
+        "p1", [(CLINICO, "Gingivitis")]
+    )
+    store.append_history_item("p1", ["seguimiento"], NOTE)
+    store.update_columns("p1", {"status": "Rechazado"})
+    store.apply_history_patch("p1", [(MOTIVO, "Dolor")])
+    store.apply_history_patch(
+        "p1", [(MOTIVO, "Dolor agudo")]
+    )
+    store.apply_history_patch("p1", [(CLINICO, "Caries")])
+    store.apply_history_patch(
+        "p1", [(CLINICO, "Gingivitis")]
+    )
+    extra = {**NOTE, "observaciones": "Temporal"}
+    store.append_history_item("p1", ["seguimiento"], extra)
+    store.remove_history_item("p1", ["seguimiento"], 1)
+    store.remove_history_item("p1", ["seguimiento"], 0)
+    store.update_odontogram(
+        "p1",
+        lambda code: encode_teeth(
+            {
+                "11": {"surfaces": {"oclusal": "Caries"}},
+                "36": {"missing": True},
+            }
+        ),
+    )
+    assert store.review_changes("p1") == [
+        {
+            "campo": "Padecimiento actual › Motivo consulta",
+            "anterior": "—",
+            "actual": "Dolor agudo",
+        },
+        {
+            "campo": "Seguimiento",
+            "anterior": "2024-01-01 10:00 · Profilaxis",
+            "actual": "—",
+        },
+        {
+            "campo": "Odontograma › 11 oclusal",
+            "anterior": "Sano",
+            "actual": "Caries",
+        },
+        {
+            "campo": "Odontograma › 36",
+            "anterior": "Presente",
+            "actual": "Ausente",
+        },
+    ]
+
+
+def test_review_changes_without_review_is_empty(store):
+    store.add(make_patient("p1"))
+    store.apply_history_patch("p1", [(MOTIVO, "Dolor")])
+    assert store.review_changes("p1") == []
\ No newline at end of file
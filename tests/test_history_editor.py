@@ -0,0 +1,165 @@
+import pytest
+from reflex.istate.data import RouterData
+from app.states.auth_state import AuthState
+from app.states.clinic_state import route_patient_id
+from app.states.clinic_store import get_clinic_store
+from app.states.history_editor_state import (
+    HistoryEditorState,
+    is_editable_path,
+)
+from app.states.history_export import iter_history_html
+from conftest import make_patient, session_state
+
+CLINICO = ["diagnostico", "clinico"]
+
+
+@pytest.fixture
+def editor(request):
+    patient_id = f"editor-{request.node.name}"
+    get_clinic_store().add(make_patient(patient_id))
+    yield session_state(patient_id, HistoryEditorState)
+    get_clinic_store().delete(patient_id)
+
+
+def history(state) -> dict:
+    return get_clinic_store().get(
+        state._route_patient_id()
+    )["historia_clinica"]
+
+
+@pytest.mark.parametrize(
+    "field_path",
+    [
+        ["odontograma"],
+        ["odontograma", "codigo"],
+        ["odontograma", "teeth"],
+        ["odontograma", "teeth", "11", "surfaces"],
+        ["firma_consentimiento"],
+        ["firma_consentimiento", "firma_trazos"],
+        [],
+        ["datos_generales", 3],
+        ["datos_generales"],
+        ["seguimiento"],
+        ["zzz", "x"],
+    ],
+)
+def test_protected_paths_are_rejected(field_path):
+    assert not is_editable_path(field_path)
+
+
+@pytest.mark.parametrize(
+    "field_path",
+    [
+        ["odontograma", "general_notes"],
+        ["firma_consentimiento", "aceptado"],
+        ["firma_consentimiento", "firma_data_url"],
+        ["padecimiento_actual", "motivo_consulta"],
+    ],
+)
+def test_form_paths_are_editable(field_path):
+    assert is_editable_path(field_path)
+
+
+@pytest.mark.parametrize(
+    "pathname, as_path, patient_id",
+    [
+        ("/history/[patient_id]", "/history/p7", "p7"),
+        ("/history/[patient_id]", "/history/p%207/", "p 7"),
+        (
+            "/history/[patient_id]",
+            "/history/p7?tab=1",
+            "p7",
+        ),
+        ("/dashboard", "/dashboard", None),
+        ("/history/[patient_id]", "/history/", None),
+    ],
+)
+def test_route_patient_id(pathname, as_path, patient_id):
+    router = RouterData.from_router_data(
+        {"pathname": pathname, "asPath": as_path}
+    )
+    assert route_patient_id(router) == patient_id
+
+
+def test_batch_applies_only_schema_leaves(editor):
+    patient_id = editor._route_patient_id()
+    HistoryEditorState.apply_history_patch.fn(
+        editor,
+        {
+            "patient_id": patient_id,
+            "patches": [
+                [["zzz", "x"], "v"],
+                [["datos_generales"], "oops"],
+                [["seguimiento"], "notalist"],
+                [CLINICO, 3],
+                [
+                    [
+                        "antecedentes_heredo_familiares",
+                        "diabetes",
+                    ],
+                    "si",
+                ],
+                "notapair",
+                [CLINICO],
+                [CLINICO, "Gingivitis"],
+                [
+                    [
+                        "antecedentes_heredo_familiares",
+                        "cancer",
+                    ],
+                    True,
+                ],
+            ],
+        },
+    )
+    saved = history(editor)
+    assert "zzz" not in saved
+    assert saved["seguimiento"] == []
+    assert saved["datos_generales"]["nombre_completo"] == (
+        f"Paciente {patient_id}"
+    )
+    assert saved["diagnostico"]["clinico"] == "Gingivitis"
+    assert saved["antecedentes_heredo_familiares"] == {
+        "diabetes": False,
+        "hipertension": False,
+        "cancer": True,
+        "tuberculosis": False,
+        "enfermedades_mentales": False,
+    }
+    assert "".join(
+        iter_history_html(
+            get_clinic_store().get(patient_id)
+        )
+    )
+
+
+def test_batch_for_another_patient_is_returned(editor):
+    before = history(editor)
+    events = HistoryEditorState.apply_history_patch.fn(
+        editor,
+        {
+            "patient_id": "otro",
+            "patches": [[CLINICO, "Caries"], "notapair"],
+        },
+    )
+    assert history(editor) == before
+    restore, toast = events
+    assert "odontotessHistoryPatch.restore" in str(
+        restore.args
+    )
+    assert "notapair" not in str(restore.args)
+
+
+def test_sign_out_flushes_before_leaving(editor):
+    events = HistoryEditorState.apply_history_patch_and_sign_out.fn(
+        editor,
+        {
+            "patient_id": editor._route_patient_id(),
+            "patches": [[CLINICO, "Caries"]],
+        },
+    )
+    assert (
+        history(editor)["diagnostico"]["clinico"]
+        == "Caries"
+    )
+    assert events is AuthState.sign_out
\ No newline at end of file
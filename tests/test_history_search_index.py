@@ -0,0 +1,113 @@
+from app.states.history_search_index import (
+    HistorySearchIndex,
+    tokenize,
+)
+from app.states.models import create_empty_history
+from conftest import make_patient
+
+MOTIVO = ["padecimiento_actual", "motivo_consulta"]
+
+
+def history_with(**sections) -> dict:
+    history = create_empty_history()
+    for section, values in sections.items():
+        history[section].update(values)
+    return history
+
+
+def test_tokenize_folds_accents_stems_and_drops_stopwords():
+    assert tokenize(
+        "Inflamación de las encías"
+    ) == tokenize("inflamacion ENCIA")
+    assert tokenize("de la y") == []
+
+
+def test_search_ranks_patients_matching_every_term():
+    index = HistorySearchIndex()
+    index.add(
+        "p1",
+        history_with(
+            padecimiento_actual={
+                "motivo_consulta": "Dolor de muela con dolor al masticar"
+            }
+        ),
+    )
+    index.add(
+        "p2",
+        history_with(
+            padecimiento_actual={
+                "motivo_consulta": "Dolor en la encía inferior, sangrado al cepillar y molestias generales en toda la boca"
+            }
+        ),
+    )
+    index.add(
+        "p3",
+        history_with(
+            diagnostico={"clinico": "Gingivitis"},
+        ),
+    )
+    assert index.search("dolor") == (["p1", "p2"], 2)
+    assert index.search("dolor encias") == (["p2"], 1)
+    assert index.search("dolor gingivitis") == ([], 0)
+    assert index.search("dolor", offset=1, limit=1) == (
+        ["p2"],
+        2,
+    )
+    assert index.search("de la") == ([], 0)
+
+
+def test_updates_replace_terms_and_skip_excluded_sections():
+    index = HistorySearchIndex()
+    index.add("p1", create_empty_history())
+    index.update("p1", MOTIVO, "Sensibilidad dental")
+    index.update("p1", MOTIVO, "Fractura")
+    index.update(
+        "p1", ["odontograma", "general_notes"], "Caries"
+    )
+    index.update(
+        "p1",
+        ["seguimiento"],
+        [{"observaciones": "Control de placa"}],
+    )
+    assert index.search("sensibilidad") == ([], 0)
+    assert index.search("fractura") == (["p1"], 1)
+    assert index.search("caries") == ([], 0)
+    assert index.search("placa") == (["p1"], 1)
+    index.update("p1", ["seguimiento"], [])
+    assert index.search("placa") == ([], 0)
+    rebuilt = HistorySearchIndex()
+    rebuilt.add("p1", create_empty_history())
+    rebuilt.update("p1", MOTIVO, "Fractura")
+    assert index._postings == rebuilt._postings
+    assert index._lengths == rebuilt._lengths
+    assert index._total_length == rebuilt._total_length
+
+
+def test_remove_drops_patient_from_index():
+    index = HistorySearchIndex()
+    index.add(
+        "p1",
+        history_with(
+            padecimiento_actual={"evolucion": "Absceso"}
+        ),
+    )
+    index.remove("p1")
+    assert "p1" not in index
+    assert len(index) == 0
+    assert index._postings == {}
+    assert index._total_length == 0
+    assert index.search("absceso") == ([], 0)
+
+
+def test_store_search_follows_history_writes(store):
+    store.add(make_patient("p1"))
+    store.add(make_patient("p2"))
+    assert store.search_histories("bruxismo") == ([], 0)
+    store.apply_history_patch("p2", [(MOTIVO, "Bruxismo")])
+    summaries, total = store.search_histories("bruxismo")
+    assert total == 1
+    assert [summary["id"] for summary in summaries] == [
+        "p2"
+    ]
+    store.delete("p2")
+    assert store.search_histories("bruxismo") == ([], 0)
\ No newline at end of file
@@ -0,0 +1,265 @@
+import pytest
+from app.states.history_validation import (
+    SECTION_BITS,
+    SECTION_FIELDS,
+    SECTIONS,
+    HistoryValidationIndex,
+    invalid_sections,
+)
+from app.states.models import (
+    create_empty_history,
+    create_initial_patients,
+)
+from conftest import make_patient
+
+INVALID_FIELDS = {
+    "datos_generales": (
+        ["datos_generales", "edad"],
+        "200",
+        "34",
+    ),
+    "datos_administrativos": (
+        ["datos_administrativos", "nombre_estudiante"],
+        42,
+        "Juan Pérez",
+    ),
+    "antecedentes_heredo_familiares": (
+        ["antecedentes_heredo_familiares", "diabetes"],
+        "sí",
+        True,
+    ),
+    "antecedentes_personales_patologicos": (
+        ["antecedentes_personales_patologicos", "alergias"],
+        "x" * 5000,
+        "Penicilina",
+    ),
+    "antecedentes_personales_no_patologicos": (
+        [
+            "antecedentes_personales_no_patologicos",
+            "dieta",
+        ],
+        ["no", "texto"],
+        "Balanceada",
+    ),
+    "padecimiento_actual": (
+        ["padecimiento_actual", "motivo_consulta"],
+        "  ",
+        "Dolor",
+    ),
+    "exploracion_clinica_general": (
+        ["exploracion_clinica_general", "presion_arterial"],
+        "80/120",
+        "120/80",
+    ),
+    "exploracion_fisica_extraoral": (
+        ["exploracion_fisica_extraoral", "cuello"],
+        "x" * 5000,
+        "Sin adenopatías",
+    ),
+    "articulacion_temporomandibular": (
+        [
+            "articulacion_temporomandibular",
+            "limitacion_apertura",
+        ],
+        "120",
+        "45",
+    ),
+    "exploracion_tejidos_blandos": (
+        [
+            "exploracion_tejidos_blandos",
+            "resumen_diagnostico_presuncion_bucal",
+        ],
+        ["sin", "lesiones"],
+        "Sin lesiones",
+    ),
+    "odontograma": (
+        ["odontograma", "general_notes"],
+        "x" * 5000,
+        "Control en 6 meses",
+    ),
+    "diagnostico": (
+        ["diagnostico", "cie_10"],
+        42,
+        "K02.1",
+    ),
+    "plan_tratamiento": (
+        ["plan_tratamiento", "fases"],
+        {"fase": 1},
+        "Fase higiénica",
+    ),
+    "seguimiento": (
+        ["seguimiento"],
+        [{"observaciones": "Sin fecha"}],
+        [{"fecha_hora": "2024-01-01 10:00"}],
+    ),
+    "firma_consentimiento": (
+        ["firma_consentimiento", "aceptado"],
+        "sí",
+        True,
+    ),
+    "antecedentes_dentales": (
+        ["antecedentes_dentales", "primera_vez_consulta"],
+        {"respuesta": "No"},
+        "No",
+    ),
+    "resumen_historia_medica": (
+        ["resumen_historia_medica"],
+        "x" * 5000,
+        "Sin factores de riesgo",
+    ),
+    "ruta_clinica": (
+        ["ruta_clinica", "endodental"],
+        "21, 99",
+        "21, 22",
+    ),
+}
+
+
+def set_path(history: dict, field_path: list, value):
+    level = history
+    for key in field_path[:-1]:
+        level = level.setdefault(key, {})
+    level[field_path[-1]] = value
+
+
+def patch(index, history: dict, field_path: list, value):
+    set_path(history, field_path, value)
+    index.update("p1", field_path, value, history)
+
+
+def full_bitmap(history: dict) -> int:
+    index = HistoryValidationIndex()
+    index.add("p1", history)
+    return index.bitmap("p1")
+
+
+def valid_history():
+    history = create_empty_history()
+    for field_path, _, value in INVALID_FIELDS.values():
+        set_path(history, field_path, value)
+    history["datos_generales"]["nombre_completo"] = "Ana"
+    history["datos_administrativos"][
+        "matricula_estudiante"
+    ] = "estudiante@odontotess.com"
+    history["padecimiento_actual"][
+        "motivo_consulta"
+    ] = "Dolor"
+    history["exploracion_fisica_extraoral"][
+        "cabeza"
+    ] = "Normocéfalo"
+    return history
+
+
+def test_every_section_has_rules():
+    assert set(SECTION_FIELDS) == set(SECTIONS)
+    assert set(INVALID_FIELDS) == set(SECTIONS)
+
+
+def test_empty_history_flags_required_sections():
+    index = HistoryValidationIndex()
+    index.add("p1", create_empty_history())
+    assert invalid_sections(index.bitmap("p1")) == [
+        "datos_generales",
+        "padecimiento_actual",
+    ]
+
+
+def test_seeded_histories_are_submittable():
+    index = HistoryValidationIndex()
+    for patient in create_initial_patients():
+        index.add(
+            patient["id"], patient["historia_clinica"]
+        )
+        assert index.bitmap(patient["id"]) == 0
+
+
+@pytest.mark.parametrize("section", SECTIONS)
+def test_flipping_a_field_flips_its_section_bit(section):
+    history = valid_history()
+    index = HistoryValidationIndex()
+    index.add("p1", history)
+    assert index.bitmap("p1") == 0
+    field_path, invalid, valid = INVALID_FIELDS[section]
+    patch(index, history, field_path, invalid)
+    assert index.bitmap("p1") == SECTION_BITS[section]
+    patch(index, history, field_path, valid)
+    assert index.bitmap("p1") == 0
+    patch(
+        index,
+        history,
+        field_path[:1],
+        (
+            {field_path[1]: invalid}
+            if len(field_path) > 1
+            else invalid
+        ),
+    )
+    assert index.bitmap("p1") == SECTION_BITS[section]
+
+
+def test_item_patches_recheck_the_list_rule():
+    history = valid_history()
+    index = HistoryValidationIndex()
+    index.add("p1", history)
+    history["seguimiento"].append({"fecha_hora": ""})
+    index.update(
+        "p1",
+        ["seguimiento", "1"],
+        {"fecha_hora": ""},
+        history,
+    )
+    assert index.bitmap("p1") == SECTION_BITS["seguimiento"]
+    assert index.bitmap("p1") == full_bitmap(history)
+
+
+def test_store_bitmap_matches_full_build(store):
+    store.add(make_patient("p1"))
+    store.validation_bitmap("p1")
+    steps = [
+        lambda: store.append_history_item(
+            "p1", ["seguimiento"], {"fecha_hora": ""}
+        ),
+        lambda: store.apply_history_patch(
+            "p1",
+            [
+                (
+                    [
+                        "padecimiento_actual",
+                        "motivo_consulta",
+                    ],
+                    "Dolor",
+                )
+            ],
+        ),
+        lambda: store.append_history_item(
+            "p1",
+            ["seguimiento"],
+            {"fecha_hora": "2024-01-01 10:00"},
+        ),
+        lambda: store.remove_history_item(
+            "p1", ["seguimiento"], 0
+        ),
+        lambda: store.apply_history_patch(
+            "p1",
+            [
+                (
+                    ["exploracion_clinica_general"],
+                    {"presion_arterial": "80/120"},
+                )
+            ],
+        ),
+        lambda: store.apply_history_patch(
+            "p1", [(["datos_generales", "edad"], "")]
+        ),
+    ]
+    for step in steps:
+        step()
+        assert store.validation_bitmap("p1") == full_bitmap(
+            store.get("p1")["historia_clinica"]
+        )
+    assert invalid_sections(
+        store.validation_bitmap("p1")
+    ) == [
+        "datos_generales",
+        "exploracion_clinica_general",
+    ]
\ No newline at end of file
@@ -0,0 +1,151 @@
+import json
+import os
+import pytest
+from app.states.clinic_store import ClinicStore
+from app.states.mutation_journal import MutationJournal
+from app.states.patient_repository import PatientRepository
+from conftest import make_patient
+
+MOTIVO = ["padecimiento_actual", "motivo_consulta"]
+
+
+@pytest.fixture
+def journal_path(tmp_path) -> str:
+    return os.path.join(tmp_path, "clinic.mutations")
+
+
+def open_store(
+    database_path: str, journal_path: str
+) -> tuple[ClinicStore, MutationJournal]:
+    journal = MutationJournal(
+        journal_path, commit_interval_ms=0
+    )
+    return (
+        ClinicStore(
+            PatientRepository(database_path),
+            journal=journal,
+        ),
+        journal,
+    )
+
+
+def write_entries(journal_path: str, lines: list[bytes]):
+    with open(journal_path, "ab") as journal:
+        journal.write(b"".join(lines))
+
+
+def entry(seq: int, operation: str, *arguments) -> bytes:
+    return (
+        json.dumps(
+            [seq, operation, list(arguments)]
+        ).encode()
+        + b"\n"
+    )
+
+
+def motivo(store: ClinicStore, patient_id: str) -> str:
+    return store.get(patient_id)["historia_clinica"][
+        "padecimiento_actual"
+    ].get("motivo_consulta", "")
+
+
+def test_entries_are_replayed_onto_a_lost_database(
+    tmp_path, journal_path
+):
+    store, journal = open_store(
+        os.path.join(tmp_path, "before.db"), journal_path
+    )
+    store.add(make_patient("p1"))
+    store.apply_history_patch("p1", [(MOTIVO, "Dolor")])
+    journal.close()
+    recovered, journal = open_store(
+        os.path.join(tmp_path, "after.db"), journal_path
+    )
+    assert motivo(recovered, "p1") == "Dolor"
+    journal.close()
+
+
+def test_torn_entry_is_discarded(
+    database_path, journal_path
+):
+    write_entries(
+        journal_path,
+        [
+            entry(1, "add", make_patient("p1")),
+            entry(
+                2,
+                "apply_history_patch",
+                "p1",
+                [[MOTIVO, "A"]],
+            ),
+            entry(
+                3,
+                "apply_history_patch",
+                "p1",
+                [[MOTIVO, "B"]],
+            )[:-9],
+        ],
+    )
+    store, journal = open_store(database_path, journal_path)
+    assert motivo(store, "p1") == "A"
+    journal.close()
+
+
+def test_failing_entry_is_skipped_once(
+    database_path, journal_path, caplog
+):
+    write_entries(
+        journal_path,
+        [
+            entry(1, "add", make_patient("p1")),
+            entry(
+                2,
+                "remove_history_item",
+                "p1",
+                ["seguimiento"],
+                4,
+            ),
+            entry(
+                3,
+                "apply_history_patch",
+                "p1",
+                [[MOTIVO, "C"]],
+            ),
+        ],
+    )
+    store, journal = open_store(database_path, journal_path)
+    assert motivo(store, "p1") == "C"
+    assert "Mutación 2" in caplog.text
+    assert store._repository.journal_seq() == 3
+    journal.close()
+    write_entries(
+        journal_path,
+        [
+            entry(
+                2,
+                "remove_history_item",
+                "p1",
+                ["seguimiento"],
+                4,
+            )
+        ],
+    )
+    caplog.clear()
+    store, journal = open_store(database_path, journal_path)
+    assert "Mutación" not in caplog.text
+    journal.close()
+
+
+def test_failed_mutation_is_not_journaled(
+    database_path, journal_path
+):
+    store, journal = open_store(database_path, journal_path)
+    store.add(make_patient("p1"))
+    seq = journal.seq
+    with pytest.raises(IndexError):
+        store.remove_history_item("p1", ["seguimiento"], 4)
+    assert journal.seq == seq
+    assert [
+        operation for _, operation, _ in journal.entries()
+    ] == ["add"]
+    journal.close()
\ No newline at end of file
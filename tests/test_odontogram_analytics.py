@@ -0,0 +1,110 @@
+import base64
+import numpy as np
+import pytest
+from app.states import odontogram_analytics
+from app.states.odontogram_analytics import (
+    OdontogramCohort,
+    dmft_counts,
+)
+from app.states.odontogram_codec import (
+    EMPTY_CODE,
+    encode_teeth,
+)
+
+CODES = {
+    "p1": encode_teeth(
+        {
+            "11": {
+                "surfaces": {
+                    "oclusal": "Caries",
+                    "mesial": "Caries",
+                }
+            },
+            "21": {"surfaces": {"distal": "Restauración"}},
+            "22": {
+                "surfaces": {
+                    "distal": "Restauración",
+                    "oclusal": "Caries",
+                }
+            },
+            "36": {
+                "missing": True,
+                "surfaces": {"oclusal": "Caries"},
+            },
+            "46": {"surfaces": {"oclusal": "Sellante"}},
+        }
+    ),
+    "p2": encode_teeth({"48": {"missing": True}}),
+    "p3": EMPTY_CODE,
+}
+
+
+def code_matrix(*codes: str) -> np.ndarray:
+    return np.array(
+        [
+            np.frombuffer(base64.b64decode(code), np.uint8)
+            for code in codes
+        ]
+    )
+
+
+def test_dmft_counting_rules():
+    assert dmft_counts(
+        code_matrix(*CODES.values())
+    ).tolist() == [[2, 1, 1], [0, 1, 0], [0, 0, 0]]
+
+
+@pytest.fixture
+def cohort(monkeypatch):
+    cohort = OdontogramCohort(capacity=2)
+    for patient_id, code in CODES.items():
+        cohort.add(
+            patient_id,
+            code,
+            "ana@uni.mx",
+            "Pendiente",
+            "2024-01-01",
+        )
+    recomputed = []
+
+    def counting(codes: np.ndarray) -> np.ndarray:
+        recomputed.append(len(codes))
+        return dmft_counts(codes)
+
+    monkeypatch.setattr(
+        odontogram_analytics, "dmft_counts", counting
+    )
+    cohort.recomputed = recomputed
+    return cohort
+
+
+def test_dmft_is_cached_until_the_code_changes(cohort):
+    assert cohort.dmft(["p1", "p2", "p3"]).tolist() == [
+        [2, 1, 1],
+        [0, 1, 0],
+        [0, 0, 0],
+    ]
+    assert cohort.recomputed == [3]
+    assert cohort.dmft_average() == pytest.approx(5 / 3)
+    assert cohort.student_dmft_averages() == {
+        "ana@uni.mx": pytest.approx(5 / 3)
+    }
+    assert cohort.recomputed == [3]
+    cohort.set_code(
+        "p3", encode_teeth({"17": {"missing": True}})
+    )
+    assert cohort.dmft_average() == pytest.approx(2)
+    assert cohort.recomputed == [3, 1]
+    assert cohort.dmft(["p3"]).tolist() == [[0, 1, 0]]
+    assert cohort.recomputed == [3, 1]
+
+
+def test_removal_keeps_cached_rows(cohort):
+    cohort.dmft(["p1", "p2", "p3"])
+    cohort.remove("p1")
+    assert len(cohort) == 2
+    assert cohort.dmft(["p3", "p2"]).tolist() == [
+        [0, 0, 0],
+        [0, 1, 0],
+    ]
+    assert cohort.recomputed == [3]
\ No newline at end of file
@@ -0,0 +1,129 @@
+import base64
+import pytest
+from app.states.odontogram_codec import (
+    CODE_BYTES,
+    EMPTY_CODE,
+    SURFACE_COUNT,
+    SURFACES,
+    TEETH,
+    decode_teeth,
+    encode_teeth,
+    finding_digits,
+    is_missing,
+    surface_finding,
+    surface_indices,
+    with_finding_codes,
+    with_findings,
+    with_missing,
+    with_surface_finding,
+)
+from app.states.odontogram_state import is_odontogram_tool
+
+TEETH_STATE = {
+    "11": {"surfaces": {"oclusal": "Caries"}},
+    "26": {
+        "surfaces": {
+            "mesial": "Restauración",
+            "distal": "Sellante",
+        }
+    },
+    "38": {"missing": True},
+    "48": {
+        "surfaces": {"vestibular": "Caries"},
+        "missing": True,
+    },
+}
+
+
+def test_code_has_fixed_size():
+    assert len(base64.b64decode(EMPTY_CODE)) == CODE_BYTES
+    assert decode_teeth(EMPTY_CODE) == {}
+    assert decode_teeth("") == {}
+
+
+def test_teeth_round_trip():
+    code = encode_teeth(TEETH_STATE)
+    assert len(code) == len(EMPTY_CODE)
+    assert decode_teeth(code) == TEETH_STATE
+    assert surface_finding(code, "26", "mesial") == (
+        "Restauración"
+    )
+    assert surface_finding(code, "26", "oclusal") == ""
+    assert is_missing(code, "38")
+    assert not is_missing(code, "11")
+
+
+def test_every_surface_round_trips():
+    code = EMPTY_CODE
+    for tooth in TEETH:
+        for surface in SURFACES:
+            code = with_surface_finding(
+                code, tooth, surface, "Sellante"
+            )
+            assert (
+                surface_finding(code, tooth, surface)
+                == "Sellante"
+            )
+        code = with_missing(code, tooth, True)
+    assert finding_digits(code) == "2" * SURFACE_COUNT + (
+        "1" * len(TEETH)
+    )
+    for tooth in TEETH:
+        code = with_missing(code, tooth, False)
+        for surface in SURFACES:
+            code = with_surface_finding(
+                code, tooth, surface, ""
+            )
+    assert code == EMPTY_CODE
+
+
+def test_bulk_findings_skip_missing_teeth_and_undo():
+    code = with_missing(EMPTY_CODE, "12", True)
+    indices = list(surface_indices(("11", "12")))
+    updated, previous = with_findings(
+        code, indices, "Caries"
+    )
+    assert set(previous) == set(surface_indices(("11",)))
+    assert all(
+        surface_finding(updated, "11", surface) == "Caries"
+        for surface in SURFACES
+    )
+    assert all(
+        surface_finding(updated, "12", surface) == ""
+        for surface in SURFACES
+    )
+    assert with_finding_codes(updated, previous) == code
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        lambda: with_surface_finding(
+            EMPTY_CODE, "19", "oclusal", "Caries"
+        ),
+        lambda: with_surface_finding(
+            EMPTY_CODE, "11", "palatina", "Caries"
+        ),
+        lambda: with_surface_finding(
+            EMPTY_CODE, "11", "oclusal", "Fractura"
+        ),
+        lambda: with_missing(EMPTY_CODE, "", True),
+        lambda: encode_teeth(
+            {"11": {"surfaces": {"oclusal": "Ninguno"}}}
+        ),
+        lambda: decode_teeth("no es base64!"),
+        lambda: decode_teeth(
+            base64.b64encode(b"\0" * 10).decode()
+        ),
+    ],
+)
+def test_rejects_unknown_values(update):
+    with pytest.raises(ValueError):
+        update()
+
+
+def test_odontogram_tools():
+    assert is_odontogram_tool("Ninguno")
+    assert is_odontogram_tool("Restauración")
+    for tool in ("", "Fractura", "ninguno"):
+        assert not is_odontogram_tool(tool)
\ No newline at end of file
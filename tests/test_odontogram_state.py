@@ -0,0 +1,136 @@
+import pytest
+from app.states.clinic_store import get_clinic_store
+from app.states.odontogram_codec import (
+    EMPTY_CODE,
+    SURFACE_COUNT,
+    surface_indices,
+)
+from app.states.odontogram_state import OdontogramState
+from conftest import make_patient, session_state
+
+
+def odontogram_code(patient_id: str) -> str:
+    return get_clinic_store().get(patient_id)[
+        "historia_clinica"
+    ]["odontograma"]["codigo"]
+
+
+@pytest.fixture
+def odontogram(request):
+    patient_id = f"odontograma-{request.node.name}"
+    get_clinic_store().add(make_patient(patient_id))
+    state = session_state(patient_id, OdontogramState)
+    OdontogramState.load_odontogram.fn(state)
+    yield state
+    get_clinic_store().delete(patient_id)
+
+
+def select(state, teeth: tuple[str, ...]):
+    indices = set(surface_indices(teeth))
+    state.odontogram_selection = "".join(
+        "1" if index in indices else "0"
+        for index in range(SURFACE_COUNT)
+    )
+
+
+def patient_id(state) -> str:
+    return state._route_patient_id()
+
+
+def test_apply_and_undo_selection(odontogram):
+    OdontogramState.set_odontogram_tool.fn(
+        odontogram, "Caries"
+    )
+    select(odontogram, ("11", "12"))
+    OdontogramState.apply_odontogram_selection.fn(
+        odontogram, False
+    )
+    assert odontogram_code(patient_id(odontogram)) != (
+        EMPTY_CODE
+    )
+    assert odontogram.can_undo_odontogram
+    OdontogramState.undo_odontogram.fn(odontogram)
+    assert (
+        odontogram_code(patient_id(odontogram))
+        == EMPTY_CODE
+    )
+    assert not odontogram.can_undo_odontogram
+
+
+@pytest.mark.parametrize(
+    "selection",
+    ["1" * (SURFACE_COUNT + 4), "2" * SURFACE_COUNT, "1"],
+)
+def test_malformed_selection_is_rejected(
+    odontogram, selection
+):
+    OdontogramState.set_odontogram_tool.fn(
+        odontogram, "Caries"
+    )
+    odontogram.odontogram_selection = selection
+    assert (
+        OdontogramState.apply_odontogram_selection.fn(
+            odontogram, False
+        )
+        is not None
+    )
+    assert odontogram.odontogram_selection == ""
+    assert (
+        odontogram_code(patient_id(odontogram))
+        == EMPTY_CODE
+    )
+
+
+def test_unknown_tool_is_rejected(odontogram):
+    odontogram.odontogram_tool = "Fractura"
+    select(odontogram, ("11",))
+    assert (
+        OdontogramState.apply_odontogram_selection.fn(
+            odontogram, False
+        )
+        is not None
+    )
+    OdontogramState.update_tooth_surface.fn(
+        odontogram, "11", "oclusal"
+    )
+    assert (
+        odontogram_code(patient_id(odontogram))
+        == EMPTY_CODE
+    )
+
+
+def test_failed_batch_keeps_previous_undo(
+    odontogram, monkeypatch
+):
+    OdontogramState.set_odontogram_tool.fn(
+        odontogram, "Caries"
+    )
+    select(odontogram, ("11",))
+    OdontogramState.apply_odontogram_selection.fn(
+        odontogram, False
+    )
+    undo = dict(odontogram._odontogram_undo)
+    code = odontogram_code(patient_id(odontogram))
+
+    def fail(patient_id, patches):
+        raise RuntimeError("disco lleno")
+
+    monkeypatch.setattr(
+        get_clinic_store(), "apply_history_patch", fail
+    )
+    OdontogramState.set_odontogram_tool.fn(
+        odontogram, "Sellante"
+    )
+    select(odontogram, ("21",))
+    with pytest.raises(RuntimeError):
+        OdontogramState.apply_odontogram_selection.fn(
+            odontogram, False
+        )
+    with pytest.raises(RuntimeError):
+        OdontogramState.update_tooth_surface.fn(
+            odontogram, "22", "oclusal"
+        )
+    monkeypatch.undo()
+    assert odontogram._odontogram_undo == undo
+    assert odontogram.can_undo_odontogram
+    assert odontogram_code(patient_id(odontogram)) == code
\ No newline at end of file
@@ -0,0 +1,160 @@
+from app.states.clinic_store import ClinicStore
+from app.states.patient_filter_index import (
+    PatientFilterIndex,
+    trigrams,
+)
+from app.states.patient_repository import PatientRepository
+from conftest import make_patient
+
+STATUSES = (
+    "Borrador",
+    "Pendiente",
+    "Aprobado",
+    "Rechazado",
+)
+STUDENT_NAME = [
+    "datos_administrativos",
+    "nombre_estudiante",
+]
+
+
+def sample_index() -> PatientFilterIndex:
+    index = PatientFilterIndex()
+    index.add("p1", "ana@uni.mx", "Borrador", "Ana López")
+    index.add("p2", "ana@uni.mx", "Pendiente", "Ana López")
+    index.add(
+        "p3", "beto@uni.mx", "Pendiente", "Alberto Ruiz"
+    )
+    return index
+
+
+def snapshot(index: PatientFilterIndex, queries=()) -> dict:
+    return {
+        "students": list(index.students),
+        "patients": index.patient_ids(),
+        "status": {
+            status: index.status_count(status)
+            for status in STATUSES
+        },
+        "student_status": {
+            (student, status): index.student_status_count(
+                student, status
+            )
+            for student in index.students
+            for status in STATUSES
+        },
+        "matches": {
+            query: sorted(index.matching_students(query))
+            for query in queries
+        },
+    }
+
+
+def test_trigram_search_matches_email_and_name():
+    index = sample_index()
+    assert trigrams("Ana") == {"ana"}
+    assert sorted(index.matching_students("LÓPEZ")) == [
+        "ana@uni.mx"
+    ]
+    assert sorted(index.matching_students("uni.mx")) == [
+        "ana@uni.mx",
+        "beto@uni.mx",
+    ]
+    assert index.matching_students("be") == ["beto@uni.mx"]
+    assert index.matching_students("zzz") == []
+    assert index.query("ana") == {"p1", "p2"}
+
+
+def test_status_filters_intersect_with_students():
+    index = sample_index()
+    assert index.query("uni", "Pendiente") == {"p2", "p3"}
+    assert index.query("ana", "Pendiente") == {"p2"}
+    assert index.patient_ids(status="Pendiente") == [
+        "p2",
+        "p3",
+    ]
+    assert index.patient_ids("alberto", "Borrador") == []
+
+
+def test_counts_follow_status_changes_and_removals():
+    index = sample_index()
+    index.set_status("p2", "Aprobado")
+    index.set_status("p3", "Rechazado")
+    assert index.status_count("Pendiente") == 0
+    assert (
+        index.student_status_count("ana@uni.mx", "Aprobado")
+        == 1
+    )
+    index.remove("p3")
+    assert "p3" not in index
+    assert index.students == ["ana@uni.mx"]
+    assert index.status_count("Rechazado") == 0
+    assert index.matching_students("alberto") == []
+    assert index._students_by_trigram.keys() == trigrams(
+        "ana@uni.mx ana lópez"
+    )
+
+
+def test_student_name_changes_are_reindexed():
+    index = sample_index()
+    index.set_student_name("p1", "Ana María López")
+    assert index.matching_students("maría") == [
+        "ana@uni.mx"
+    ]
+    index.set_student_name("p2", "Ana María López")
+    index.set_student_name("p1", "Ana M. López")
+    assert index.matching_students("maría") == [
+        "ana@uni.mx"
+    ]
+    index.remove("p2")
+    assert index.matching_students("maría") == []
+    assert index.matching_students("ana m.") == [
+        "ana@uni.mx"
+    ]
+
+
+def test_store_index_matches_rebuild(store, database_path):
+    store.add(
+        make_patient(
+            "p1",
+            status="Borrador",
+            estudiante_email="ana@uni.mx",
+        )
+    )
+    store.add(
+        make_patient(
+            "p2",
+            status="Borrador",
+            estudiante_email="beto@uni.mx",
+        )
+    )
+    store.update_columns("p1", {"status": "Pendiente"})
+    store.update_columns("p2", {"status": "Pendiente"})
+    store.update_columns(
+        "p1",
+        {
+            "status": "Rechazado",
+            "observaciones_rechazo": "x",
+        },
+    )
+    store.update_columns("p2", {"status": "Aprobado"})
+    store.apply_history_patch(
+        "p1", [(STUDENT_NAME, "Ana López")]
+    )
+    store.apply_history_patch(
+        "p2",
+        [(STUDENT_NAME[:1], {"nombre_estudiante": "Beto"})],
+    )
+    store.add(
+        make_patient("p3", estudiante_email="ana@uni.mx")
+    )
+    store.delete("p3")
+    queries = ("ana", "lópez", "beto", "uni.mx")
+    reloaded = ClinicStore(PatientRepository(database_path))
+    assert snapshot(
+        store._filter_index, queries
+    ) == snapshot(reloaded._filter_index, queries)
+    assert store._filter_index.query("lópez") == {"p1"}
+    assert store._filter_index.query(
+        "beto", "Aprobado"
+    ) == {"p2"}
\ No newline at end of file
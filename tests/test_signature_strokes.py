@@ -0,0 +1,78 @@
+import base64
+import pytest
+from app.states.signature_strokes import (
+    STROKE_PREFIX,
+    decode_strokes,
+    encode_strokes,
+    is_stroke_code,
+    signature_data_url,
+    signature_svg,
+    simplify,
+)
+
+STROKES = [
+    [(10, 20), (12, 25), (300, 140)],
+    [(5, 5)],
+    [(399, 0), (0, 149), (200, 75)],
+]
+
+
+def test_round_trip_preserves_points():
+    code = encode_strokes(400, 150, STROKES)
+    assert is_stroke_code(code)
+    assert "=" not in code
+    assert decode_strokes(code) == (
+        400,
+        150,
+        tuple(tuple(stroke) for stroke in STROKES),
+    )
+    assert decode_strokes(encode_strokes(400, 150, [])) == (
+        400,
+        150,
+        (),
+    )
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "data:image/png;base64,AAAA",
+        STROKE_PREFIX + "!!!",
+        STROKE_PREFIX + "A" * (16 * 1024),
+        encode_strokes(400, 150, STROKES)[:-3],
+        STROKE_PREFIX
+        + base64.urlsafe_b64encode(b"\x01\x01\x00\x05")
+        .decode("ascii")
+        .rstrip("="),
+        STROKE_PREFIX
+        + base64.urlsafe_b64encode(b"\x01\x01\x00\x80")
+        .decode("ascii")
+        .rstrip("="),
+        encode_strokes(0, 150, STROKES),
+    ],
+)
+def test_decode_rejects_malformed_codes(code):
+    with pytest.raises(ValueError):
+        decode_strokes(code)
+
+
+def test_simplify_keeps_endpoints_and_corners():
+    line = tuple((x, 2 * x) for x in range(20))
+    assert simplify(line) == (line[0], line[-1])
+    corner = ((0, 0), (5, 0), (10, 0), (10, 5), (10, 10))
+    assert simplify(corner) == ((0, 0), (10, 0), (10, 10))
+    assert simplify(((1, 1), (2, 2))) == ((1, 1), (2, 2))
+
+
+def test_svg_draws_every_stroke():
+    code = encode_strokes(400, 150, STROKES)
+    svg = signature_svg(code)
+    assert 'viewBox="0 0 400 150"' in svg
+    assert "M10 20 L12 25 L300 140" in svg
+    assert "M5 5 l0 0" in svg
+    assert (
+        base64.b64decode(
+            signature_data_url(code).split(",", 1)[1]
+        ).decode()
+        == svg
+    )
\ No newline at end of file